@@ -13,18 +13,80 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 # 사용자 홈 디렉토리에 .imagekeywordextractor 폴더 생성 및 config.json 경로 설정
+def get_app_dir():
+    """사용자 홈 디렉토리의 .imagekeywordextractor 폴더 경로 반환 (없으면 생성)"""
+    app_dir = os.path.join(os.path.expanduser("~"), ".imagekeywordextractor")
+    if not os.path.exists(app_dir):
+        os.makedirs(app_dir, exist_ok=True)
+    return app_dir
+
 def get_config_path():
     """사용자 홈 디렉토리의 .imagekeywordextractor/config.json 경로 반환"""
-    config_dir = os.path.join(os.path.expanduser("~"), ".imagekeywordextractor")
-    if not os.path.exists(config_dir):
-        os.makedirs(config_dir, exist_ok=True)
-    return os.path.join(config_dir, "config.json")
+    return os.path.join(get_app_dir(), "config.json")
 
 base_dir = resource_path(".")
 cfg_path = get_config_path()  # 홈 디렉토리의 config.json 경로 사용
 default_load_dir = str(Path.home() / "Documents")
 default_save_dir = str(Path.home() / "Documents") #document(문서)로 바로 갈 수 있게 수정하기.
-img_ext = ["jpg", "jpeg", "png", "bmp"]
+# 업로드 경로에서 매직 바이트로 실제 포맷을 판별하며, API가 받지 않는 포맷(bmp/tiff/heic)은 변환 후 전송
+img_ext = ["jpg", "jpeg", "png", "bmp", "gif", "webp", "tif", "tiff", "heic", "heif"]
 # ui_dir = "./res/ui/" #기본 디렉토리 사용해서 다른 코드들 수정하기
 ui_dir = resource_path("res/ui")
-css_dir = resource_path("res/css")
\ No newline at end of file
+css_dir = resource_path("res/css")
+
+# 동시에 진행할 Claude 캡션 요청 수 기본값 (설정 키: max_concurrent_requests)
+default_max_concurrent_requests = 4
+
+# 캡션 캐시 기본값 (설정 키: caption_cache_enabled, caption_cache_max_mb, caption_cache_max_age_days)
+default_caption_cache_enabled = True
+default_caption_cache_max_mb = 200
+default_caption_cache_max_age_days = 90
+
+# 업로드 전 이미지 축소/재압축 기본값 (설정 키: upload_max_edge, upload_quality, upload_format, upload_target_kb)
+default_upload_max_edge = 1568  # Claude 비전 모델의 유효 최대 해상도 (긴 변 기준)
+default_upload_quality = 85
+default_upload_format = "jpeg"  # "jpeg" 또는 "webp"
+default_upload_target_kb = 1024
+
+# 결과 JSONL 기록 기본값 (설정 키: jsonl_flush_every, jsonl_flush_interval, jsonl_fsync)
+default_jsonl_flush_every = 50  # 레코드 수
+default_jsonl_flush_interval = 2.0  # 초
+default_jsonl_fsync = False
+
+# 배치 API 기본값 (설정 키: use_batch_api, batch_max_requests, batch_max_mb, batch_poll_interval,
+#                  batch_max_retrieve_failures)
+default_batch_max_requests = 10000  # 배치 하나에 담을 최대 요청 수 (API 한도 100,000)
+default_batch_max_mb = 200  # 배치 하나의 최대 요청 크기 (API 한도 256 MB)
+default_batch_poll_interval = 30.0  # 초
+default_batch_max_retrieve_failures = 5  # 상태 확인이 연속으로 이만큼 실패하면 그 배치의 이미지를 실패 처리
+
+# 한 요청에 묶어 보낼 이미지 수 기본값 (설정 키: images_per_request, 1이면 이미지마다 개별 요청)
+default_images_per_request = 1
+
+# 캡션 응답을 스트리밍으로 받아 JSON이 완성되면 바로 끊을지 여부 (설정 키: stream_responses)
+default_stream_responses = True
+
+# 캡션을 도구 호출(JSON 스키마)로 받을지 여부 (설정 키: structured_output)
+default_structured_output = True
+
+# 썸네일 캐시 기본값 (메모리 LRU와 ~/.imagekeywordextractor/thumbs 디스크 캐시의 최대 크기)
+default_thumbnail_memory_mb = 64
+default_thumbnail_disk_mb = 256
+
+# 폴더 추가 시 찾은 이미지를 테이블에 몇 개씩 묶어 넣을지 (개수 또는 초 중 먼저 도달하는 쪽)
+default_folder_scan_batch_size = 500
+default_folder_scan_batch_interval = 0.25  # 초
+
+# 유사 이미지 묶기 기본값 (설정 키: dedup_enabled, dedup_threshold)
+# dHash(64비트) 해밍 거리가 threshold 이하이면 같은 그룹으로 보고 대표 이미지만 캡션 요청
+default_dedup_enabled = False
+default_dedup_threshold = 5
+
+# 캡션 키워드 추출 기본값 (설정 키: keyword_extraction)
+# 켜면 KeywordManager 어휘에서 캡션에 나온 키워드를 찾아 JSONL의 keywords 필드로 기록
+default_keyword_extraction = True
+
+# 프롬프트 키워드 후보 기본값 (설정 키: prompt_keywords_enabled, prompt_keywords_top_k)
+# 켜면 파일/폴더 이름과 이전 캡션에서 찾은 관련 어휘 키워드 top-k만 이미지별 요청에 넣음
+default_prompt_keywords_enabled = False
+default_prompt_keywords_top_k = 30
@@ -16,6 +16,7 @@ from core.dialog.setting_dialog import SettingsDialog
 from core.services.file_operations import FileOperations
 from core.services.settings_handler import SettingsHandler
 from core.services.image_processor import ImageProcessor
+from core.widget.image_table_model import ImageTableModel, ImageTableView
 from utils.keyword_manager import KeywordManager
 from utils.state_manager import get_excel_checkbox_state
 from utils.styles import read_stylesheet
@@ -23,8 +24,6 @@ from cfg.cfg import *
 # import res.resources_rc
 import sys
 
-from utils.worker_thread_chat_completion import WorkerThreadChatCompletion
-
 
 class MainUI(QMainWindow):
     def __init__(self):
@@ -106,9 +105,11 @@ class MainUI(QMainWindow):
         self.buttons = [
             self.refresh_btn2,
             self.add_btn,
+            self.add_folder_btn,
             self.delete_btn,
             self.select_all_btn,
             self.send_data_btn,
+            self.resume_btn,
             self.exit_btn2
         ]
 
@@ -117,17 +118,15 @@ class MainUI(QMainWindow):
         
         # 버튼 시그널 연결
         self.add_btn.clicked.connect(self.file_operations.load_files)
+        self.add_folder_btn.clicked.connect(self.file_operations.load_folder)
         self.delete_btn.clicked.connect(self.delete_selected_items)
         self.select_all_btn.clicked.connect(self.toggle_select_all)
         self.send_data_btn.clicked.connect(self.on_send_data)
+        self.resume_btn.clicked.connect(self.image_processor.resume_run)
         
         # 테이블 시그널 연결
         self.setup_table_signals()
 
-        # 테이블 설정
-        self.image_table.setColumnCount(1)
-        self.image_table.setHorizontalHeaderLabels(['이미지'])
-        
         # 테이블 스타일 설정 호출
         self.setup_table_style()
 
@@ -274,21 +273,13 @@ class MainUI(QMainWindow):
         left_layout = QVBoxLayout(left_widget)
         left_layout.setContentsMargins(0, 0, 0, 0)
 
-        # 이미지 테이블 설정
-        self.image_table = QTableWidget()
+        # 이미지 테이블 설정 (모델/뷰 - 행마다 위젯을 만들지 않고 보이는 행만 그림)
+        self.image_model = ImageTableModel(self, thumbnail_size=80, fallback_icon=self.get_custom_icon)
+        self.image_table = ImageTableView(self.image_model, row_height=100)
         self.image_table.setObjectName("image_table")
         
-        # 테이블 기본 설정
-        self.image_table.setColumnCount(1)
-        self.image_table.setHorizontalHeaderLabels(['이미지'])
-        self.image_table.verticalHeader().setDefaultSectionSize(60)
-        self.image_table.setShowGrid(False)
-        self.image_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.image_table.verticalHeader().setVisible(False)
-        
         # 헤더 선택 방지 및 테이블 선택 모드 설정
         self.image_table.horizontalHeader().setHighlightSections(False)  # 헤더 하이라이트 비활성화
-        self.image_table.setSelectionBehavior(QAbstractItemView.SelectRows)  # 행 단위 선택
         self.image_table.setSelectionMode(QAbstractItemView.MultiSelection)  # 다중 선택 가능
         
         # 테이블 크기 정책 설정
@@ -316,13 +307,17 @@ class MainUI(QMainWindow):
 
         # 버튼들 생성 및 추가
         self.add_btn = QPushButton("이미지 추가")
+        self.add_folder_btn = QPushButton("폴더 추가")
+        self.add_folder_btn.setToolTip("선택한 폴더와 하위 폴더의 이미지를 모두 추가합니다.")
         self.delete_btn = QPushButton("선택 삭제")
         self.select_all_btn = QPushButton("전체 선택/해제")
         self.send_data_btn = QPushButton("선택 전송")
         self.send_data_btn.setEnabled(False)
+        self.resume_btn = QPushButton("이어서 처리")
+        self.resume_btn.setToolTip("중단된 작업의 남은 이미지만 다시 처리합니다.")
 
         # 버튼 스타일 및 크기 설정
-        for btn in [self.add_btn, self.delete_btn, self.select_all_btn, self.send_data_btn]:
+        for btn in [self.add_btn, self.add_folder_btn, self.delete_btn, self.select_all_btn, self.send_data_btn, self.resume_btn]:
             btn.setMinimumHeight(30)  # 버튼 사이즈 설정
             btn.setMinimumWidth(120)
             button_container_layout.addWidget(btn, 0, Qt.AlignHCenter)  # 가운데 정렬로 추가
@@ -342,8 +337,9 @@ class MainUI(QMainWindow):
         self.page_widget.setCurrentIndex(0)
 
         # 테이블 시그널 연결
-        self.image_table.itemSelectionChanged.connect(self.update_send_button)
-        self.image_table.cellDoubleClicked.connect(self.open_image_doubleclick)
+        self.image_table.selectionModel().selectionChanged.connect(self.update_send_button)
+        self.image_model.check_state_changed.connect(self.update_send_button)
+        self.image_table.doubleClicked.connect(self.open_image_doubleclick)
         self.image_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.image_table.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -401,7 +397,7 @@ class MainUI(QMainWindow):
             self.settings_handler.open_settings_dialog()
 
         # 시그널 연결
-        self.image_table.itemSelectionChanged.connect(self.update_send_button)
+        self.image_table.selectionModel().selectionChanged.connect(self.update_send_button)
         self.image_processor.progress_updated.connect(self.update_progress)
         self.image_processor.process_finished.connect(self.on_process_finished)
         self.image_processor.error_occurred.connect(self.on_error)
@@ -411,10 +407,9 @@ class MainUI(QMainWindow):
             self.update_excel_state_label()
 
     def update_send_button(self):
-        # 선택된 항목이 있는지 확인
-        selected_items = self.get_selected_files()
+        # 선택된 항목이 있는지 확인 (목록을 만들지 않고 선택 저장소에서 바로 확인)
         if hasattr(self, 'send_data_btn'):
-            self.send_data_btn.setEnabled(len(selected_items) > 0)
+            self.send_data_btn.setEnabled(self.image_model.has_checked_files())
 
     def update_progress(self, value):
         """진행 상태 업데이트"""
@@ -427,22 +422,14 @@ class MainUI(QMainWindow):
             if self.progress:
                 self.progress.close()
             
-            # 체크된 항목들을 테이블에서 제거
-            rows_to_remove = []
-            for row in range(self.image_table.rowCount()):
-                widget = self.image_table.cellWidget(row, 0)
-                if widget:
-                    checkbox = widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        rows_to_remove.append(row)
+            # 처리 완료된 항목은 결과가 도착할 때마다 지웠으므로 남은 것만 한 번에 제거
+            # (실패한 이미지는 체크된 채로 남겨 다시 전송할 수 있게 함)
+            processed_files = self.image_processor.processed_files
+            self.image_model.remove_files(processed_files)
             
-            # 제거할 행이 있으면 처리 (역순으로 제거)
-            if rows_to_remove:
-                for row in sorted(rows_to_remove, reverse=True):
-                    self.image_table.removeRow(row)
-                
+            if processed_files:
                 # 처리 완료 메시지 표시
-                QMessageBox.information(self, "처리 완료", f"{len(rows_to_remove)}개의 이미지 처리가 완료되었습니다.")
+                QMessageBox.information(self, "처리 완료", f"{len(processed_files)}개의 이미지 처리가 완료되었습니다.")
             
             # 버튼 상태 업데이트
             self.update_button_states()
@@ -464,107 +451,24 @@ class MainUI(QMainWindow):
     def add_file_to_list(self, file_path):
         """테이블에 파일 추가"""
         try:
-            row = self.image_table.rowCount()
-            self.image_table.insertRow(row)
-            
-            # 체크박스 추가
-            checkbox_widget = self.setup_checkbox(row)
-            self.image_table.setCellWidget(row, 0, checkbox_widget)
-            
-            # 파일 정보 추가
-            file_info = QFileInfo(file_path)
-            file_name = file_info.fileName()
-            
-            # 파일명 아이템 설정
-            name_item = QTableWidgetItem(file_name)
-            name_item.setData(Qt.UserRole, file_path)  # 전체 경로 저장
-            self.image_table.setItem(row, 1, name_item)
-            
+            self.image_model.add_files([file_path])
             self.update_button_states()
             
         except Exception as e:
             print(f"Error adding file to list: {str(e)}")
 
-    def create_item_widget(self, file_info, custom_icon, file_path):
-        """테이블 항목 위젯 생성"""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 0, 5, 0)
-        layout.setSpacing(10)
-
-        # 체크박스 추가
-        checkbox = QCheckBox()
-        checkbox.setStyleSheet("margin-left: 5px;")
-        layout.addWidget(checkbox)
-
-        # 썸네일 라벨
-        icon_label = QLabel()
-        try:
-            thumbnail = self.create_thumbnail(file_path)
-            icon_label.setPixmap(thumbnail)
-        except Exception as e:
-            print(f"썸네일 생성 실패: {str(e)}")
-            if custom_icon and not custom_icon.isNull():
-                icon_label.setPixmap(custom_icon.pixmap(24, 24))
-            else:
-                default_icon = QFileIconProvider().icon(file_info)
-                icon_label.setPixmap(default_icon.pixmap(24, 24))
-        layout.addWidget(icon_label)
-
-        # 파일명 라벨
-        file_name_label = QLabel(file_info.fileName())
-        file_name_label.setStyleSheet("padding-left: 5px;")
-        layout.addWidget(file_name_label)
-
-        widget.setProperty("file_path", file_path)
-        widget.setProperty("checkbox", checkbox)  # 체크박스 참조 저장
-        layout.addStretch()
-
-        # 체크박스 상태 변경 시그널 연결
-        checkbox.stateChanged.connect(lambda state, row=self.image_table.rowCount(): 
-            self.on_checkbox_changed(state, row))
-
-        return widget
-
-    def create_thumbnail(self, file_path):
-        """이미지 썸네일 생성"""
-        image = QImage(file_path)
-        if image.isNull():
-            raise Exception("이미지를 불러올 수 없습니다.")
-        thumbnail = image.scaled(QSize(50, 50), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        return QPixmap.fromImage(thumbnail)
-
-    def on_item_clicked(self, row, column):
-        widget = self.image_table.cellWidget(row, column)
-        if widget:
-            checkbox = widget.layout().itemAt(0).widget()
-            if isinstance(checkbox, QCheckBox):
-                checkbox.setChecked(not checkbox.isChecked())
-
     def on_checkbox_changed(self, state, row):
         """체크박스 상태 변경 처리"""
         self.image_table.selectRow(row) if state == Qt.Checked else self.image_table.clearSelection()
         self.update_button_states()
 
-    def update_row_color(self, row, color):
-        self.image_table.cellWidget(row, 0).setStyleSheet(f"background-color: {color.name()};")
-
     def get_selected_files(self):
         """선택된 파일 목록 반환"""
-        selected_files = []
-        for row in range(self.image_table.rowCount()):
-            widget = self.image_table.cellWidget(row, 0)
-            if widget:
-                checkbox = widget.property("checkbox")
-                if checkbox and checkbox.isChecked():
-                    file_path = widget.property("file_path")
-                    if file_path:
-                        selected_files.append(file_path)
-        return selected_files
+        return self.image_model.checked_files()
 
     def is_allowed_format(self, file_path):
         _, file_format = os.path.splitext(file_path)
-        return file_format.lower() in {'.jpg', '.jpeg', '.png', '.bmp'}
+        return file_format.lower().lstrip('.') in img_ext
 
     def get_custom_icon(self, file_path):
         """파일 형식에 따른 아이콘 반환"""
@@ -586,26 +490,24 @@ class MainUI(QMainWindow):
                     return icon
         return QIcon()
 
-    def open_image_doubleclick(self, row, column):
-        widget = self.image_table.cellWidget(row, column)
-        if widget:
-            file_path = widget.property("file_path")
-            if file_path:
-                try:
-                    if os.name == 'nt':
-                        os.startfile(file_path)
-                    elif os.name == 'posix':
-                        opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
-                        subprocess.call([opener, file_path])
-                except Exception as e:
-                    print(f"파일 더블클릭 실패: {str(e)}")
+    def open_image_doubleclick(self, index):
+        file_path = self.image_table.file_path_at(index)
+        if file_path:
+            try:
+                if os.name == 'nt':
+                    os.startfile(file_path)
+                elif os.name == 'posix':
+                    opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                    subprocess.call([opener, file_path])
+            except Exception as e:
+                print(f"파일 더블클릭 실패: {str(e)}")
 
     def show_context_menu(self):
         context_menu = QMenu(self)
         delete_action = QAction("삭제", self)
         delete_action.triggered.connect(self.delete_selected_items)
         context_menu.addAction(delete_action)
-        delete_action.setEnabled(len(self.image_table.selectedRanges()) > 0)
+        delete_action.setEnabled(self.image_table.selectionModel().hasSelection())
         context_menu.exec_(QCursor.pos())
 
     def toggle_select_all(self):
@@ -615,42 +517,11 @@ class MainUI(QMainWindow):
         
         self.all_selected = not self.all_selected
         
-        # 모든 행의 체크박스 상태 변경
-        for row in range(self.image_table.rowCount()):
-            checkbox = self.get_checkbox_at_row(row)
-            if checkbox:
-                checkbox.setChecked(self.all_selected)
+        # 모든 행의 체크 상태를 한 번에 변경
+        self.image_model.set_all_checked(self.all_selected)
         
         self.update_button_states()
 
-    def get_checkbox_at_row(self, row):
-        """특정 행의 체크박스 가져오기"""
-        try:
-            widget = self.image_table.cellWidget(row, 0)  # 첫 번째 열의 위젯
-            if widget:
-                return widget.findChild(QCheckBox)
-            return None
-        except Exception as e:
-            print(f"Error getting checkbox at row {row}: {e}")
-            return None
-
-    def setup_checkbox(self, row):
-        """체크박스 설정"""
-        widget = QWidget()
-        checkbox = QCheckBox()
-        checkbox.setProperty("row", row)  # 체크박스에 행 번호 저장
-        
-        # 체크박스 상태 변경 시그널 연결
-        checkbox.stateChanged.connect(lambda state, r=row: self.on_checkbox_changed(r, state))
-        
-        layout = QHBoxLayout(widget)
-        layout.addWidget(checkbox)
-        layout.setAlignment(Qt.AlignCenter)
-        layout.setContentsMargins(0, 0, 0, 0)
-        widget.setLayout(layout)
-        
-        return widget
-
     def on_checkbox_changed(self, row, state):
         """체크박스 상태 변경 처리"""
         print(f"Checkbox changed at row {row} to state {state}")
@@ -706,8 +577,9 @@ class MainUI(QMainWindow):
                    response["text"].get("english_caption") and \
                    response["text"].get("korean_caption"):
                     is_valid_response = True
-                    # 성공적으로 처리된 이미지 경로 저장
+                    # 성공적으로 처리된 이미지 경로 저장 후 테이블에서 제거 (짧은 간격으로 모아서 삭제)
                     self.processed_images.add(file_path)
+                    self.image_model.schedule_removal([file_path])
                     print(f"Added to processed images: {file_name}")
             
             if not is_valid_response:
@@ -722,7 +594,7 @@ class MainUI(QMainWindow):
         QMessageBox.information(self, '완료', '모든 이미지 처리가 완료되었습니다.')
         
         # 테이블이 비어있는지 확인하고 버튼 상태 업데이트
-        if self.image_table.rowCount() == 0:
+        if self.image_model.rowCount() == 0:
             self.update_button_states()
 
     def handle_error(self, error_msg):
@@ -732,27 +604,12 @@ class MainUI(QMainWindow):
 
     def delete_selected_items(self):
         """선택된 항목 삭제"""
-        rows_to_delete = []
-        
-        # 모든 행을 순회하면서 체크된 항목 찾기
-        for row in range(self.image_table.rowCount()):
-            # 첫 번째 열의 위젯 아이템 가져오기
-            item = self.image_table.cellWidget(row, 0)
-            if item:
-                # 레이아웃에서 체크박스 찾기
-                layout = item.layout()
-                if layout:
-                    for i in range(layout.count()):
-                        widget = layout.itemAt(i).widget()
-                        if isinstance(widget, QCheckBox) and widget.isChecked():
-                            rows_to_delete.append(row)
-                            break
+        # 체크된 항목 찾기
+        rows_to_delete = self.image_model.checked_rows()
         
         # 삭제할 항목이 있는 경우에만 처리
         if rows_to_delete:
-            # 역순으로 정렬하여 삭제 (인덱스 변화 방지)
-            for row in sorted(rows_to_delete, reverse=True):
-                self.image_table.removeRow(row)
+            self.image_model.remove_rows(rows_to_delete)
             
             # 삭제 완료 메시지 표시
             QMessageBox.information(self, "삭제 완료", f"{len(rows_to_delete)}개의 항목이 삭제되었습니다.")
@@ -764,7 +621,7 @@ class MainUI(QMainWindow):
         """버튼 상태 업데이트"""
         try:
             # 테이블에 항목이 있는지 확인
-            has_items = self.image_table.rowCount() > 0
+            has_items = self.image_model.rowCount() > 0
             
             # 선택된 항목이 있는지 확인
             has_selected = self.file_operations.has_selected_files()
@@ -796,24 +653,24 @@ class MainUI(QMainWindow):
 
     def setup_table_signals(self):
         """테이블 시그널 설정"""
-        self.image_table.itemSelectionChanged.connect(self.update_button_states)
-        self.image_table.cellDoubleClicked.connect(self.open_image_preview)
+        self.image_table.selectionModel().selectionChanged.connect(self.update_button_states)
+        self.image_model.check_state_changed.connect(self.update_button_states)
+        self.image_model.rows_removed.connect(self.update_button_states)
+        self.image_table.doubleClicked.connect(self.open_image_preview)
         self.image_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.image_table.customContextMenuRequested.connect(self.show_context_menu)
 
-    def open_image_preview(self, row, column):
+    def open_image_preview(self, index):
         """이미지 미리보기 열기"""
         try:
-            widget = self.image_table.cellWidget(row, column)
-            if widget:
-                file_path = widget.property("file_path")
-                if file_path and os.path.exists(file_path):
-                    if os.name == 'nt':  # Windows
-                        os.startfile(file_path)
-                    else:  # macOS 및 Linux
-                        import subprocess
-                        opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
-                        subprocess.call([opener, file_path])
+            file_path = self.image_table.file_path_at(index)
+            if file_path and os.path.exists(file_path):
+                if os.name == 'nt':  # Windows
+                    os.startfile(file_path)
+                else:  # macOS 및 Linux
+                    import subprocess
+                    opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                    subprocess.call([opener, file_path])
         except Exception as e:
             print(f"Error opening image preview: {str(e)}")
             QMessageBox.critical(self, '오류', f'이미지를 열 수 없습니다: {str(e)}')
@@ -823,9 +680,11 @@ class MainUI(QMainWindow):
         try:
             # 기존 연결 모두 해제
             self.add_btn.clicked.disconnect()
+            self.add_folder_btn.clicked.disconnect()
             self.delete_btn.clicked.disconnect()
             self.select_all_btn.clicked.disconnect()
             self.send_data_btn.clicked.disconnect()
+            self.resume_btn.clicked.disconnect()
             self.settings_btn2.clicked.disconnect()
         except:
             # 연결이 없는 경우 예외 발생하므로 무시
@@ -833,9 +692,11 @@ class MainUI(QMainWindow):
         
         # 새로운 연결 설정
         self.add_btn.clicked.connect(self.file_operations.load_files)
+        self.add_folder_btn.clicked.connect(self.file_operations.load_folder)
         self.delete_btn.clicked.connect(self.delete_selected_items)
         self.select_all_btn.clicked.connect(self.file_operations.toggle_select_all)
         self.send_data_btn.clicked.connect(self.on_send_data)
+        self.resume_btn.clicked.connect(self.image_processor.resume_run)
         self.settings_btn2.clicked.connect(self.show_settings_dialog)
 
         # WorkerThread의 remove_from_table 시그널 연결
@@ -844,11 +705,7 @@ class MainUI(QMainWindow):
                 
     def remove_processed_image(self, file_path):
         """처리 완료된 이미지를 테이블에서 제거"""
-        for row in range(self.image_table.rowCount()):
-            widget = self.image_table.cellWidget(row, 0)
-            if widget and widget.property("file_path") == file_path:
-                self.image_table.removeRow(row)
-                break
+        self.image_model.schedule_removal([file_path])
 
     def on_send_data(self):
         """이미지 전송 버튼 클릭 시 호출"""
@@ -875,7 +732,7 @@ class MainUI(QMainWindow):
     def setup_table_style(self):
         """테이블 스타일 설정"""
         self.image_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: none;
                 background-color: white;
                 border-top: 1px solid black;
@@ -884,12 +741,12 @@ class MainUI(QMainWindow):
                 border-bottom: 0;  
 
             }
-            QTableWidget::item {
+            QTableView::item {
                 border: 1px solid #dcdcdc;
                 border-radius: 4px;
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e6f3ff;
                 border: 1px solid #99d1ff;
             }
@@ -899,59 +756,12 @@ class MainUI(QMainWindow):
         header = self.image_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)  # 열 너비 자동 조정
 
-    def create_table_item(self, file_path):
-        """테이블 항목 생성"""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 5, 5, 5)
-        
-        # 체크박스 추가
-        checkbox = QCheckBox()
-        checkbox.setStyleSheet("QCheckBox { margin-right: 10px; }")
-        layout.addWidget(checkbox)
-        
-        # 썸네일 레이블
-        thumbnail_label = QLabel()
-        pixmap = self.create_thumbnail(file_path)
-        thumbnail_label.setPixmap(pixmap)
-        thumbnail_label.setFixedSize(50, 50)
-        layout.addWidget(thumbnail_label)
-        
-        # 파일 이름 레이블
-        file_name_label = QLabel(os.path.basename(file_path))
-        file_name_label.setStyleSheet("""
-            QLabel {
-                margin-left: 10px;
-                padding-right: 20px;  /* 오른쪽 여백 추가 */
-            }
-        """)
-        file_name_label.setMinimumWidth(200)  # 최소 너비 설정
-        layout.addWidget(file_name_label)
-        
-        # 남은 공간을 채우는 스페이서 추가
-        layout.addStretch()
-        
-        # 위젯 속성 설정
-        widget.setProperty("file_path", file_path)
-        
-        return widget
-
     def refresh_table(self):
         """테이블 새로고침"""
         try:
             # 처리 완료된 항목 제거
-            rows_to_remove = []
-            for row in range(self.image_table.rowCount()):
-                widget = self.image_table.cellWidget(row, 0)
-                if widget:
-                    file_path = widget.property("file_path")
-                    # ImageProcessor에서 처리 완료된 파일인지 확인
-                    if file_path in self.image_processor.processed_files:
-                        rows_to_remove.append(row)
-            
-            # 역순으로 정렬하여 삭제
-            for row in sorted(rows_to_remove, reverse=True):
-                self.image_table.removeRow(row)
+            # ImageProcessor에서 처리 완료된 파일인지 확인
+            self.image_model.remove_files(self.image_processor.processed_files)
             
             # 버튼 상태 업데이트
             self.update_button_states()
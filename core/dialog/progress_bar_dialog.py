@@ -29,6 +29,16 @@ class ProgressBarDialog(QDialog):
         self.current_file_label = QLabel("처리 중인 파일: ")
         progress_layout.addWidget(self.current_file_label)
 
+        # 현재 API 요청 속도 표시
+        self.rate_label = QLabel("요청 속도: -")
+        progress_layout.addWidget(self.rate_label)
+
+        # 스트리밍 중인 캡션 미리보기
+        self.partial_caption_label = QLabel("")
+        self.partial_caption_label.setWordWrap(True)
+        self.partial_caption_label.setStyleSheet("color: #666666;")
+        progress_layout.addWidget(self.partial_caption_label)
+
         layout.addLayout(progress_layout)
 
         # 로그 표시 영역
@@ -45,7 +55,11 @@ class ProgressBarDialog(QDialog):
         button_layout = QHBoxLayout()
         self.cancel_button = QPushButton("취소")
         self.cancel_button.clicked.connect(self.reject)
+        # 처리가 끝나고 결과 파일이 있을 때만 표시
+        self.export_button = QPushButton("엑셀로 내보내기")
+        self.export_button.hide()
         button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
         button_layout.addWidget(self.cancel_button)
 
         layout.addLayout(button_layout)
@@ -83,6 +97,14 @@ class ProgressBarDialog(QDialog):
         else:
             self.current_file_label.setText("처리 완료")
 
+    def update_rate(self, rate, concurrency_limit):
+        """속도 제어기의 현재 요청 속도 표시"""
+        self.rate_label.setText(f"요청 속도: {rate:.2f} req/s (동시 요청 {concurrency_limit}개)")
+
+    def update_partial_caption(self, file_name, text):
+        """응답이 도착하는 대로 캡션 일부 표시"""
+        self.partial_caption_label.setText(f"{file_name}: {text}")
+
     def add_log(self, message):
         """로그 메시지 추가"""
         self.log_text.append(message)
@@ -2,8 +2,11 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                              QRadioButton, QPushButton, QLabel, QStackedWidget,
                              QWidget, QScrollArea, QButtonGroup)
 from PyQt5.QtCore import Qt
-import pandas as pd
 import os
+import time
+
+# 파이프(|)로 구분된 응답 필드의 엑셀 머리글
+SELECTED_RESPONSE_HEADERS = ['파일명', '파일타입', '이미지설명', '주제및컨셉', '인물정보', '키워드', '주요색상']
 
 
 class ResponseSelectorDialog(QDialog):
@@ -126,26 +129,15 @@ class ResponseSelectorDialog(QDialog):
             if not self.selected_responses:
                 return False
 
-            # 결과를 DataFrame으로 변환
-            results = []
-            for image_path, response in self.selected_responses.items():
-                parts = response.split('|')
-                if len(parts) == 7:
-                    results.append({
-                        '파일명': parts[0],
-                        '파일타입': parts[1],
-                        '이미지설명': parts[2],
-                        '주제및컨셉': parts[3],
-                        '인물정보': parts[4],
-                        '키워드': parts[5],
-                        '주요색상': parts[6]
-                    })
-
-            if results:
-                df = pd.DataFrame(results)
-                timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+            # 응답(파이프로 구분된 7개 필드)을 행으로 변환하여 write-only 통합 문서에 바로 기록
+            rows = [response.split('|') for response in self.selected_responses.values()]
+            rows = [parts for parts in rows if len(parts) == len(SELECTED_RESPONSE_HEADERS)]
+
+            if rows:
+                from utils.xlsx_exporter import write_rows_to_xlsx  # 엑셀 저장할 때만 필요하므로 여기서 import
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
                 excel_path = f"selected_results_{timestamp}.xlsx"
-                df.to_excel(excel_path, index=False)
+                write_rows_to_xlsx(rows, excel_path, SELECTED_RESPONSE_HEADERS)
                 return True
 
         except Exception as e:
@@ -7,11 +7,8 @@ import os
 
 from PyQt5.QtCore import QEvent
 from PyQt5.QtWidgets import QDialog, QMessageBox, QTextEdit, QDesktopWidget, QPushButton, QDialogButtonBox, QCheckBox, QVBoxLayout, QGroupBox, QLabel
-from PyQt5.uic import loadUi
-from anthropic import Anthropic
 
 from core.dialog.help_dialog import HelpDialog
-import requests
 from cfg.cfg import *
 
 from utils.state_manager import get_excel_checkbox_state, set_excel_checkbox_state
@@ -57,6 +54,8 @@ class SettingsDialog(QDialog):
         # 체크박스
         self.show_excel_check = QCheckBox("엑셀 파일 표시")
         self.show_excel_check.setChecked(get_excel_checkbox_state())
+        self.use_batch_check = QCheckBox("배치 API로 처리 (대량 작업용, 결과가 늦게 도착하지만 비용 절감)")
+        self.dedup_check = QCheckBox("유사 이미지는 한 번만 처리 (거의 같은 이미지에 같은 캡션 적용)")
 
         # 버튼 박스
         self.buttonBox = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
@@ -64,6 +63,8 @@ class SettingsDialog(QDialog):
         # 메인 레이아웃에 위젯 추가
         main_layout.addWidget(api_key_group)
         main_layout.addWidget(self.show_excel_check)
+        main_layout.addWidget(self.use_batch_check)
+        main_layout.addWidget(self.dedup_check)
         main_layout.addWidget(self.buttonBox)
 
         # 시그널 연결
@@ -95,6 +96,9 @@ class SettingsDialog(QDialog):
                         self.text_edit_api_key.setReadOnly(True)
                         self.validate_api_key_button.setEnabled(False)
                         
+                    self.use_batch_check.setChecked(bool(config.get('use_batch_api', False)))
+                    self.dedup_check.setChecked(bool(config.get('dedup_enabled', False)))
+                        
                     print(f"기존 설정 불러옴: API Key={bool(config.get('claude_key'))}")
                     
                     # 버튼 상태 업데이트
@@ -133,6 +137,7 @@ class SettingsDialog(QDialog):
             self.validate_api_key_button.setEnabled(True)
         else:
             try:
+                from anthropic import Anthropic  # 시작 시간을 줄이기 위해 키 확인할 때만 import
                 client = Anthropic(api_key=api_key)
                 response = client.messages.create(
                     model="claude-3-7-sonnet-20250219",
@@ -239,6 +244,8 @@ class SettingsDialog(QDialog):
                 settings = {}
 
             settings['claude_key'] = api_key
+            settings['use_batch_api'] = self.use_batch_check.isChecked()
+            settings['dedup_enabled'] = self.dedup_check.isChecked()
             
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(settings, f, ensure_ascii=False, indent=4)
@@ -1,9 +1,9 @@
 import os
 import json
-from PyQt5.QtWidgets import (QFileDialog, QMessageBox, QLabel, 
-                           QWidget, QHBoxLayout, QTableWidgetItem, QCheckBox)
-from PyQt5.QtCore import Qt, QFileInfo
-from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+from PyQt5.QtCore import Qt
+from cfg.cfg import img_ext
+from utils.worker_thread_folder_scan import WorkerThreadFolderScan
 
 class FileOperations:
     def __init__(self, parent_widget, config_file: str):
@@ -16,6 +16,8 @@ class FileOperations:
         self.load_dir = self.load_directory()
         print(f"FileOperations 초기화 - 로드 디렉토리: {self.load_dir}")
         self.all_selected = False  # 전체 선택 상태 추적
+        self.scan_worker = None  # 폴더 탐색 워커
+        self.scan_progress = None
 
     def load_files(self):
         """이미지 파일 로드"""
@@ -24,7 +26,7 @@ class FileOperations:
             self.load_dir = self.load_directory()
             print(f"현재 로드 디렉토리: {self.load_dir}")  # 디버깅용 로그 추가
             
-            supported_file_format = ["jpg", "jpeg", "png", "bmp"]
+            supported_file_format = img_ext
             image_filter = "Images (" + " ".join([f"*.{fmt}" for fmt in supported_file_format]) + ")"
             file_names, _ = QFileDialog.getOpenFileNames(
                 self.parent_widget, 
@@ -34,9 +36,8 @@ class FileOperations:
             )
             
             if file_names:
-                # 각 파일을 개별적으로 추가
-                for file_name in file_names:
-                    self.add_file_to_table(file_name)
+                # 선택한 파일을 한 번에 추가
+                self.parent_widget.image_model.add_files(file_names)
                 
                 # 마지막 디렉토리 저장
                 new_directory = os.path.dirname(file_names[0])
@@ -51,93 +52,84 @@ class FileOperations:
             print(f"파일 로드 중 오류 발생: {str(e)}")
             QMessageBox.critical(self.parent_widget, '오류', f'파일 로드 중 오류가 발생했습니다: {str(e)}')
 
-    def add_file_to_table(self, file_path):
-        """테이블에 파일 추가"""
+    def load_folder(self):
+        """폴더(하위 폴더 포함)의 이미지를 백그라운드에서 찾아 추가"""
         try:
-            table = self.parent_widget.image_table
-            row = table.rowCount()
-            table.insertRow(row)
-            
-            # 컨테이너 위젯 생성
-            container = QWidget()
-            layout = QHBoxLayout(container)
-            layout.setContentsMargins(5, 5, 5, 5)
-            
-            # 체크박스 추가
-            checkbox = QCheckBox()
-            checkbox.setProperty("row", row)
-            checkbox.stateChanged.connect(
-                lambda state, r=row: self.parent_widget.on_checkbox_changed(r, state)
-            )
-            layout.addWidget(checkbox)
-            
-            # 썸네일 추가
-            thumbnail = self.create_thumbnail(file_path)
-            if thumbnail:
-                thumbnail_label = QLabel()
-                thumbnail_label.setPixmap(thumbnail)
-                thumbnail_label.setAlignment(Qt.AlignCenter)
-                layout.addWidget(thumbnail_label)
-            
-            # 파일명 추가
-            file_name = QFileInfo(file_path).fileName()
-            name_label = QLabel(file_name)
-            name_label.setStyleSheet("padding-left: 10px;")
-            layout.addWidget(name_label)
-            
-            # 우측 여백을 위한 스페이서 추가
-            layout.addStretch()
-            
-            # 데이터 저장
-            container.setProperty("file_path", file_path)
-            
-            # 컨테이너를 테이블에 추가
-            table.setCellWidget(row, 0, container)
-            
-            # 행 높이 조정
-            table.setRowHeight(row, 100)
-            
+            if self.scan_worker and self.scan_worker.isRunning():
+                QMessageBox.information(self.parent_widget, '알림', '이미 폴더를 탐색하고 있습니다.')
+                return
+
+            self.load_dir = self.load_directory()
+            directory = QFileDialog.getExistingDirectory(self.parent_widget, "폴더 선택", self.load_dir)
+            if not directory:
+                return
+
+            self.save_directory(directory)
+            self.load_dir = directory
+
+            self.scan_progress = QProgressDialog("이미지를 찾는 중...", "취소", 0, 0, self.parent_widget)
+            self.scan_progress.setWindowTitle("폴더 추가")
+            self.scan_progress.setWindowModality(Qt.WindowModal)
+            self.scan_progress.setMinimumDuration(0)
+            self.scan_progress.setAutoClose(False)
+            self.scan_progress.setAutoReset(False)
+
+            self.scan_worker = WorkerThreadFolderScan(directory)
+            self.scan_worker.paths_found.connect(self.on_scan_paths_found)
+            self.scan_worker.progress_signal.connect(self.on_scan_progress)
+            self.scan_worker.error_signal.connect(
+                lambda message: print(f"폴더 탐색 오류: {message}"))
+            self.scan_worker.finished_signal.connect(self.on_scan_finished)
+            self.scan_progress.canceled.connect(self.scan_worker.cancel)
+            self.scan_worker.start()
+            self.scan_progress.show()
+            print(f"폴더 탐색 시작: {directory}")
+
         except Exception as e:
-            print(f"Error adding file to table: {str(e)}")
+            print(f"폴더 로드 중 오류 발생: {str(e)}")
+            QMessageBox.critical(self.parent_widget, '오류', f'폴더 로드 중 오류가 발생했습니다: {str(e)}')
 
-    def create_thumbnail(self, image_path, size=80):
-        """이미지 썸네일 생성"""
+    def on_scan_paths_found(self, file_paths):
+        """탐색 중 찾은 이미지 묶음을 테이블에 바로 추가"""
         try:
-            image = QImage(image_path)
-            if image.isNull():
-                return None
-                
-            # 썸네일 크기에 맞게 이미지 스케일링
-            scaled_image = image.scaled(
-                size, size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            return QPixmap.fromImage(scaled_image)
+            self.parent_widget.image_model.add_files(file_paths)
+        except Exception as e:
+            print(f"Error adding scanned files: {str(e)}")
+
+    def on_scan_progress(self, scanned_count, found_count):
+        if self.scan_progress:
+            self.scan_progress.setLabelText(f"이미지를 찾는 중... {found_count}개 발견 (확인한 파일 {scanned_count}개)")
+
+    def on_scan_finished(self, found_count, cancelled):
+        if self.scan_progress:
+            self.scan_progress.close()
+            self.scan_progress = None
+        if self.scan_worker:
+            # finished_signal은 run()의 마지막에 보내므로 스레드가 끝날 때까지 기다린 뒤 참조를 놓음
+            # (부모가 없는 QThread가 실행 중에 해제되면 앱이 종료됨)
+            self.scan_worker.wait()
+            self.scan_worker = None
+        self.parent_widget.update_button_states()
+        state = "취소됨" if cancelled else "완료"
+        print(f"폴더 탐색 {state}: {found_count}개 이미지")
+        if cancelled:
+            QMessageBox.information(self.parent_widget, '폴더 추가',
+                                    f'탐색을 취소했습니다. 그때까지 찾은 {found_count}개의 이미지가 추가되었습니다.')
+        elif not found_count:
+            QMessageBox.information(self.parent_widget, '폴더 추가', '선택한 폴더에서 이미지를 찾지 못했습니다.')
+
+    def add_file_to_table(self, file_path):
+        """테이블에 파일 추가 (썸네일은 화면에 보일 때 백그라운드에서 생성)"""
+        try:
+            self.parent_widget.image_model.add_files([file_path])
             
         except Exception as e:
-            print(f"Error creating thumbnail: {str(e)}")
-            return None
+            print(f"Error adding file to table: {str(e)}")
 
     def get_selected_files(self):
         """선택된 파일 목록 반환"""
         try:
-            selected_files = []
-            table = self.parent_widget.image_table
-            
-            for row in range(table.rowCount()):
-                container = table.cellWidget(row, 0)  # 첫 번째 (유일한) 열의 컨테이너 위젯
-                if container:
-                    # 체크박스는 컨테이너의 레이아웃에서 첫 번째 아이템
-                    checkbox = container.layout().itemAt(0).widget()
-                    if isinstance(checkbox, QCheckBox) and checkbox.isChecked():
-                        # 파일 경로는 컨테이너의 속성으로 저장되어 있음
-                        file_path = container.property("file_path")
-                        if file_path:
-                            selected_files.append(file_path)
-                            print(f"Selected file: {file_path}")  # 디버깅용
-            
+            selected_files = self.parent_widget.image_model.checked_files()
             print(f"Total selected files: {len(selected_files)}")  # 디버깅용
             return selected_files
             
@@ -214,16 +206,10 @@ class FileOperations:
     def toggle_select_all(self):
         """전체 선택/해제 토글"""
         try:
-            table = self.parent_widget.image_table
             self.all_selected = not self.all_selected
             
-            # 모든 행의 체크박스 상태 변경
-            for row in range(table.rowCount()):
-                container = table.cellWidget(row, 0)
-                if container:
-                    checkbox = container.layout().itemAt(0).widget()  # 첫 번째 위젯은 체크박스
-                    if isinstance(checkbox, QCheckBox):
-                        checkbox.setChecked(self.all_selected)
+            # 모든 행의 체크 상태를 한 번에 변경
+            self.parent_widget.image_model.set_all_checked(self.all_selected)
             
             # 버튼 상태 업데이트
             self.parent_widget.update_button_states()
@@ -234,14 +220,7 @@ class FileOperations:
     def has_selected_files(self):
         """선택된 파일이 있는지 확인"""
         try:
-            table = self.parent_widget.image_table
-            for row in range(table.rowCount()):
-                container = table.cellWidget(row, 0)
-                if container:
-                    checkbox = container.layout().itemAt(0).widget()
-                    if isinstance(checkbox, QCheckBox) and checkbox.isChecked():
-                        return True
-            return False
+            return self.parent_widget.image_model.has_checked_files()
         except Exception as e:
             print(f"Error checking selected files: {str(e)}")
             return False
\ No newline at end of file
@@ -10,12 +10,12 @@ import re
 from core.dialog.response_select_dialog import ResponseSelectorDialog
 from core.dialog.progress_bar_dialog import ProgressBarDialog
 from PyQt5.QtWidgets import QProgressDialog, QMessageBox, QDialog, QFileDialog
-from PyQt5.QtCore import Qt, QObject, pyqtSignal
-from utils.worker_thread_chat_completion import WorkerThreadChatCompletion  # 새로운 import 추가
-import pandas as pd
-from anthropic import Anthropic
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QUrl
+from PyQt5.QtGui import QDesktopServices
+from utils.run_manifest import RunManifest
+from utils.state_manager import get_excel_checkbox_state
 from PyQt5.QtWidgets import QApplication
-import openpyxl
+# anthropic을 불러오는 워커 모듈은 시작 시간을 줄이기 위해 처리를 시작할 때 import
 
 
 class ImageProcessor(QObject):
@@ -33,6 +33,8 @@ class ImageProcessor(QObject):
         self.results = []
         self.processed_files = set()  # 처리된 파일 추적을 위한 set 추가
         self.processing_completed = False  # 처리 완료 상태 추적을 위한 플래그 추가
+        self.export_worker = None  # 엑셀 내보내기 워커
+        self.export_progress = None
         self.setup_logger()
         
         # 마지막 저장 위치 가져오기
@@ -43,23 +45,15 @@ class ImageProcessor(QObject):
         except:
             self.last_save_directory = os.path.expanduser('~')
         
-        # API 키를 settings_handler에서 가져옴
+        # API 키를 settings_handler에서 가져옴 (Anthropic 클라이언트는 워커가 처리를 시작할 때 생성)
         self.api_key = self.settings_handler.get_setting('claude_key')
-        self.client = None
-        
-        # API 키가 있을 때만 클라이언트 초기화
-        if self.api_key:
-            try:
-                self.client = Anthropic(api_key=self.api_key)
-            except Exception as e:
-                self.logger.error(f"Failed to initialize Anthropic client: {e}")
 
     def setup_logger(self):
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
 
-    def process_images(self, image_paths):
-        """이미지 처리 시작"""
+    def process_images(self, image_paths, resume_manifest=None):
+        """이미지 처리 시작 (resume_manifest가 있으면 해당 작업에 이어서 기록)"""
         try:
             # 새로운 처리 시작 시 초기화
             self.results = []
@@ -90,10 +84,17 @@ class ImageProcessor(QObject):
                 # 초기 로그 추가
                 self.progress_dialog.add_log(f"총 {len(image_paths)}개의 이미지 처리를 시작합니다.")
                 
-                # Worker 스레드 생성
-                self.worker = WorkerThreadChatCompletion(
+                # Worker 스레드 생성 (대량 작업은 설정에 따라 배치 API 사용)
+                from utils.worker_thread_chat_completion import WorkerThreadChatCompletion
+                from utils.worker_thread_batch import WorkerThreadBatch
+                worker_class = WorkerThreadChatCompletion
+                if self.settings_handler.get_setting('use_batch_api', False):
+                    worker_class = WorkerThreadBatch
+                    self.progress_dialog.add_log("배치 API 모드: 결과가 도착하기까지 시간이 걸릴 수 있습니다.")
+                self.worker = worker_class(
                     settings_handler=self.settings_handler,
-                    image_processor=self
+                    image_processor=self,
+                    resume_manifest=resume_manifest
                 )
 
                 if not self.worker:
@@ -109,8 +110,11 @@ class ImageProcessor(QObject):
                 self.worker.result_signal.connect(self.handle_result)
                 self.worker.error.connect(self.handle_error)
                 self.worker.finished.connect(self.process_complete)
+                self.worker.completed_signal.connect(self.process_complete)
                 self.worker.status_signal.connect(self.progress_dialog.add_log)
                 self.worker.increment_progress_signal.connect(self.update_progress_incremental)
+                self.worker.rate_signal.connect(self.progress_dialog.update_rate)
+                self.worker.partial_caption_signal.connect(self.progress_dialog.update_partial_caption)
                 
                 # 취소 버튼 연결
                 self.progress_dialog.cancel_button.clicked.connect(self.worker.stop)
@@ -131,6 +135,53 @@ class ImageProcessor(QObject):
             self.error_occurred.emit(str(e))
             self.cleanup()
 
+    def resume_run(self):
+        """중단된 작업 이어서 처리 - 매니페스트(또는 결과 JSONL)를 선택하면 끝나지 않은 이미지만 다시 처리"""
+        try:
+            file_path, _ = QFileDialog.getOpenFileName(
+                self.main_ui,
+                "이어서 처리할 작업 선택",
+                self.last_save_directory,
+                "작업 매니페스트 (*.manifest *.jsonl);;모든 파일 (*)"
+            )
+            if not file_path:
+                return
+
+            manifest_path = file_path
+            if not file_path.endswith('.manifest'):
+                manifest_path = RunManifest.manifest_path_for(file_path)
+            if not os.path.exists(manifest_path):
+                QMessageBox.warning(self.main_ui, "이어서 처리", "선택한 결과 파일의 작업 매니페스트를 찾을 수 없습니다.")
+                return
+
+            manifest = RunManifest.load(manifest_path)
+            recorded_paths, record_count = manifest.repair_results()
+            pending = manifest.pending_paths(recorded_paths)
+            self.logger.info(f"Resume {manifest_path}: {record_count} recorded, {len(pending)} pending")
+
+            if not pending:
+                manifest.close()
+                QMessageBox.information(self.main_ui, "이어서 처리", "남은 이미지가 없습니다. 모든 이미지가 처리되었습니다.")
+                return
+
+            reply = QMessageBox.question(
+                self.main_ui,
+                "이어서 처리",
+                f"완료된 결과 {record_count}개, 남은 이미지 {len(pending)}개\n"
+                f"남은 이미지를 이어서 처리하시겠습니까?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.Yes
+            )
+            if reply != QMessageBox.Yes:
+                manifest.close()
+                return
+
+            self.process_images(pending, resume_manifest=manifest)
+
+        except Exception as e:
+            self.logger.error(f"Error in resume_run: {e}")
+            self.error_occurred.emit(str(e))
+
     def parse_response(self, response):
         """API 응답 파싱"""
         try:
@@ -271,22 +322,27 @@ class ImageProcessor(QObject):
         self.logger.info("process_complete 호출됨")
         
         if self.progress_dialog:
-            # JSONL 파일 경로 가져오기
+            # JSONL 파일 경로와 기록된 결과 수 가져오기
             jsonl_file_path = self.worker.jsonl_file_path if self.worker else None
+            record_count = self.worker.jsonl_record_count if self.worker else 0
             
             self.progress_dialog.add_log("\n모든 이미지 처리가 완료되었습니다.")
-            self.progress_dialog.update_progress(100)
+            self.progress_dialog.progress_bar.setValue(100)
 
             if jsonl_file_path and os.path.exists(jsonl_file_path):
                 self.progress_dialog.add_log(f"\n결과가 JSONL 파일에 저장되었습니다: {jsonl_file_path}")
                 
-                # 결과 파일 수를 확인하여 로그 추가
+                # writer가 센 결과 수로 로그 추가 (파일을 다시 읽지 않음)
+                self.progress_dialog.add_log(f"총 {record_count}개의 이미지 처리 결과가 저장되었습니다.")
+
+                # 결과 JSONL을 엑셀로 내보낼 수 있도록 버튼 표시
                 try:
-                    with open(jsonl_file_path, 'r', encoding='utf-8') as f:
-                        line_count = sum(1 for _ in f)
-                    self.progress_dialog.add_log(f"총 {line_count}개의 이미지 처리 결과가 저장되었습니다.")
-                except Exception as e:
-                    self.logger.error(f"파일 라인 수 확인 오류: {e}")
+                    self.progress_dialog.export_button.clicked.disconnect()
+                except TypeError:
+                    pass
+                self.progress_dialog.export_button.clicked.connect(
+                    lambda: self.export_results_to_excel(jsonl_file_path))
+                self.progress_dialog.export_button.show()
             else:
                 self.progress_dialog.add_log("\n처리 결과 저장에 실패했거나 결과 파일을 찾을 수 없습니다.")
 
@@ -299,6 +355,72 @@ class ImageProcessor(QObject):
             # 취소 버튼 텍스트 변경
             self.progress_dialog.cancel_button.setText("닫기")
 
+    def export_results_to_excel(self, jsonl_file_path):
+        """결과 JSONL을 백그라운드에서 엑셀 파일로 내보내기"""
+        try:
+            if self.export_worker and self.export_worker.isRunning():
+                QMessageBox.information(self.progress_dialog, '알림', '이미 엑셀로 내보내고 있습니다.')
+                return
+
+            default_path = os.path.splitext(jsonl_file_path)[0] + '.xlsx'
+            xlsx_path, _ = QFileDialog.getSaveFileName(
+                self.progress_dialog, "엑셀로 내보내기", default_path, "Excel Files (*.xlsx)")
+            if not xlsx_path:
+                return
+            if not xlsx_path.lower().endswith('.xlsx'):
+                xlsx_path += '.xlsx'
+
+            from utils.worker_thread_xlsx_export import WorkerThreadXlsxExport  # openpyxl은 내보낼 때만 import
+
+            self.export_progress = QProgressDialog("엑셀로 내보내는 중...", "취소", 0, 0, self.progress_dialog)
+            self.export_progress.setWindowTitle("엑셀로 내보내기")
+            self.export_progress.setWindowModality(Qt.WindowModal)
+            self.export_progress.setMinimumDuration(0)
+            self.export_progress.setAutoClose(False)
+            self.export_progress.setAutoReset(False)
+
+            self.export_worker = WorkerThreadXlsxExport(jsonl_file_path, xlsx_path)
+            self.export_worker.progress_signal.connect(self.on_export_progress)
+            self.export_worker.finished_signal.connect(self.on_export_finished)
+            self.export_worker.error_signal.connect(self.on_export_error)
+            self.export_progress.canceled.connect(self.export_worker.cancel)
+            self.export_worker.start()
+            self.export_progress.show()
+
+        except Exception as e:
+            self.logger.error(f"Error in export_results_to_excel: {e}")
+            QMessageBox.critical(self.progress_dialog, '오류', f'엑셀 내보내기 중 오류가 발생했습니다: {str(e)}')
+
+    def on_export_progress(self, written):
+        if self.export_progress:
+            self.export_progress.setLabelText(f"엑셀로 내보내는 중... {written}행")
+
+    def close_export_progress(self):
+        if self.export_progress:
+            self.export_progress.close()
+            self.export_progress = None
+        if self.export_worker:
+            # 완료/오류 신호는 run()의 마지막에 보내므로 스레드가 끝날 때까지 기다린 뒤 참조를 놓음
+            self.export_worker.wait()
+            self.export_worker = None
+
+    def on_export_finished(self, xlsx_path, written, cancelled):
+        self.close_export_progress()
+        if cancelled:
+            message = "\n엑셀 내보내기를 취소했습니다."
+        else:
+            message = f"\n결과 {written}개를 엑셀 파일로 내보냈습니다: {xlsx_path}"
+            # 설정에서 엑셀 자동 열기를 켠 경우 내보낸 파일 열기
+            if get_excel_checkbox_state():
+                QDesktopServices.openUrl(QUrl.fromLocalFile(xlsx_path))
+        if self.progress_dialog:
+            self.progress_dialog.add_log(message)
+
+    def on_export_error(self, error_message):
+        self.close_export_progress()
+        self.logger.error(f"Excel export failed: {error_message}")
+        QMessageBox.critical(self.progress_dialog, '오류', f'엑셀 내보내기 중 오류가 발생했습니다: {error_message}')
+
     def cancel_processing(self):
         """처리 취소"""
         if self.worker:
@@ -325,8 +447,6 @@ class ImageProcessor(QObject):
     def set_api_key(self, api_key):
         """API 키 설정"""
         self.api_key = api_key
-        # Anthropic 클라이언트 초기화 또는 업데이트
-        self.client = Anthropic(api_key=api_key)
 
     def update_progress_incremental(self):
         """진행 상황을 증가시키는 메소드"""
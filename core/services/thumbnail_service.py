@@ -0,0 +1,130 @@
+# core/services/thumbnail_service.py
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QImageReader, QPixmap
+
+from utils.thumbnail_cache import get_thumbnail_cache
+
+
+class _ThumbnailSignals(QObject):
+    # 워커 스레드 → GUI 스레드 전달용 (QRunnable은 시그널을 가질 수 없음)
+    loaded = pyqtSignal(str, int, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, signals, cache, image_path, size, cache_key):
+        super().__init__()
+        self.signals = signals
+        self.cache = cache
+        self.image_path = image_path
+        self.size = size
+        self.cache_key = cache_key
+
+    def run(self):
+        try:
+            image = self.cache.load_image(self.cache_key) if self.cache_key else None
+            if image is None:
+                image = ThumbnailService.load_scaled_image(self.image_path, self.size)
+                if self.cache_key and not image.isNull():
+                    self.cache.store_image(self.cache_key, image)
+        except Exception as e:
+            print(f"썸네일 디코딩 실패 ({self.image_path}): {str(e)}")
+            image = QImage()
+        self.signals.loaded.emit(self.image_path, self.size, image)
+
+
+class ThumbnailService(QObject):
+    """썸네일을 워커 풀에서 디코딩하고 완료되면 콜백으로 전달하는 서비스
+
+    QImageReader.setScaledSize로 썸네일 크기에 맞춰 읽으므로(JPEG은 축소 디코딩)
+    원본 해상도 전체를 디코딩하지 않으며, GUI 스레드에서는 QPixmap 변환만 합니다.
+    만든 썸네일은 공유 ThumbnailCache(메모리 + 디스크)에 저장되어 다시 디코딩하지 않습니다.
+    """
+
+    thumbnail_ready = pyqtSignal(str, int, QPixmap)
+
+    def __init__(self, parent=None, max_threads=None, cache=None):
+        super().__init__(parent)
+        self.cache = cache or get_thumbnail_cache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or max(1, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self._signals = _ThumbnailSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+        self._waiting = {}  # (경로, 크기) → 완료 시 호출할 콜백 목록
+        self._cache_keys = {}  # (경로, 크기) → 요청 시점의 캐시 키
+        self._placeholders = {}
+
+    def request(self, image_path, size, callback):
+        """썸네일 요청 - 완료되면 callback(QPixmap 또는 실패 시 None)을 GUI 스레드에서 호출"""
+        key = (image_path, size)
+        if key in self._waiting:
+            # 같은 이미지를 이미 디코딩 중이면 결과만 함께 받음
+            self._waiting[key].append(callback)
+            return
+        cache_key = self.cache.make_key(image_path, size)
+        pixmap = self.cache.get_pixmap(cache_key) if cache_key else None
+        if pixmap is not None:
+            # 메모리 캐시에 있으면 바로 적용
+            self._deliver([callback], pixmap)
+            return
+        self._waiting[key] = [callback]
+        self._cache_keys[key] = cache_key
+        self.pool.start(_ThumbnailTask(self._signals, self.cache, image_path, size, cache_key))
+
+    def placeholder(self, size):
+        """디코딩이 끝나기 전까지 보여줄 빈 썸네일"""
+        if size not in self._placeholders:
+            pixmap = QPixmap(size, size)
+            pixmap.fill(QColor("#e8e8e8"))
+            self._placeholders[size] = pixmap
+        return self._placeholders[size]
+
+    def pending_count(self):
+        return len(self._waiting)
+
+    def wait_for_done(self, msecs=-1):
+        """남은 디코딩 작업이 끝날 때까지 대기 (종료 시 사용)"""
+        return self.pool.waitForDone(msecs)
+
+    def clear(self):
+        """아직 시작하지 않은 디코딩 작업 취소"""
+        self.pool.clear()
+        self._waiting.clear()
+        self._cache_keys.clear()
+
+    def _on_loaded(self, image_path, size, image):
+        callbacks = self._waiting.pop((image_path, size), [])
+        cache_key = self._cache_keys.pop((image_path, size), None)
+        pixmap = None if image.isNull() else QPixmap.fromImage(image)
+        if pixmap is not None:
+            if cache_key:
+                self.cache.put_pixmap(cache_key, pixmap)
+            self.thumbnail_ready.emit(image_path, size, pixmap)
+        self._deliver(callbacks, pixmap)
+
+    @staticmethod
+    def _deliver(callbacks, pixmap):
+        for callback in callbacks:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                # 디코딩 중에 행이 삭제되어 라벨이 이미 사라진 경우
+                pass
+            except Exception as e:
+                print(f"썸네일 적용 중 오류 발생: {str(e)}")
+
+    @staticmethod
+    def load_scaled_image(image_path, size):
+        """size × size 안에 들어가도록 축소하여 이미지 읽기 (실패 시 null QImage)"""
+        reader = QImageReader(image_path)
+        reader.setAutoTransform(True)  # EXIF 회전 반영
+        original_size = reader.size()
+        if original_size.isValid() and (original_size.width() > size or original_size.height() > size):
+            reader.setScaledSize(original_size.scaled(size, size, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            print(f"썸네일을 읽을 수 없습니다 ({image_path}): {reader.errorString()}")
+            return QImage()
+        if image.width() > size or image.height() > size:
+            # 축소 읽기를 지원하지 않는 형식이면 여기서 한 번 더 줄임
+            image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
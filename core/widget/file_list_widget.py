@@ -11,6 +11,7 @@ from PyQt5.QtCore import Qt, QFileInfo, QSize
 from PyQt5.QtWidgets import QFileIconProvider, QSizePolicy
 from PyQt5.QtCore import pyqtSignal
 from cfg.cfg import *
+from core.widget.image_table_model import ImageTableModel, ImageTableView
 
 class FileListWidget(QWidget):
     file_clicked = pyqtSignal(str, str)
@@ -21,13 +22,12 @@ class FileListWidget(QWidget):
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
 
-        self.image_table = QTableWidget(self)
-        self.image_table.setColumnCount(1)
-        self.image_table.setHorizontalHeaderLabels(['이미지'])
-        self.image_table.verticalHeader().setDefaultSectionSize(60)
-        self.image_table.setShowGrid(False)
+        self.thumbnail_size = QSize(100, 100)
+        self.image_model = ImageTableModel(self, thumbnail_size=self.thumbnail_size.width(),
+                                           fallback_icon=self.get_custom_icon)
+        self.image_table = ImageTableView(self.image_model, self, row_height=self.thumbnail_size.height() + 10)
         self.image_table.setStyleSheet("""  
-                    QTableWidget {
+                    QTableView {
                         background-color: white;
                         selection-background-color: #d0d0d0;
                         border: 2px solid black;  
@@ -39,21 +39,20 @@ class FileListWidget(QWidget):
                         border: 1px solid #d0d0d0;
                         border-bottom: 2px solid #a0a0a0;  /* 헤더 아래 경계선 */
                     }
-                    QTableWidget::item {
+                    QTableView::item {
                         border-bottom: 1px solid #d0d0d0;
                     }
-                    QTableWidget::item:selected {
+                    QTableView::item:selected {
                         background-color: #14cee3
                     }
-                    QTableWidget::item:selected:!active {
+                    QTableView::item:selected:!active {
                         background-color: #14cee3;
                         color: black;
                     }
                 """)
 
-        self.image_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.image_table.verticalHeader().setVisible(False)
-        self.image_table.cellClicked.connect(self.on_item_clicked)
+        self.image_table.clicked.connect(self.on_item_clicked)
+        self.image_model.check_state_changed.connect(self.on_checkbox_changed)
         self.image_table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.image_table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.layout.addWidget(self.image_table)
@@ -64,16 +63,15 @@ class FileListWidget(QWidget):
         self.all_selected = False
 
         # 지원되는 확장자 정의하기
-        self.allowed_formats = {'.jpg', '.jpeg', '.png', '.bmp'}
+        self.allowed_formats = {f'.{ext}' for ext in img_ext}
 
         # icon 폴더 경로 저장
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.icon_folder = resource_path(os.path.join("res", "img"))
 
-        self.thumbnail_size = QSize(100, 100)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        self.image_table.cellDoubleClicked.connect(self.open_image_doubleclick)
+        self.image_table.doubleClicked.connect(self.open_image_doubleclick)
 
         self.image_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.image_table.customContextMenuRequested.connect(self.show_context_menu)
@@ -84,121 +82,34 @@ class FileListWidget(QWidget):
         if isinstance(file_paths, str):
             file_paths = [file_paths]  # 단일 파일 경로를 리스트로 변환
 
-        if self.image_table.columnCount() == 0:
-            self.image_table.setColumnCount(1)  # 또는 필요한 열 수
-            self.image_table.horizontalHeader().setVisible(True)
-            self.image_table.verticalHeader().setVisible(True)
-
+        allowed_paths = []
         for file_path in file_paths:
             if not self.is_allowed_format(file_path):
                 print(f"지원되지 않는 파일 형식입니다: {file_path}")
                 continue
+            allowed_paths.append(file_path)
 
-            row_position = self.image_table.rowCount()
-            self.image_table.insertRow(row_position)
-            file_info = QFileInfo(file_path)
-            custom_icon = self.get_custom_icon(file_path)
-
-            try:
-                widget = self.create_item_widget(file_info, custom_icon, file_path)
-                self.image_table.setCellWidget(row_position, 0, widget)
-            except Exception as e:
-                print(f"파일 추가 중 오류 발생: {str(e)}")
-                self.image_table.removeRow(row_position)
-            else:
-                # 파일 추가가 성공한 경우에만 file_list에 추가
-                if hasattr(self, 'file_list'):
-                    self.file_list.append(file_path)
-
-        self.image_table.viewport().update()
-
-    def create_thumbnail(self, file_path):
-        image = QImage(file_path)
-        if image.isNull():
-            raise Exception("이미지를 불러올 수 없습니다.")
-
-        thumbnail = image.scaled(self.thumbnail_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        return QPixmap.fromImage(thumbnail)
+        # 행 위젯을 만들지 않고 모델에 한 번에 추가 (썸네일은 보이는 행만 백그라운드에서 생성)
+        self.image_model.add_files(allowed_paths)
+        if hasattr(self, 'file_list'):
+            self.file_list.extend(path for path in allowed_paths if path not in self.file_list)
 
-    def create_item_widget(self, file_info, custom_icon, file_path):
-        try:
-            widget = QWidget()
-            layout = QHBoxLayout(widget)
-            layout.setContentsMargins(5, 0, 5, 0)
-            layout.setSpacing(10)
+    def on_item_clicked(self, index):
+        if not index.isValid():
+            return
+        # 체크박스 위의 클릭은 델리게이트가 이미 처리함
+        if not self.image_table.is_on_checkbox(index):
+            self.image_model.toggle_checked(index.row())
 
-            checkbox = QCheckBox()
-            checkbox.stateChanged.connect(
-                lambda state: self.on_checkbox_changed(state, self.image_table.indexAt(widget.pos()).row()))
-            layout.addWidget(checkbox)
+        file_path = self.image_table.file_path_at(index)
+        if file_path:
+            self.file_clicked.emit(file_path, "preview")
 
-            icon_label = QLabel()
-            try:
-                # 썸네일 생성 시도
-                thumbnail = self.create_thumbnail(file_path)
-                icon_label.setPixmap(thumbnail)
-            except Exception as e:
-                print(f"썸네일 생성 실패: {str(e)}")
-                # 썸네일 생성 실패 시 기존 아이콘 사용
-                if custom_icon and not custom_icon.isNull():
-                    icon_label.setPixmap(custom_icon.pixmap(24, 24))
-                else:
-                    default_icon = QFileIconProvider().icon(file_info)
-                    icon_label.setPixmap(default_icon.pixmap(24, 24))
-            layout.addWidget(icon_label)
-
-            file_name_label = QLabel(file_info.fileName())
-            file_name_label.setStyleSheet("padding-left: 5px;")
-            layout.addWidget(file_name_label)
-
-            widget.setProperty("file_path", file_path)
-
-            layout.addStretch()
-            widget.setLayout(layout)
-            return widget
-        except Exception as e:
-            print(f"Error in create_item_widget: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise
-
-    def on_item_clicked(self, row, column):
-        widget = self.image_table.cellWidget(row, column)
-        if widget:
-            checkbox = widget.layout().itemAt(0).widget()
-            if isinstance(checkbox, QCheckBox):
-                checkbox.setChecked(not checkbox.isChecked())
-
-            file_path = widget.property("file_path")
-            if file_path:
-                self.file_clicked.emit(file_path, "preview")
-
-    def create_checkbox_from_item(self, item):
-        checkbox = QCheckBox()
-        checkbox.setChecked(item.checkState() == Qt.Checked)
-        checkbox.stateChanged.connect(
-            lambda state, row=self.image_table.rowCount(): self.on_checkbox_changed(state, row))
-        return checkbox
-
-    def on_checkbox_changed(self, state, row):
-        self.image_table.setRangeSelected(QTableWidgetSelectionRange(row, 0, row, 0), state == Qt.Checked)
-        color = QColor('#d0d0d0') if state == Qt.Checked else QColor('white')
-        self.update_row_color(row, color)
+    def on_checkbox_changed(self):
         self.files_selected.emit(self.get_selected_files())  # 선택된 파일 목록 전송
 
-    def update_row_color(self, row, color):
-        self.image_table.cellWidget(row, 0).setStyleSheet(f"background-color: {color.name()};")
-
     def get_selected_files(self):
-        selected_files = []
-        for row in range(self.image_table.rowCount()):
-            widget = self.image_table.cellWidget(row, 0)
-            if widget:
-                checkbox = widget.layout().itemAt(0).widget()
-                if checkbox.isChecked():
-                    file_path = widget.property("file_path")
-                    selected_files.append(file_path)
-        return selected_files
+        return self.image_model.checked_files()
 
     # 파일 확장자에 따라 res/img에 있는 아이콘 이미지 사용
     def get_custom_icon(self, file_path):
@@ -231,19 +142,17 @@ class FileListWidget(QWidget):
         _, file_format = os.path.splitext(file_path)
         return file_format.lower() in self.allowed_formats
 
-    def open_image_doubleclick(self, row, column):
-        widget = self.image_table.cellWidget(row, column)
-        if widget:
-            file_path = widget.property("file_path")
-            if file_path:
-                try:
-                    if os.name == 'nt':
-                        os.startfile(file_path)
-                    elif os.name == 'posix':
-                        opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
-                        subprocess.call([opener, file_path])
-                except Exception as e:
-                    print(f"파일 더블클릭 실패: {str(e)}")
+    def open_image_doubleclick(self, index):
+        file_path = self.image_table.file_path_at(index)
+        if file_path:
+            try:
+                if os.name == 'nt':
+                    os.startfile(file_path)
+                elif os.name == 'posix':
+                    opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                    subprocess.call([opener, file_path])
+            except Exception as e:
+                print(f"파일 더블클릭 실패: {str(e)}")
 
     # 항목 삭제를 위한 컨텍스트 메뉴 구현
     def show_context_menu(self):
@@ -252,11 +161,11 @@ class FileListWidget(QWidget):
         delete_action.triggered.connect(self.delete_selected_items)
         context_menu.addAction(delete_action)
 
-        delete_action.setEnabled(len(self.image_table.selectedRanges()) > 0)
+        delete_action.setEnabled(self.image_table.selectionModel().hasSelection())
         context_menu.exec_(QCursor.pos())
 
     def delete_selected_items(self):
-        selected_rows = set(index.row() for index in self.image_table.selectedIndexes())
+        selected_rows = self.image_table.selected_rows()
         if not selected_rows:
             QMessageBox.information(self, "알림", "삭제할 항목을 선택해주세요.")
             return
@@ -268,16 +177,14 @@ class FileListWidget(QWidget):
         if reply == QMessageBox.No:
             return
 
-        # 역순으로 정렬하여 삭제 (인덱스 변화 방지)
-        for row in sorted(selected_rows, reverse=True):
-            self.image_table.removeRow(row)
+        self.image_model.remove_rows(selected_rows)
 
         self.image_table.clearSelection()
         QMessageBox.information(self, "삭제 완료", f"{total_rows}개의 항목이 삭제되었습니다.")
-        print(f"삭제 후 테이블 총 행 수: {self.image_table.rowCount()}")
+        print(f"삭제 후 테이블 총 행 수: {self.image_model.rowCount()}")
 
     def clear(self):
-        self.image_table.setRowCount(0)
+        self.image_model.clear()
 
         # 선택 모델 초기화
         self.image_table.clearSelection()
@@ -0,0 +1,466 @@
+# core/widget/image_table_model.py
+import os
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QFileInfo, QRect, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import (QStyledItemDelegate, QStyle, QStyleOptionButton, QStyleOptionViewItem,
+                             QTableView, QHeaderView, QAbstractItemView, QApplication, QFileIconProvider)
+
+from core.services.thumbnail_service import ThumbnailService
+from utils.selection_store import SelectionStore
+
+FILE_PATH_ROLE = Qt.UserRole  # 전체 파일 경로
+THUMBNAIL_STATE_ROLE = Qt.UserRole + 1  # 'loading' / 'ready' / 'failed'
+
+
+class ImageTableModel(QAbstractTableModel):
+    """이미지 목록 모델 - 행마다 파일 경로와 체크 상태만 보관
+
+    위젯을 행마다 만들지 않으므로 수만 개의 파일도 가볍게 다룰 수 있으며,
+    썸네일은 뷰가 실제로 그리는(화면에 보이는) 행에 대해서만 요청합니다.
+    체크 상태는 경로 기준 SelectionStore에 보관하므로 선택된 파일 조회는 선택된 개수에만 비례합니다.
+    """
+
+    check_state_changed = pyqtSignal()  # 체크 상태가 바뀔 때
+    rows_removed = pyqtSignal(int)  # 한 번의 삭제 작업으로 지운 행 수
+
+    RESET_RANGE_THRESHOLD = 256  # 흩어진 구간이 이보다 많으면 구간별 삭제 대신 모델 리셋
+    REMOVAL_FLUSH_MS = 200  # schedule_removal로 모은 삭제를 반영하는 간격
+
+    def __init__(self, parent=None, thumbnail_size=80, header='이미지', fallback_icon=None):
+        super().__init__(parent)
+        self.thumbnail_size = thumbnail_size
+        self.header = header
+        self.fallback_icon = fallback_icon  # 썸네일을 만들 수 없을 때 쓸 아이콘 (경로 → QIcon, 선택)
+        self.thumbnail_service = ThumbnailService(self)
+        self._paths = []
+        self.selection = SelectionStore()
+        self._check_anchor = None  # Shift 범위 체크의 기준 경로 (마지막으로 직접 토글한 행)
+        self._rows = {}  # 경로 → 행 번호
+        self._thumbnail_keys = {}  # 경로 → 썸네일 캐시 키 (처음 그릴 때 계산)
+        self._loading = set()
+        self._failed = set()
+        self._icon_provider = None
+        self._pending_removals = set()
+        self._removal_timer = QTimer(self)
+        self._removal_timer.setSingleShot(True)
+        self._removal_timer.setInterval(self.REMOVAL_FLUSH_MS)
+        self._removal_timer.timeout.connect(self.flush_removals)
+
+    # ---- QAbstractTableModel ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section == 0:
+            return self.header
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._paths):
+            return None
+        file_path = self._paths[index.row()]
+        if role == Qt.DisplayRole:
+            return os.path.basename(file_path)
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if file_path in self.selection else Qt.Unchecked
+        if role == Qt.DecorationRole:
+            return self.thumbnail(file_path)
+        if role == FILE_PATH_ROLE:
+            return file_path
+        if role == Qt.ToolTipRole:
+            return file_path
+        if role == THUMBNAIL_STATE_ROLE:
+            if file_path in self._failed:
+                return 'failed'
+            return 'loading' if file_path in self._loading else 'ready'
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self.set_checked(index.row(), value == Qt.Checked or value is True)
+        return True
+
+    # ---- 썸네일 ----
+
+    def thumbnail(self, file_path):
+        """표시할 썸네일 - 아직 없으면 백그라운드 디코딩을 요청하고 자리표시자 반환"""
+        if file_path in self._failed:
+            return self.failed_icon(file_path).pixmap(24, 24)
+
+        cache = self.thumbnail_service.cache
+        key = self._thumbnail_keys.get(file_path)
+        if key is None:
+            key = self._thumbnail_keys[file_path] = cache.make_key(file_path, self.thumbnail_size) or ''
+        pixmap = cache.get_pixmap(key) if key else None
+        if pixmap is not None:
+            return pixmap
+
+        if file_path not in self._loading:
+            self._loading.add(file_path)
+            self.thumbnail_service.request(
+                file_path, self.thumbnail_size,
+                lambda result, path=file_path: self._on_thumbnail_ready(path, result))
+        return self.thumbnail_service.placeholder(self.thumbnail_size)
+
+    def failed_icon(self, file_path):
+        icon = self.fallback_icon(file_path) if self.fallback_icon else None
+        if icon is None or icon.isNull():
+            if self._icon_provider is None:
+                self._icon_provider = QFileIconProvider()
+            icon = self._icon_provider.icon(QFileInfo(file_path))
+        return icon
+
+    def _on_thumbnail_ready(self, file_path, pixmap):
+        self._loading.discard(file_path)
+        if pixmap is None:
+            print(f"썸네일 생성 실패: {file_path}")
+            self._failed.add(file_path)
+        elif not self._thumbnail_keys.get(file_path):
+            # 캐시 키를 만들 수 없었던 파일은 다음 요청 때 다시 계산
+            self._thumbnail_keys.pop(file_path, None)
+        row = self._rows.get(file_path)
+        if row is not None:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    # ---- 행 추가/삭제 ----
+
+    def add_files(self, file_paths):
+        """파일 추가 (이미 있는 경로는 건너뜀) - 추가된 개수 반환"""
+        new_paths = []
+        seen = set()
+        for file_path in file_paths:
+            if file_path and file_path not in self._rows and file_path not in seen:
+                seen.add(file_path)
+                new_paths.append(file_path)
+        if not new_paths:
+            return 0
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+        for offset, file_path in enumerate(new_paths):
+            self._rows[file_path] = first + offset
+        self._paths.extend(new_paths)
+        self.endInsertRows()
+        return len(new_paths)
+
+    def remove_rows(self, rows):
+        """지정한 행 삭제 - 삭제된 개수 반환
+
+        연속된 행은 구간 하나로 묶어 beginRemoveRows를 한 번만 호출하고, 행 번호 갱신도 마지막에 한 번만 합니다.
+        구간이 너무 많이 흩어져 있으면 구간마다 알리는 대신 모델을 한 번 리셋합니다.
+        """
+        rows = sorted({row for row in rows if 0 <= row < len(self._paths)})
+        if not rows:
+            return 0
+        ranges = self.contiguous_ranges(rows)
+        had_checked = False
+        if len(ranges) > self.RESET_RANGE_THRESHOLD:
+            self.beginResetModel()
+            removed = set(rows)
+            for row in rows:
+                had_checked = self._forget(self._paths[row]) or had_checked
+            self._paths = [path for row, path in enumerate(self._paths) if row not in removed]
+            self._reindex()
+            self.endResetModel()
+        else:
+            # 뒤쪽 구간부터 지워야 앞쪽 행 번호가 바뀌지 않음
+            for first, last in reversed(ranges):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                for file_path in self._paths[first:last + 1]:
+                    had_checked = self._forget(file_path) or had_checked
+                del self._paths[first:last + 1]
+                self.endRemoveRows()
+            self._reindex()
+        self.rows_removed.emit(len(rows))
+        if had_checked:
+            self.check_state_changed.emit()
+        return len(rows)
+
+    @staticmethod
+    def contiguous_ranges(rows):
+        """정렬된 행 번호 목록을 연속 구간 [(first, last), ...]으로 묶기"""
+        ranges = []
+        for row in rows:
+            if ranges and row == ranges[-1][1] + 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        return [tuple(item) for item in ranges]
+
+    def remove_files(self, file_paths):
+        """지정한 경로의 행 삭제 - 삭제된 개수 반환"""
+        file_paths = set(file_paths)
+        self._pending_removals -= file_paths
+        return self.remove_rows([self._rows[path] for path in file_paths if path in self._rows])
+
+    def schedule_removal(self, file_paths):
+        """결과가 도착할 때마다 호출 - 잠시 모았다가 한 번에 삭제 (처리 중 행을 하나씩 지우지 않음)"""
+        self._pending_removals.update(file_paths)
+        if self._pending_removals and not self._removal_timer.isActive():
+            self._removal_timer.start()
+
+    def flush_removals(self):
+        """예약된 삭제를 바로 반영 - 삭제된 개수 반환"""
+        self._removal_timer.stop()
+        if not self._pending_removals:
+            return 0
+        pending, self._pending_removals = self._pending_removals, set()
+        return self.remove_files(pending)
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths = []
+        self.selection.clear()
+        self._check_anchor = None
+        self._rows = {}
+        self._thumbnail_keys = {}
+        self._loading = set()
+        self._failed = set()
+        self._pending_removals = set()
+        self._removal_timer.stop()
+        self.endResetModel()
+        self.check_state_changed.emit()
+
+    def _forget(self, file_path):
+        """삭제되는 경로의 부가 정보 정리 - 체크되어 있었으면 True"""
+        if self._check_anchor == file_path:
+            self._check_anchor = None
+        self._rows.pop(file_path, None)
+        self._thumbnail_keys.pop(file_path, None)
+        self._failed.discard(file_path)
+        return self.selection.set_selected(file_path, False)
+
+    def _reindex(self):
+        self._rows = {file_path: row for row, file_path in enumerate(self._paths)}
+
+    # ---- 조회 ----
+
+    def file_path(self, row):
+        return self._paths[row] if 0 <= row < len(self._paths) else None
+
+    def file_paths(self):
+        return list(self._paths)
+
+    def row_of(self, file_path):
+        """경로의 행 번호 (없으면 -1)"""
+        return self._rows.get(file_path, -1)
+
+    # ---- 체크 상태 ----
+
+    def is_checked(self, row):
+        return 0 <= row < len(self._paths) and self._paths[row] in self.selection
+
+    def set_checked(self, row, checked):
+        if not 0 <= row < len(self._paths):
+            return
+        self._check_anchor = self._paths[row]
+        if not self.selection.set_selected(self._paths[row], bool(checked)):
+            return
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_state_changed.emit()
+
+    def toggle_checked(self, row):
+        self.set_checked(row, not self.is_checked(row))
+
+    def set_range_checked(self, first, last, checked):
+        """first~last 행(순서 무관, 양 끝 포함)을 한 번에 체크/해제"""
+        first, last = sorted((first, last))
+        first, last = max(first, 0), min(last, len(self._paths) - 1)
+        if first > last:
+            return
+        if self.selection.set_many(self._paths[first:last + 1], bool(checked)):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0), [Qt.CheckStateRole])
+            self.check_state_changed.emit()
+
+    def extend_checked_to(self, row):
+        """Shift+체크 - 마지막으로 토글한 행부터 row까지를 그 행과 같은 체크 상태로 맞춤"""
+        anchor = self._rows.get(self._check_anchor)
+        if anchor is None:
+            self.toggle_checked(row)
+            return
+        checked = self.is_checked(anchor)
+        self.set_range_checked(anchor, row, checked)
+
+    def set_files_checked(self, file_paths, checked):
+        """지정한 경로들을 한 번에 체크/해제"""
+        file_paths = [path for path in file_paths if path in self._rows]
+        if self.selection.set_many(file_paths, bool(checked)):
+            rows = [self._rows[path] for path in file_paths]
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), 0), [Qt.CheckStateRole])
+            self.check_state_changed.emit()
+
+    def set_all_checked(self, checked):
+        """모든 행을 한 번에 체크/해제"""
+        if not self._paths:
+            return
+        if checked:
+            self.selection.select_all(self._paths)
+        else:
+            self.selection.clear()
+        self._check_anchor = None
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self._paths) - 1, 0), [Qt.CheckStateRole])
+        self.check_state_changed.emit()
+
+    def checked_count(self):
+        return len(self.selection)
+
+    def checked_rows(self):
+        return sorted(self._rows[path] for path in self.selection)
+
+    def checked_files(self):
+        return self.selection.selected(self._rows)
+
+    def has_checked_files(self):
+        return bool(self.selection)
+
+
+class ImageItemDelegate(QStyledItemDelegate):
+    """체크박스 · 썸네일 · 파일명을 한 행에 그리는 델리게이트 (행마다 위젯을 만들지 않음)"""
+
+    MARGIN = 5
+    SPACING = 10
+
+    def __init__(self, parent=None, thumbnail_size=80, row_height=100):
+        super().__init__(parent)
+        self.thumbnail_size = thumbnail_size
+        self.row_height = row_height
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.row_height)
+
+    def checkbox_rect(self, option):
+        style = option.widget.style() if option.widget else QApplication.style()
+        indicator = QStyleOptionButton()
+        size = style.subElementRect(QStyle.SE_CheckBoxIndicator, indicator, option.widget).size()
+        rect = option.rect
+        return QRect(rect.left() + self.MARGIN, rect.top() + (rect.height() - size.height()) // 2,
+                     size.width(), size.height())
+
+    def thumbnail_rect(self, option):
+        checkbox = self.checkbox_rect(option)
+        rect = option.rect
+        return QRect(checkbox.right() + self.SPACING, rect.top() + (rect.height() - self.thumbnail_size) // 2,
+                     self.thumbnail_size, self.thumbnail_size)
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+
+        # 배경(선택/호버 상태 포함)만 기본 스타일로 그림
+        opt.text = ''
+        opt.icon = QIcon()
+        opt.features &= ~(QStyleOptionViewItem.HasCheckIndicator | QStyleOptionViewItem.HasDecoration
+                          | QStyleOptionViewItem.HasDisplay)
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+
+        painter.save()
+        try:
+            # 체크박스
+            checkbox = QStyleOptionButton()
+            checkbox.rect = self.checkbox_rect(option)
+            checkbox.state = QStyle.State_Enabled
+            checkbox.state |= QStyle.State_On if index.data(Qt.CheckStateRole) == Qt.Checked else QStyle.State_Off
+            style.drawPrimitive(QStyle.PE_IndicatorCheckBox, checkbox, painter, widget)
+
+            # 썸네일 (비율 유지, 가운데 정렬)
+            thumb_rect = self.thumbnail_rect(option)
+            pixmap = index.data(Qt.DecorationRole)
+            if pixmap is not None and not pixmap.isNull():
+                size = pixmap.size().scaled(thumb_rect.size(), Qt.KeepAspectRatio) \
+                    if pixmap.width() > thumb_rect.width() or pixmap.height() > thumb_rect.height() else pixmap.size()
+                target = QRect(0, 0, size.width(), size.height())
+                target.moveCenter(thumb_rect.center())
+                painter.drawPixmap(target, pixmap)
+
+            # 파일명
+            text_rect = QRect(thumb_rect.right() + self.SPACING, option.rect.top(),
+                              option.rect.right() - thumb_rect.right() - self.SPACING - self.MARGIN,
+                              option.rect.height())
+            if option.state & QStyle.State_Selected and option.state & QStyle.State_Active:
+                painter.setPen(option.palette.highlightedText().color())
+            else:
+                painter.setPen(option.palette.text().color())
+            name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole) or '', Qt.ElideMiddle, text_rect.width())
+            painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, name)
+        finally:
+            painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """체크박스 영역 클릭 또는 스페이스 키로 체크 상태 전환 (Shift+클릭은 범위 체크)"""
+        if not index.flags() & Qt.ItemIsUserCheckable:
+            return False
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            # 체크박스 위의 누름은 행 선택으로 넘기지 않음
+            return event.button() == Qt.LeftButton and self.checkbox_rect(option).contains(event.pos())
+        if event.type() == QEvent.MouseButtonRelease:
+            if event.button() != Qt.LeftButton or not self.checkbox_rect(option).contains(event.pos()):
+                return False
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in (Qt.Key_Space, Qt.Key_Select):
+                return False
+        else:
+            return False
+        if event.type() == QEvent.MouseButtonRelease and event.modifiers() & Qt.ShiftModifier \
+                and hasattr(model, 'extend_checked_to'):
+            # Shift+클릭은 마지막으로 체크한 행부터 범위 체크
+            model.extend_checked_to(index.row())
+            return True
+        checked = index.data(Qt.CheckStateRole) == Qt.Checked
+        return model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+
+
+class ImageTableView(QTableView):
+    """ImageTableModel + ImageItemDelegate를 쓰는 한 열짜리 이미지 목록 뷰
+
+    모든 행의 높이가 같으므로(Fixed) 행 수와 관계없이 보이는 행만 배치하고 그립니다.
+    """
+
+    def __init__(self, model, parent=None, row_height=100):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(ImageItemDelegate(self, model.thumbnail_size, row_height))
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(row_height)
+        self.last_click_pos = None
+
+    def file_path_at(self, index):
+        return index.data(FILE_PATH_ROLE) if index.isValid() else None
+
+    def mouseReleaseEvent(self, event):
+        self.last_click_pos = event.pos()
+        super().mouseReleaseEvent(event)
+
+    def is_on_checkbox(self, index, pos=None):
+        """마지막 클릭 위치(또는 뷰포트 좌표 pos)가 index 행의 체크박스 위인지 (clicked 처리에서 중복 토글 방지용)"""
+        pos = pos if pos is not None else self.last_click_pos
+        if not index.isValid() or pos is None:
+            return False
+        option = QStyleOptionViewItem()
+        option.initFrom(self)
+        option.rect = self.visualRect(index)
+        option.widget = self
+        return self.itemDelegate().checkbox_rect(option).contains(pos)
+
+    def selected_rows(self):
+        """행 선택(하이라이트)된 행 번호 목록"""
+        return sorted(index.row() for index in self.selectionModel().selectedRows())
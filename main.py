@@ -1,6 +1,8 @@
 import sys
 import os
 import json
+import threading
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from core.dialog.main_dialog import MainUI
 from core.dialog.setting_dialog import SettingsDialog
@@ -96,6 +98,16 @@ def validate_settings():
         print(f"Error validating settings: {str(e)}")
         return False
 
+def preload_heavy_modules():
+    """처리에 필요한 무거운 모듈(anthropic 등)을 백그라운드 스레드에서 미리 import"""
+    def preload():
+        try:
+            import utils.worker_thread_batch  # noqa: F401 (워커 -> anthropic)
+        except Exception as e:
+            print(f"모듈 미리 불러오기 실패: {str(e)}")
+
+    threading.Thread(target=preload, name="preload-modules", daemon=True).start()
+
 def main():
     app = QApplication(sys.argv)
     
@@ -103,7 +115,13 @@ def main():
     window = MainUI()
     window.show()
     
+    # 창을 먼저 띄운 뒤 첫 처리 전에 무거운 모듈을 불러옴 (시작 시에는 import하지 않음)
+    QTimer.singleShot(500, preload_heavy_modules)
+    
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    # 유사 이미지 해시 계산용 프로세스 풀 (PyInstaller로 빌드한 실행 파일에서도 동작하도록)
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,56 @@
+# test/benchmark_json_extraction.py
+# 응답 JSON 추출 시간 측정: python -m test.benchmark_json_extraction [반복 횟수]
+import json
+import re
+import sys
+import time
+
+from test.json_extraction_corpus import load_corpus
+from utils.json_scanner import find_json_object
+
+# 이전 구현 (코드 블록 정규식 -> 3단계 중첩 괄호 정규식 -> 전체 json.loads)
+LEGACY_FENCE_PATTERN = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+LEGACY_OBJECT_PATTERN = re.compile(r'(\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\})')
+
+
+def legacy_extract(text):
+    match = LEGACY_FENCE_PATTERN.search(text)
+    if match:
+        try:
+            return json.loads(match.group(1).strip())
+        except Exception:  # 이전 구현과 같이 모든 오류를 무시 (깊은 중첩의 RecursionError 포함)
+            pass
+    match = LEGACY_OBJECT_PATTERN.search(text)
+    if match:
+        try:
+            return json.loads(match.group(1).strip())
+        except Exception:  # 이전 구현과 같이 모든 오류를 무시 (깊은 중첩의 RecursionError 포함)
+            pass
+    try:
+        return json.loads(text)
+    except Exception:
+        return None
+
+
+def measure(extract, text, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(repeat=5):
+    print(f"{'응답':<34}{'길이':>8}{'scanner(ms)':>14}{'legacy(ms)':>13}  정확도(scanner/legacy)")
+    for entry in load_corpus():
+        reply, expected = entry["reply"], entry["expected"]
+        scanner_time, scanner_result = measure(find_json_object, reply, repeat)
+        legacy_time, legacy_result = measure(legacy_extract, reply, repeat)
+        print(f"{entry['name']:<34}{len(reply):>8}{scanner_time * 1000:>14.3f}{legacy_time * 1000:>13.3f}  "
+              f"{'O' if scanner_result == expected else 'X'}/{'O' if legacy_result == expected else 'X'}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,54 @@
+# test/json_extraction_corpus.py
+# JSON 추출 벤치마크/테스트용 응답 모음 - 기록된 응답(data/caption_replies.jsonl)과 생성한 비정상 응답
+import json
+import os
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "caption_replies.jsonl")
+
+CAPTION = {"text": {"english_caption": "A cat. It sits. It is calm.", "korean_caption": "고양이. 앉아 있다. 평온하다."}}
+
+
+def load_recorded_replies():
+    """기록된 응답 목록 (name, reply, expected, expected_array)"""
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def generate_pathological_replies(size=20000):
+    """괄호가 맞지 않거나 매우 긴 응답 - 정규식 역추적/전체 재탐색을 유발하는 형태"""
+    caption = json.dumps(CAPTION, ensure_ascii=False)
+    return [
+        {"name": "unclosed_brace_long_tail", "reply": "{" + "a" * size, "expected": None},
+        {"name": "many_unclosed_braces", "reply": "{ x " * (size // 4), "expected": None},
+        {"name": "unclosed_then_fenced", "reply": "{ " * (size // 2) + "\n```json\n" + caption + "\n```",
+         "expected": CAPTION},
+        {"name": "unterminated_string", "reply": '{"text": "' + "가" * size, "expected": None},
+        {"name": "deep_open_nesting", "reply": '{"a": ' * (size // 6), "expected": None},
+        {"name": "long_chatter_after_json", "reply": caption + " 추가 설명입니다." * (size // 8), "expected": CAPTION},
+        {"name": "invalid_objects_then_json", "reply": "{not json} " * (size // 11) + caption, "expected": CAPTION},
+    ]
+
+
+def stray_delimiter_replies():
+    """JSON 앞의 설명에 닫히지 않는 괄호나 짝이 맞지 않는 따옴표가 있는 응답 (이전 정규식 구현이 처리하던 형태)"""
+    return [
+        {"name": "unclosed_brace_in_prose", "reply": 'Format {like this:\n{"text": {"a": 1}}',
+         "expected": {"text": {"a": 1}}},
+        {"name": "unbalanced_quote_in_prose", "reply": 'It\'s a "nice {" day. {"text": 1}',
+         "expected": {"text": 1}},
+        {"name": "invalid_object_wrapping_json", "reply": '{설명: {"text": {"a": 1}} 끝}',
+         "expected": {"text": {"a": 1}}},
+        {"name": "unclosed_brace_before_caption", "reply": "예시 {형식:\n" + json.dumps(CAPTION, ensure_ascii=False),
+         "expected": CAPTION},
+        # JSON 뒤의 인라인 코드 백틱에서 설명 속 괄호로 시작한 후보가 끝나는 경우
+        {"name": "prose_brace_then_inline_code",
+         "reply": 'Format {like this:\n{"text": {"a": 1}}\nThe `text` key holds the captions.',
+         "expected": {"text": {"a": 1}}},
+        {"name": "prose_brace_then_fenced_json",
+         "reply": "예시 {형식:\n```json\n" + json.dumps(CAPTION, ensure_ascii=False) + "\n```",
+         "expected": CAPTION},
+    ]
+
+
+def load_corpus(size=20000):
+    return load_recorded_replies() + stray_delimiter_replies() + generate_pathological_replies(size)
@@ -0,0 +1,284 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("anthropic")
+QtGui = pytest.importorskip("PyQt5.QtGui")
+
+from PyQt5.QtWidgets import QApplication
+
+import utils.worker_thread_chat_completion as worker_module
+from utils.caption_cache import CaptionCache
+from utils.run_manifest import RunManifest
+from utils.worker_thread_batch import WorkerThreadBatch
+
+CAPTION = {
+    "text": {
+        "english_caption": "A red square. It is on a plain background. The edges are sharp.",
+        "korean_caption": "빨간 사각형. 단색 배경 위에 있다. 가장자리가 선명하다."
+    }
+}
+
+
+class BatchStandInServer(ThreadingHTTPServer):
+    """Message Batches API의 생성/조회/결과/취소만 흉내 내는 로컬 대체 서버
+
+    생성된 배치는 poll_count번 조회된 뒤 끝난 것으로 처리하며,
+    fail_ids에 포함된 custom_id는 errored 결과를 반환합니다.
+    retrieve_status를 지정하면 배치 상태 조회가 그 상태 코드로 실패합니다.
+    """
+
+    def __init__(self, poll_count=2, fail_ids=()):
+        super().__init__(("127.0.0.1", 0), BatchStandInHandler)
+        self.poll_count = poll_count
+        self.fail_ids = set(fail_ids)
+        self.retrieve_status = None
+        self.retrieve_count = 0
+        self.batches = {}
+        self.submitted = []
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def batch_object(self, batch_id):
+        batch = self.batches[batch_id]
+        ended = batch["polls"] >= self.poll_count or batch["canceled"]
+        total = len(batch["requests"])
+        errored = len([r for r in batch["requests"] if r["custom_id"] in self.fail_ids]) if ended else 0
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total - errored if ended else 0,
+                "errored": errored,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2024-01-01T00:00:00Z",
+            "expires_at": "2024-01-02T00:00:00Z",
+            "ended_at": "2024-01-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def result_line(self, request):
+        custom_id = request["custom_id"]
+        if custom_id in self.fail_ids:
+            result = {"type": "errored",
+                      "error": {"type": "error", "error": {"type": "invalid_request_error", "message": "bad image"}}}
+        else:
+            params = request["params"]
+            if params.get("tools"):
+                content = [{"type": "tool_use", "id": f"toolu_{custom_id}", "name": params["tools"][0]["name"],
+                            "input": CAPTION["text"]}]
+            else:
+                content = [{"type": "text", "text": "```json\n" + json.dumps(CAPTION, ensure_ascii=False) + "\n```"}]
+            result = {
+                "type": "succeeded",
+                "message": {
+                    "id": f"msg_{custom_id}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["params"]["model"],
+                    "content": content,
+                    "stop_reason": "tool_use" if params.get("tools") else "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 10, "output_tokens": 10},
+                },
+            }
+        return json.dumps({"custom_id": custom_id, "result": result}, ensure_ascii=False)
+
+
+class BatchStandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, content_type="application/json", status=200):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        parts = self.path.strip("/").split("/")
+        if self.path.endswith("/cancel"):
+            self.server.batches[parts[3]]["canceled"] = True
+            self.send_json(self.server.batch_object(parts[3]))
+            return
+        batch_id = f"msgbatch_{len(self.server.batches):04d}"
+        self.server.batches[batch_id] = {"requests": payload["requests"], "polls": 0, "canceled": False}
+        self.server.submitted.append(payload["requests"])
+        self.send_json(self.server.batch_object(batch_id))
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        batch_id = parts[3]
+        if self.path.endswith("/results"):
+            lines = [self.server.result_line(r) for r in self.server.batches[batch_id]["requests"]]
+            self.send_json(("\n".join(lines) + "\n").encode("utf-8"), "application/binary")
+            return
+        self.server.retrieve_count += 1
+        if self.server.retrieve_status:
+            error = {"type": "error", "error": {"type": "api_error", "message": "retrieve failed"}}
+            self.send_json(error, status=self.server.retrieve_status)
+            return
+        self.server.batches[batch_id]["polls"] += 1
+        self.send_json(self.server.batch_object(batch_id))
+
+
+class SettingsStub:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def server():
+    server = BatchStandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_images(directory, count):
+    paths = []
+    for index in range(count):
+        image = QtGui.QImage(32 + index, 32, QtGui.QImage.Format_RGB32)
+        image.fill(QtGui.QColor(255, 0, 0))
+        path = os.path.join(directory, f"img{index}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def run_batch_worker(server, image_paths, jsonl_path, **settings):
+    settings = dict({"api_base_url": server.base_url, "caption_cache_enabled": False,
+                     "batch_poll_interval": 0.05}, **settings)
+    worker = WorkerThreadBatch(api_key="test-key", settings_handler=SettingsStub(**settings),
+                               image_paths=image_paths)
+
+    def initialize_jsonl_file():
+        worker.jsonl_file_path = jsonl_path
+        worker.open_jsonl_writer('w')
+        worker.create_manifest()
+        return True
+
+    worker.initialize_jsonl_file = initialize_jsonl_file
+    results = []
+    worker.result_signal.connect(lambda path, result: results.append((path, result)))
+    worker.run()
+    return worker, results
+
+
+def test_batch_results_are_written_in_realtime_format(app, server, tmp_path):
+    image_paths = make_images(str(tmp_path), 5)
+    jsonl_path = str(tmp_path / "result.jsonl")
+
+    worker, results = run_batch_worker(server, image_paths, jsonl_path, batch_max_requests=2)
+
+    # 요청 수 한도에 맞춰 3개의 배치로 나뉘어 제출됨
+    assert [len(requests) for requests in server.submitted] == [2, 2, 1]
+    params = server.submitted[0][0]["params"]
+    assert params["messages"][0]["content"][0]["source"]["media_type"] == "image/png"
+
+    with open(jsonl_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == len(results) == 5
+    assert {record["image_path"] for record in records} == {path.replace("\\", "/") for path in image_paths}
+    assert records[0]["text"] == CAPTION["text"]
+    assert records[0]["upload"]["media_type"] == "image/png"
+
+
+def test_batch_text_replies_without_structured_output(app, server, tmp_path):
+    image_paths = make_images(str(tmp_path), 2)
+    jsonl_path = str(tmp_path / "result.jsonl")
+
+    worker, results = run_batch_worker(server, image_paths, jsonl_path, structured_output=False)
+
+    assert "tools" not in server.submitted[0][0]["params"]
+    assert [result["text"] for _, result in results] == [CAPTION["text"]] * 2
+
+
+def test_errored_batch_entries_are_marked_failed(app, server, tmp_path):
+    server.fail_ids = {"img-000001"}
+    image_paths = make_images(str(tmp_path), 3)
+    jsonl_path = str(tmp_path / "result.jsonl")
+
+    worker, results = run_batch_worker(server, image_paths, jsonl_path)
+
+    assert sorted(path for path, _ in results) == [image_paths[0], image_paths[2]]
+
+    manifest = RunManifest.load(RunManifest.manifest_path_for(jsonl_path))
+    assert manifest.entries[image_paths[1]]["state"] == RunManifest.FAILED
+    assert manifest.pending_paths() == [image_paths[1]]
+
+
+@pytest.mark.parametrize("status, expected_retrieves", [(404, 1), (401, 1), (500, 3)])
+def test_failing_status_checks_fail_the_batch(app, server, tmp_path, status, expected_retrieves):
+    server.retrieve_status = status
+    image_paths = make_images(str(tmp_path), 2)
+    jsonl_path = str(tmp_path / "result.jsonl")
+
+    # 영구 오류(401/404)는 바로, 일시 오류는 연속 실패 한도에서 포기하고 워커가 끝나야 함
+    worker, results = run_batch_worker(server, image_paths, jsonl_path, batch_max_retrieve_failures=3)
+
+    assert results == []
+    assert server.retrieve_count == expected_retrieves
+    assert worker.batches == {}
+    manifest = RunManifest.load(RunManifest.manifest_path_for(jsonl_path))
+    assert manifest.pending_paths() == image_paths
+    assert {entry["state"] for entry in manifest.entries.values()} == {RunManifest.FAILED}
+
+
+def test_status_check_failures_reset_after_success(app, server, tmp_path, monkeypatch):
+    image_paths = make_images(str(tmp_path), 1)
+    jsonl_path = str(tmp_path / "result.jsonl")
+
+    def flaky_poll():
+        # 두 번에 한 번씩 상태 조회 실패 - 연속 실패가 아니므로 한도(2)에 닿지 않음
+        server.retrieve_status = None if server.retrieve_status else 500
+
+    server.poll_count = 3
+    monkeypatch.setattr(WorkerThreadBatch, "wait_for_poll", lambda self: flaky_poll())
+    worker, results = run_batch_worker(server, image_paths, jsonl_path, batch_max_retrieve_failures=2)
+
+    assert [path for path, _ in results] == image_paths
+
+
+def test_caption_cache_is_closed_after_run(app, server, tmp_path, monkeypatch):
+    closed = []
+
+    class TrackedCache(CaptionCache):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr(worker_module, "CaptionCache",
+                        lambda **kwargs: TrackedCache(str(tmp_path / "cache.sqlite3"), **kwargs))
+    image_paths = make_images(str(tmp_path), 2)
+
+    worker, results = run_batch_worker(server, image_paths, str(tmp_path / "result.jsonl"),
+                                       caption_cache_enabled=True)
+
+    assert len(results) == 2
+    assert len(closed) == 1 and worker.caption_cache is None
@@ -0,0 +1,145 @@
+import types
+
+import pytest
+
+import utils.caption_cache as caption_cache_module
+from utils.caption_cache import CaptionCache, compute_bytes_hash, compute_file_hash
+
+CAPTION = {"english_caption": "A cat. It sits. It is calm.", "korean_caption": "고양이. 앉아 있다. 평온하다."}
+
+
+class FakeTime:
+    """캐시 모듈의 time.time()을 대신하는 시계"""
+
+    def __init__(self, now=1700000000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(caption_cache_module, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, fake_time):
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"), max_bytes=0, max_age_days=0)
+    yield cache
+    cache.close()
+
+
+def test_file_hash_matches_bytes_hash(tmp_path):
+    path = tmp_path / "image.bin"
+    data = b"\x89PNG" + bytes(range(256)) * 10
+    path.write_bytes(data)
+
+    assert compute_file_hash(str(path), chunk_size=7) == compute_bytes_hash(data)
+
+
+def test_key_depends_on_image_prompt_and_model():
+    key = CaptionCache.make_key("hash", "prompt", "model")
+
+    assert key == CaptionCache.make_key("hash", "prompt", "model")
+    assert len({key,
+                CaptionCache.make_key("other", "prompt", "model"),
+                CaptionCache.make_key("hash", "prompt 2", "model"),
+                CaptionCache.make_key("hash", "prompt", "model 2")}) == 4
+
+
+def test_get_put_and_counters(cache):
+    assert cache.get("hash", "prompt", "model") is None
+
+    cache.put("hash", "prompt", "model", CAPTION)
+
+    assert cache.get("hash", "prompt", "model") == CAPTION
+    assert cache.get("hash", "other prompt", "model") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_results_survive_reopen(tmp_path, fake_time):
+    db_path = str(tmp_path / "cache.sqlite3")
+    cache = CaptionCache(db_path)
+    cache.put("hash", "prompt", "model", CAPTION)
+    cache.close()
+
+    reopened = CaptionCache(db_path)
+    try:
+        assert reopened.get("hash", "prompt", "model") == CAPTION
+    finally:
+        reopened.close()
+
+
+def test_get_latest_ignores_prompt_and_counters(cache, fake_time):
+    cache.put("hash", "prompt 1", "model", {"n": 1})
+    fake_time.now += 10
+    cache.put("hash", "prompt 2", "model", {"n": 2})
+
+    assert cache.get_latest("hash") == {"n": 2}
+    assert cache.get_latest("missing") is None
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+def test_expired_entries_miss_and_are_evicted(tmp_path, fake_time):
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"), max_bytes=0, max_age_days=1)
+    try:
+        cache.put("old", "prompt", "model", CAPTION)
+        fake_time.now += 3600
+        cache.put("new", "prompt", "model", CAPTION)
+        fake_time.now += 86400 - 1800  # old만 하루가 지남
+
+        assert cache.get("old", "prompt", "model") is None
+        assert cache.get("new", "prompt", "model") == CAPTION
+        assert cache.evict() == 1
+        assert cache.stats()["entries"] == 1
+    finally:
+        cache.close()
+
+
+def test_size_eviction_removes_least_recently_used(tmp_path, fake_time):
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"), max_bytes=0, max_age_days=0)
+    try:
+        for index in range(3):
+            cache.put(f"hash{index}", "prompt", "model", CAPTION)
+            fake_time.now += 1
+        entry_size = cache.stats()["bytes"] // 3
+        cache.get("hash0", "prompt", "model")  # hash0을 최근에 사용한 항목으로
+
+        cache.max_bytes = entry_size * 2
+        assert cache.evict() == 1
+
+        assert cache.get("hash1", "prompt", "model") is None
+        assert cache.get("hash0", "prompt", "model") == CAPTION
+        assert cache.get("hash2", "prompt", "model") == CAPTION
+    finally:
+        cache.close()
+
+
+def test_put_evicts_periodically(cache, monkeypatch):
+    monkeypatch.setattr(CaptionCache, "EVICT_EVERY", 3)
+    cache.max_bytes = 1
+
+    cache.put("hash0", "prompt", "model", CAPTION)
+    cache.put("hash1", "prompt", "model", CAPTION)
+    assert cache.stats()["entries"] == 2
+
+    cache.put("hash2", "prompt", "model", CAPTION)  # 세 번째 put에서 정리
+    assert cache.stats()["entries"] == 0
+
+
+def test_get_first_counts_one_lookup(cache):
+    assert cache.get_first("hash", ["prompt 1", "prompt 2"], "model") is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 1)
+
+    cache.put("hash", "prompt 1", "model", {"n": 1})
+    cache.put("hash", "prompt 2", "model", {"n": 2})
+
+    # 앞의 프롬프트가 우선
+    assert cache.get_first("hash", ["prompt 1", "prompt 2"], "model") == {"n": 1}
+    assert cache.get_first("hash", ["missing", "prompt 2"], "model") == {"n": 2}
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
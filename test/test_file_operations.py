@@ -0,0 +1,72 @@
+import gc
+import time
+
+import pytest
+
+QtGui = pytest.importorskip("PyQt5.QtGui")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+import core.services.file_operations as file_operations_module
+from core.services.file_operations import FileOperations
+from utils.worker_thread_folder_scan import WorkerThreadFolderScan
+
+
+class ImageModelStub:
+    def __init__(self):
+        self.files = []
+
+    def add_files(self, file_paths):
+        self.files.extend(file_paths)
+
+
+class ParentStub(QWidget):
+    """FileOperations가 사용하는 메인 창 기능만 흉내 냄"""
+
+    def __init__(self):
+        super().__init__()
+        self.image_model = ImageModelStub()
+
+    def update_button_states(self):
+        pass
+
+
+class SlowExitScan(WorkerThreadFolderScan):
+    """finished_signal을 보낸 뒤 조금 늦게 끝나는 워커 - 신호를 받은 시점에 스레드가 아직 실행 중인 경우를 재현"""
+
+    def run(self):
+        super().run()
+        time.sleep(0.05)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_back_to_back_folder_scans(app, tmp_path, monkeypatch):
+    folder = tmp_path / "images"
+    folder.mkdir()
+    image = QtGui.QImage(8, 8, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor(0, 128, 255))
+    image.save(str(folder / "a.png"))
+    monkeypatch.setattr(file_operations_module.QFileDialog, "getExistingDirectory",
+                        lambda *args: str(folder))
+    monkeypatch.setattr(file_operations_module, "WorkerThreadFolderScan", SlowExitScan)
+    parent = ParentStub()
+    operations = FileOperations(parent, str(tmp_path / "config.json"))
+
+    # 짧은 탐색을 연달아 실행 - 신호를 받은 시점에 워커를 놓으면 실행 중인 QThread가 해제되어
+    # "QThread: Destroyed while thread is still running"으로 앱이 종료되므로, 참조를 놓을 때는 스레드가 끝나 있어야 함
+    for _ in range(20):
+        operations.load_folder()
+        worker = operations.scan_worker  # 실패해도 테스트가 중단되지 않도록 참조 유지
+        deadline = time.monotonic() + 10
+        while operations.scan_worker is not None and time.monotonic() < deadline:
+            app.processEvents()
+        assert operations.scan_worker is None
+        assert worker.isFinished()
+        del worker
+        gc.collect()
+
+    assert len(parent.image_model.files) == 20
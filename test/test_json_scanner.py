@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from test.json_extraction_corpus import generate_pathological_replies, load_corpus, load_recorded_replies
+from utils.json_scanner import JsonObjectScanner, find_json_array, find_json_object
+
+CORPUS = load_corpus()
+
+
+@pytest.mark.parametrize("entry", CORPUS, ids=[entry["name"] for entry in CORPUS])
+def test_finds_first_complete_object(entry):
+    assert find_json_object(entry["reply"]) == entry["expected"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+@pytest.mark.parametrize("entry", CORPUS, ids=[entry["name"] for entry in CORPUS])
+def test_chunked_feed_matches_whole_text(entry, chunk_size):
+    reply = entry["reply"]
+    scanner = JsonObjectScanner()
+    for start in range(0, len(reply), chunk_size):
+        if scanner.feed(reply[start:start + chunk_size]) is not None:
+            break
+    assert scanner.finish() == entry["expected"]
+
+
+def test_packed_reply_array():
+    for entry in load_recorded_replies():
+        if "expected_array" in entry:
+            assert find_json_array(entry["reply"]) == entry["expected_array"]
+
+
+def test_stops_reading_once_object_closes():
+    scanner = JsonObjectScanner()
+    assert scanner.feed('앞 설명 ```json\n{"text": {"english_caption": "a }') is None
+    assert scanner.feed('", "korean_caption": "b"}}') == {"text": {"english_caption": "a }", "korean_caption": "b"}}
+    assert scanner.done
+
+
+def test_pathological_replies_are_linear():
+    # 10만 자 응답도 한 번의 선형 탐색으로 끝나야 함 (제곱 시간이면 수 초 이상)
+    for entry in generate_pathological_replies(100000):
+        started = time.perf_counter()
+        assert find_json_object(entry["reply"]) == entry["expected"]
+        assert time.perf_counter() - started < 1.0, entry["name"]
+
+
+def test_pathological_stray_delimiters_are_linear():
+    # 설명 속 괄호/따옴표 때문에 다시 찾는 경우도 앞선 검사 결과를 재사용하여 선형 시간
+    caption = '{"text": {"english_caption": "a", "korean_caption": "b"}}'
+    replies = [
+        '{"{' * 30000 + caption,
+        '{ "x" { ' * 20000 + caption,
+        '{not {json}} ' * 10000 + caption,
+        '{ `' * 20000 + caption,
+        '{ "`" {' * 20000 + caption + ' `code`',
+    ]
+    for reply in replies:
+        started = time.perf_counter()
+        assert find_json_object(reply) == {"text": {"english_caption": "a", "korean_caption": "b"}}
+        assert time.perf_counter() - started < 1.0, reply[:20]
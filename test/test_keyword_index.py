@@ -0,0 +1,62 @@
+import pytest
+
+from utils.keyword_index import KeywordIndex, filename_terms, text_ngrams
+
+KEYWORDS = ["햇살", "햇빛", "바다", "해변", "고양이", "sunset", "sunrise", "beach", "beach umbrella", "mountain"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return KeywordIndex(KEYWORDS)
+
+
+def test_particles_are_stripped(index):
+    # '햇살이' -> '햇살', '바다에서' -> '바다'
+    assert index.top_k(["햇살이"]) == ["햇살"]
+    assert index.top_k(["바다에서"]) == ["바다"]
+    # 한 글자만 같은 키워드는 후보가 아님
+    assert index.top_k(["햇빛이"]) == ["햇빛"]
+
+
+def test_text_ngrams_keeps_stripped_token():
+    assert " 햇" in text_ngrams("햇살이", strip_particles=True)
+    assert "살 " in text_ngrams("햇살이", strip_particles=True)
+    assert "살 " not in text_ngrams("햇살이")
+
+
+def test_partial_word_is_not_enough(index):
+    # 키워드 n-gram의 대부분이 후보어에 있어야 함 ('sun'만으로는 sunset/sunrise가 아님)
+    assert index.top_k(["sun"]) == []
+    assert index.top_k(["sunsets"]) == ["sunset"]
+
+
+def test_results_are_ordered_by_coverage_and_limited(index):
+    found = index.top_k(["beach", "umbrella"])
+
+    # 두 키워드 모두 후보어에 온전히 있으면 가중치가 큰(긴) 키워드가 먼저
+    assert found == ["beach umbrella", "beach"]
+    assert index.top_k(["beach", "umbrella"], k=1) == ["beach umbrella"]
+
+
+def test_terms_from_sentences(index):
+    caption = "A cat on the beach at sunset. 해변에서 고양이가 햇살을 받고 있다."
+
+    assert set(index.top_k([caption])) == {"beach", "sunset", "해변", "고양이", "햇살"}
+
+
+def test_empty_terms_and_vocab():
+    assert KeywordIndex(KEYWORDS).top_k(["", None]) == []
+    assert KeywordIndex([]).top_k(["beach"]) == []
+
+
+def test_duplicate_keywords_are_indexed_once():
+    index = KeywordIndex(["Beach", "beach", " "])
+
+    assert len(index) == 1
+    assert index.top_k(["beach"]) == ["Beach"]
+
+
+def test_filename_terms():
+    assert filename_terms("/photos/Jeju_Trip/beach_sunset_001.jpg") == ["beach", "sunset", "jeju", "trip"]
+    # 흔한 이름, 숫자, 한 글자는 제외
+    assert filename_terms("/home/user/Pictures/IMG_20240101_a.jpg") == []
@@ -0,0 +1,62 @@
+import pytest
+
+from utils.keyword_matcher import KeywordMatcher, normalize_text
+
+KEYWORDS = ["고양이", "dog", "파란 하늘", "하늘", "hot dog", "hot", "box", "cat", "sun", "sunset"]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordMatcher(KEYWORDS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 한글 키워드 뒤의 조사
+    ("고양이가 잔다", ["고양이"]),
+    ("고양이들이 논다", ["고양이"]),
+    ("하늘색 벽", []),
+    # 어절 중간에서 시작하거나 다른 글자가 이어지면 찾지 않음
+    ("dogma", []),
+    ("hotdogs", []),
+    ("a bulldog", []),
+    # 띄어쓰기가 있는 한글 키워드는 붙여 쓴 형태도 찾음
+    ("파란하늘", ["파란 하늘"]),
+    ("파란 하늘이 보인다", ["파란 하늘"]),
+    # 같은 위치에서는 가장 긴 키워드
+    ("hot dog stand", ["hot dog"]),
+    ("sunset beach", ["sunset"]),
+    ("sun set", ["sun"]),
+    # 영어 복수형
+    ("two dogs", ["dog"]),
+    ("boxes", ["box"]),
+    ("cats", ["cat"]),
+    ("dogss", []),
+    # 대소문자, 문장부호
+    ("A DOG, a Cat!", ["dog", "cat"]),
+    ("", []),
+    (None, []),
+])
+def test_extract(matcher, text, expected):
+    assert matcher.extract(text) == expected
+
+
+def test_extract_keeps_first_order_without_duplicates(matcher):
+    found = matcher.extract("A cat and a dog.", "개(dog)와 고양이, 또 cat")
+
+    assert found == ["cat", "dog", "고양이"]
+
+
+def test_extract_limit(matcher):
+    assert matcher.extract("cat dog box sun", limit=2) == ["cat", "dog"]
+
+
+def test_duplicate_and_blank_keywords_are_ignored():
+    matcher = KeywordMatcher(["Dog", "dog", " ", "DOG!"])
+
+    assert len(matcher) == 1
+    assert matcher.extract("dogs") == ["Dog"]
+
+
+def test_normalize_text():
+    assert normalize_text("  Ｈｅｌｌｏ,   World!! ") == "hello world"
+    assert normalize_text(None) == ""
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from utils.keyword_vocab import KeywordVocab, load_or_convert, read_keyword_csv, source_stamp
+
+KEYWORDS = ["고양이", "dog", "파란 하늘", "sunset", "햇살"]
+CATEGORIZERS = {
+    "korean": lambda keyword: any("가" <= char <= "힣" for char in keyword),
+    "english": lambda keyword: keyword.isascii(),
+}
+
+
+def write_csv(path, text, encoding="utf-8"):
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, use_mmap):
+    vocab_path = str(tmp_path / "keywords.vocab")
+    KeywordVocab.build(KEYWORDS, CATEGORIZERS, stamp=(123, 45)).save(vocab_path)
+
+    vocab = KeywordVocab.load(vocab_path, stamp=(123, 45), use_mmap=use_mmap)
+
+    assert vocab is not None
+    assert len(vocab) == len(KEYWORDS)
+    assert list(vocab) == KEYWORDS
+    assert vocab.stamp == (123, 45)
+    assert vocab.categories == ["korean", "english"]
+    assert vocab.keywords("korean") == ["고양이", "파란 하늘", "햇살"]
+    assert vocab.keywords("english", limit=1) == ["dog"]
+    # 'all'이나 없는 카테고리는 전체
+    assert vocab.keywords("all") == vocab.keywords("missing") == KEYWORDS
+    assert not os.path.exists(vocab_path + ".tmp")
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    vocab_path = tmp_path / "keywords.vocab"
+    KeywordVocab.build(KEYWORDS, CATEGORIZERS).save(str(vocab_path))
+    data = vocab_path.read_bytes()
+
+    for length in (len(data) - 1, 20, 0):
+        vocab_path.write_bytes(data[:length])
+        assert KeywordVocab.load(str(vocab_path)) is None
+
+
+def test_other_format_is_rejected(tmp_path):
+    vocab_path = tmp_path / "keywords.vocab"
+    KeywordVocab.build(KEYWORDS).save(str(vocab_path))
+    data = vocab_path.read_bytes()
+    vocab_path.write_bytes(b"NOTVOCAB" + data[8:])
+
+    assert KeywordVocab.load(str(vocab_path)) is None
+    assert KeywordVocab.load(str(tmp_path / "missing.vocab")) is None
+
+
+def test_stamp_mismatch_is_rejected(tmp_path):
+    vocab_path = str(tmp_path / "keywords.vocab")
+    KeywordVocab.build(KEYWORDS, stamp=(1, 2)).save(vocab_path)
+
+    assert KeywordVocab.load(vocab_path, stamp=(1, 3)) is None
+    assert KeywordVocab.load(vocab_path, stamp=(1, 2)) is not None
+    # stamp를 주지 않으면 검사하지 않음
+    assert KeywordVocab.load(vocab_path) is not None
+
+
+@pytest.mark.parametrize("encoding", ["cp949", "utf-8-sig", "utf-8"])
+def test_read_csv_encodings(tmp_path, encoding):
+    csv_path = write_csv(tmp_path / "keywords.csv", "분류,키워드\n동물,고양이\n하늘, 파란 하늘 \n,고양이\n", encoding)
+
+    # 첫 줄(헤더), 빈 셀, 중복은 제외하고 앞뒤 공백은 제거
+    assert read_keyword_csv(csv_path) == ["동물", "고양이", "하늘", "파란 하늘"]
+
+
+def test_load_or_convert_reuses_and_refreshes(tmp_path):
+    csv_path = write_csv(tmp_path / "keywords.csv", "키워드\n고양이\ndog\n", "cp949")
+    vocab_path = str(tmp_path / "keywords.vocab")
+
+    vocab = load_or_convert(csv_path, vocab_path, CATEGORIZERS, use_mmap=False)
+    assert list(vocab) == ["고양이", "dog"]
+    assert KeywordVocab.load(vocab_path, stamp=source_stamp(csv_path), use_mmap=False) is not None
+
+    # 원본 CSV가 바뀌면 다시 변환
+    write_csv(tmp_path / "keywords.csv", "키워드\n고양이\ndog\n햇살\n", "cp949")
+    os.utime(csv_path, ns=(0, os.stat(csv_path).st_mtime_ns + 10 ** 9))
+    vocab = load_or_convert(csv_path, vocab_path, CATEGORIZERS, use_mmap=False)
+    assert list(vocab) == ["고양이", "dog", "햇살"]
+    assert vocab.keywords("english") == ["dog"]
+    assert vocab.stamp == source_stamp(csv_path)
@@ -0,0 +1,248 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("anthropic")
+QtGui = pytest.importorskip("PyQt5.QtGui")
+
+from PyQt5.QtWidgets import QApplication
+
+import utils.worker_thread_chat_completion as worker_module
+from utils.caption_cache import CaptionCache, compute_file_hash
+from utils.keyword_index import KeywordIndex
+from utils.worker_thread_chat_completion import WorkerThreadChatCompletion, CAPTION_PROMPT, CAPTION_MULTI_PROMPT, \
+    CAPTION_MODEL
+
+
+def caption(index):
+    return {
+        "english_caption": f"Image {index} shows a square. It is red. The background is plain.",
+        "korean_caption": f"{index}번 이미지는 사각형이다. 빨간색이다. 배경은 단색이다."
+    }
+
+
+class StubMessages:
+    """messages.with_raw_response.create만 흉내 내는 클라이언트 - replies의 응답을 차례로 반환"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+        self.with_raw_response = self
+
+    def create(self, **params):
+        self.requests.append(params)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        message = SimpleNamespace(content=reply, usage=None)
+        return SimpleNamespace(headers={}, parse=lambda: message)
+
+
+def tool_reply(name, payload):
+    return [SimpleNamespace(type="tool_use", name=name, input=payload)]
+
+
+def text_reply(text):
+    return [SimpleNamespace(type="text", text=text)]
+
+
+def packed_reply(ids):
+    return tool_reply("record_captions", {"captions": [dict(id=f"img{i}", **caption(i)) for i in ids]})
+
+
+def single_reply(index):
+    return tool_reply("record_caption", caption(index))
+
+
+class SettingsStub:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = []
+    for index in range(3):
+        image = QtGui.QImage(32 + index, 32, QtGui.QImage.Format_RGB32)
+        image.fill(QtGui.QColor(255, 0, index * 40))
+        path = str(tmp_path / f"img{index}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def make_worker(replies, **settings):
+    settings = dict({"caption_cache_enabled": False, "stream_responses": False, "images_per_request": 3,
+                     "keyword_extraction": False}, **settings)
+    worker = WorkerThreadChatCompletion(api_key="test-key", settings_handler=SettingsStub(**settings))
+    worker.client = SimpleNamespace(messages=StubMessages(replies))
+    return worker
+
+
+def test_packed_reply_is_split_per_image(app, images):
+    worker = make_worker([packed_reply([2, 3, 1])])
+
+    outcomes = worker.request_extract_keyword_group(images)
+
+    requests = worker.client.messages.requests
+    assert len(requests) == 1
+    assert requests[0]["system"][0]["text"] == CAPTION_MULTI_PROMPT
+    id_texts = [block["text"] for block in requests[0]["messages"][0]["content"] if block["type"] == "text"]
+    assert id_texts[:3] == ["이미지 id: img1", "이미지 id: img2", "이미지 id: img3"]
+    # 응답 순서와 관계없이 id로 이미지에 대응
+    for index, path in enumerate(images, 1):
+        assert outcomes[path]["text"] == caption(index)
+        assert outcomes[path]["image_path"] == path.replace("\\", "/")
+
+
+def test_image_missing_from_packed_reply_falls_back_to_single_request(app, images):
+    worker = make_worker([packed_reply([1, 3]), single_reply(2)])
+
+    outcomes = worker.request_extract_keyword_group(images)
+
+    requests = worker.client.messages.requests
+    assert len(requests) == 2
+    assert requests[1]["system"][0]["text"] == CAPTION_PROMPT
+    assert [outcomes[path]["text"] for path in images] == [caption(1), caption(2), caption(3)]
+
+
+def test_text_reply_without_structured_output(app, images):
+    entries = [{"id": f"img{i}", "text": caption(i)} for i in (1, 2, 3)]
+    reply = "설명입니다 {예시}.\n```json\n" + json.dumps(entries, ensure_ascii=False) + "\n```"
+    worker = make_worker([text_reply(reply)], structured_output=False)
+
+    outcomes = worker.request_extract_keyword_group(images)
+
+    assert "tools" not in worker.client.messages.requests[0]
+    assert [outcomes[path]["text"] for path in images] == [caption(1), caption(2), caption(3)]
+
+
+def test_failed_packed_request_falls_back_to_single_requests(app, images, monkeypatch):
+    monkeypatch.setattr(worker_module.time, "sleep", lambda seconds: None)
+    # 묶음 요청이 재시도까지 모두 실패하면 이미지마다 개별 요청
+    errors = [RuntimeError("server error")] * 3
+    worker = make_worker(errors + [single_reply(1), single_reply(2), single_reply(3)])
+
+    outcomes = worker.request_extract_keyword_group(images)
+
+    assert len(worker.client.messages.requests) == 6
+    assert [outcomes[path]["text"] for path in images] == [caption(1), caption(2), caption(3)]
+
+
+def test_unusable_packed_entries_fall_back(app, images):
+    bad = {"captions": [{"id": "img1", "english_caption": "", "korean_caption": ""}, "junk",
+                        dict(id="img2", **caption(2)), dict(id="img3", **caption(3))]}
+    worker = make_worker([tool_reply("record_captions", bad), single_reply(1)])
+
+    outcomes = worker.request_extract_keyword_group(images)
+
+    assert len(worker.client.messages.requests) == 2
+    assert [outcomes[path]["text"] for path in images] == [caption(1), caption(2), caption(3)]
+
+
+def test_packed_results_are_cached_under_the_packed_prompt(app, images, tmp_path):
+    worker = make_worker([packed_reply([1, 2, 3])])
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"))
+    worker.caption_cache = cache
+    try:
+        worker.request_extract_keyword_group(images)
+
+        image_hash = compute_file_hash(images[0])
+        assert cache.get(image_hash, CAPTION_MULTI_PROMPT, CAPTION_MODEL) == caption(1)
+        # 개별 요청은 묶음 프롬프트의 결과를 자기 프롬프트의 결과로 쓰지 않음
+        assert cache.get(image_hash, CAPTION_PROMPT, CAPTION_MODEL) is None
+
+        # 같은 이미지를 다시 묶음으로 요청하면 API를 호출하지 않음
+        worker.client.messages.requests.clear()
+        outcomes = worker.request_extract_keyword_group(images)
+        assert worker.client.messages.requests == []
+        assert [outcomes[path]["text"] for path in images] == [caption(1), caption(2), caption(3)]
+    finally:
+        cache.close()
+
+
+@pytest.fixture
+def sunset_image(tmp_path):
+    # 폴더 이름 'sunset'이 키워드 후보어가 됨
+    folder = tmp_path / "sunset"
+    folder.mkdir()
+    image = QtGui.QImage(32, 32, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor(255, 128, 0))
+    path = str(folder / "img0.png")
+    image.save(path)
+    return path
+
+
+def sent_text(request):
+    return [block["text"] for block in request["messages"][0]["content"] if block["type"] == "text"][-1]
+
+
+def test_keyword_hint_is_part_of_cache_key(app, sunset_image, tmp_path):
+    worker = make_worker([single_reply(1), single_reply(2)])
+    worker.keyword_index = KeywordIndex(["sunset", "beach"])
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"))
+    worker.caption_cache = cache
+    try:
+        worker.request_extract_keyword(sunset_image)
+
+        hint = worker.build_keyword_hint(sunset_image)
+        assert "sunset" in hint and hint in sent_text(worker.client.messages.requests[0])
+        image_hash = compute_file_hash(sunset_image)
+        assert cache.get(image_hash, worker.cache_prompt(CAPTION_PROMPT, hint), CAPTION_MODEL) == caption(1)
+        assert cache.get(image_hash, CAPTION_PROMPT, CAPTION_MODEL) is None
+
+        # 같은 후보 문구면 캐시 사용, 어휘가 바뀌어 문구가 달라지면 다시 요청
+        assert worker.request_extract_keyword(sunset_image)["text"] == caption(1)
+        assert len(worker.client.messages.requests) == 1
+        worker.keyword_index = KeywordIndex(["sunset glow"])
+        assert worker.request_extract_keyword(sunset_image)["text"] == caption(2)
+        assert len(worker.client.messages.requests) == 2
+    finally:
+        cache.close()
+
+
+def test_previous_caption_feeds_request_on_cache_miss(app, sunset_image, tmp_path):
+    worker = make_worker([single_reply(1)])
+    worker.keyword_index = KeywordIndex(["sunset", "beach"])
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"))
+    worker.caption_cache = cache
+    try:
+        # 다른 모델로 받은 이전 캡션
+        image_hash = compute_file_hash(sunset_image)
+        cache.put(image_hash, CAPTION_PROMPT, "other-model", {"english_caption": "A beach at dusk."})
+
+        worker.request_extract_keyword(sunset_image)
+
+        hint = worker.build_keyword_hint(sunset_image)
+        assert "beach" not in hint
+        assert "beach" in sent_text(worker.client.messages.requests[0])
+        # 이전 캡션으로 보강한 요청의 결과도 파일 이름 후보 문구가 든 키에 저장되어 다시 실행하면 캐시 사용
+        assert cache.get(image_hash, worker.cache_prompt(CAPTION_PROMPT, hint), CAPTION_MODEL) == caption(1)
+        assert worker.request_extract_keyword(sunset_image)["text"] == caption(1)
+        assert len(worker.client.messages.requests) == 1
+    finally:
+        cache.close()
+
+
+def test_cache_counts_one_miss_per_image(app, images, tmp_path):
+    # 묶음 응답에 없는 이미지를 개별 요청으로 다시 처리해도 캐시 조회는 이미지마다 한 번
+    worker = make_worker([packed_reply([1, 3]), single_reply(2)])
+    cache = CaptionCache(str(tmp_path / "cache.sqlite3"))
+    worker.caption_cache = cache
+    try:
+        worker.request_extract_keyword_group(images)
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (0, 3)
+        assert cache.get(compute_file_hash(images[1]), CAPTION_PROMPT, CAPTION_MODEL) == caption(2)
+    finally:
+        cache.close()
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+pytest.importorskip("PyQt5.QtGui")
+
+from utils.perceptual_hash import BKTree, group_near_duplicates, hamming_distance
+
+
+def test_hamming_distance():
+    assert hamming_distance(0, 0) == 0
+    assert hamming_distance(0b1011, 0b0001) == 2
+    assert hamming_distance(0, (1 << 64) - 1) == 64
+
+
+def test_bktree_search_matches_brute_force():
+    rng = random.Random(7)
+    values = [rng.getrandbits(16) for _ in range(300)]
+    tree = BKTree()
+    for index, value in enumerate(values):
+        tree.add(value, index)
+    assert tree.size == len(values)
+
+    for query in [rng.getrandbits(16) for _ in range(30)] + values[:5]:
+        for max_distance in (0, 2, 5):
+            expected = sorted((hamming_distance(query, value), index) for index, value in enumerate(values)
+                              if hamming_distance(query, value) <= max_distance)
+            found = tree.search(query, max_distance)
+            assert sorted((distance, item) for distance, _, item in found) == expected
+            # 가까운 순으로 정렬
+            assert [distance for distance, _, _ in found] == sorted(distance for distance, _ in expected)
+
+
+def test_empty_tree_finds_nothing():
+    assert BKTree().search(0, 64) == []
+
+
+@pytest.mark.parametrize("threshold, joined", [(2, True), (1, False), (0, False)])
+def test_threshold_is_inclusive(threshold, joined):
+    # 0b0000과 0b0011은 거리 2
+    groups = group_near_duplicates({"a": 0b0000, "b": 0b0011}, threshold)
+
+    if joined:
+        assert groups == [("a", 0b0000, ["b"])]
+    else:
+        assert groups == [("a", 0b0000, []), ("b", 0b0011, [])]
+
+
+def test_threshold_zero_groups_only_identical_hashes():
+    groups = group_near_duplicates({"a": 5, "b": 4, "c": 5}, 0)
+
+    assert groups == [("a", 5, ["c"]), ("b", 4, [])]
+
+
+def test_missing_hashes_are_their_own_groups():
+    hashes = {"a": 0b1111, "broken1": None, "b": 0b1110, "broken2": None}
+
+    groups = group_near_duplicates(hashes, 64)
+
+    # 해시가 없는 이미지끼리도, 다른 이미지와도 묶이지 않음
+    assert groups == [("a", 0b1111, ["b"]), ("broken1", None, []), ("broken2", None, [])]
+
+
+def test_groups_follow_input_order():
+    hashes = {"z": 0b11110000, "y": 0b00001111, "x": 0b11110001, "w": 0b00001110, "v": 0b10101010}
+
+    groups = group_near_duplicates(hashes, 1)
+
+    assert [representative for representative, _, _ in groups] == ["z", "y", "v"]
+    assert groups[0][2] == ["x"] and groups[1][2] == ["w"]
+
+
+def test_joins_nearest_representative():
+    # c는 a와 거리 3, b와 거리 1 - 가장 가까운 대표인 b에 붙음
+    hashes = {"a": 0b000000, "b": 0b001111, "c": 0b000111}
+
+    groups = group_near_duplicates(hashes, 3)
+
+    assert groups == [("a", 0b000000, []), ("b", 0b001111, ["c"])]
+
+
+def test_similar_images_do_not_chain():
+    # a-b, b-c는 거리 1이지만 a-c는 거리 2 - b는 a에 붙고 c는 새 대표가 됨
+    groups = group_near_duplicates({"a": 0b00, "b": 0b01, "c": 0b11}, 1)
+
+    assert groups == [("a", 0b00, ["b"]), ("c", 0b11, [])]
@@ -0,0 +1,169 @@
+import pytest
+
+from utils.rate_limiter import AdaptiveRateLimiter
+
+
+class FakeClock:
+    """테스트에서 직접 앞으로 돌리는 시계"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(clock, **kwargs):
+    kwargs.setdefault("max_concurrency", 8)
+    kwargs.setdefault("initial_rate", 8.0)
+    return AdaptiveRateLimiter(clock=clock, wall_clock=clock, **kwargs)
+
+
+def test_throttle_halves_concurrency_and_rate(clock):
+    limiter = make_limiter(clock)
+
+    wait_time = limiter.on_throttle()
+
+    assert limiter.concurrency_limit == 4
+    assert limiter.rate == 4.0
+    assert wait_time == 2.0
+    assert limiter.snapshot()["blocked_for"] == 2.0
+
+
+def test_throttle_backoff_doubles_until_max(clock):
+    limiter = make_limiter(clock, max_backoff=5.0)
+
+    assert [limiter.on_throttle() for _ in range(4)] == [2.0, 4.0, 5.0, 5.0]
+    # 줄어들어도 동시 요청 1개, 최소 속도 아래로는 내려가지 않음
+    assert limiter.concurrency_limit == 1
+    assert limiter.rate == 0.5
+
+
+def test_success_streak_grows_additively(clock):
+    limiter = make_limiter(clock)
+    limiter.on_throttle()  # 동시 요청 4개, 속도 4.0
+
+    for _ in range(3):
+        limiter.on_success()
+    assert (limiter.concurrency_limit, limiter.rate) == (4, 4.0)
+
+    limiter.on_success()  # 현재 한도만큼 연속 성공하면 한 단계 증가
+    assert (limiter.concurrency_limit, limiter.rate) == (5, 5.0)
+
+
+def test_growth_stops_at_max_concurrency(clock):
+    limiter = make_limiter(clock, max_concurrency=2, initial_rate=2.0, max_rate=3.0)
+
+    for _ in range(20):
+        limiter.on_success()
+
+    assert limiter.concurrency_limit == 2
+    assert limiter.rate == 3.0
+
+
+def test_retry_after_header_sets_block_time(clock):
+    limiter = make_limiter(clock)
+
+    assert limiter.on_throttle({"retry-after": "7"}) == 7.0
+    clock.advance(3)
+    assert limiter.snapshot()["blocked_for"] == 4.0
+
+
+@pytest.mark.parametrize("value", ["soon", "", None])
+def test_invalid_retry_after_falls_back_to_backoff(clock, value):
+    limiter = make_limiter(clock)
+
+    headers = {} if value is None else {"retry-after": value}
+    assert limiter.on_throttle(headers) == 2.0
+
+
+def test_acquire_respects_block_and_concurrency(clock):
+    limiter = make_limiter(clock, max_concurrency=1, initial_rate=1.0)
+    assert limiter.acquire()
+
+    # 슬롯이 모두 사용 중이면 should_stop이 True가 되는 즉시 포기
+    assert not limiter.acquire(should_stop=lambda: True)
+    limiter.release()
+
+    limiter.on_throttle({"retry-after": "30"})
+    checks = []
+
+    def should_stop():
+        checks.append(limiter.snapshot()["blocked_for"])
+        return len(checks) > 1
+
+    assert not limiter.acquire(should_stop=should_stop)
+    assert checks[0] == 30.0
+
+
+def test_tokens_refill_with_clock(clock):
+    limiter = make_limiter(clock, max_concurrency=4, initial_rate=2.0)
+    limiter._tokens = 0.0
+
+    clock.advance(1.0)  # 초당 2개
+    limiter._refill(clock())
+    assert limiter._tokens == 2.0
+
+    clock.advance(10.0)  # 버스트는 동시 요청 한도까지만
+    limiter._refill(clock())
+    assert limiter._tokens == 4.0
+
+
+def test_ratelimit_headers_cap_rate(clock):
+    limiter = make_limiter(clock, max_concurrency=8, initial_rate=8.0)
+    clock.now = 1700000000.0
+    headers = {
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "10",
+        "anthropic-ratelimit-requests-reset": "2023-11-14T22:13:40Z",  # 20초 뒤
+    }
+
+    limiter.on_success(headers)
+
+    # 남은 10개 요청을 재설정 시각까지 고르게 분배
+    assert limiter.rate == pytest.approx(0.5)
+
+
+def test_ratelimit_headers_with_plenty_remaining_do_not_cap(clock):
+    limiter = make_limiter(clock, initial_rate=8.0)
+    clock.now = 1700000000.0
+    headers = {
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "40",
+        "anthropic-ratelimit-requests-reset": "2023-11-14T22:13:40Z",
+    }
+
+    limiter.on_success(headers)
+
+    assert limiter.rate == 8.0
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2023-11-14T22:13:20Z", 1700000000.0),
+    ("2023-11-14T22:13:20+00:00", 1700000000.0),
+    ("2023-11-14T22:13:20", 1700000000.0),
+    ("not a date", None),
+    (None, None),
+])
+def test_parse_reset(value, expected):
+    assert AdaptiveRateLimiter._parse_reset(value) == expected
+
+
+def test_worker_detects_sdk_timeout():
+    anthropic = pytest.importorskip("anthropic")
+    pytest.importorskip("PyQt5")
+
+    from utils.worker_thread_chat_completion import WorkerThreadChatCompletion
+
+    # SDK 메시지("Request timed out." 등)는 버전마다 달라 문자열이 아니라 예외 타입으로 판별해야 함
+    timeout = anthropic.APITimeoutError(request=None)
+    assert WorkerThreadChatCompletion.is_timeout_error(timeout)
+    assert not WorkerThreadChatCompletion.is_timeout_error(RuntimeError("connection reset"))
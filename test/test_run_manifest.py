@@ -0,0 +1,124 @@
+import json
+import os
+
+from utils.caption_cache import compute_bytes_hash
+from utils.run_manifest import RunManifest, normalize_path
+
+
+def write_image(path, data=b"image-data"):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path).replace("\\", "/")
+
+
+def write_results(jsonl_path, image_paths, tail=""):
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for path in image_paths:
+            f.write(json.dumps({"content": os.path.basename(path), "image_path": path}) + "\n")
+        f.write(tail)
+
+
+def finish(manifest, paths):
+    for path in paths:
+        manifest.mark_done(path, "hash-" + os.path.basename(path))
+    manifest.close()
+    return RunManifest.load(manifest.manifest_path)
+
+
+def test_repair_truncates_partial_last_line(tmp_path):
+    jsonl_path = str(tmp_path / "result.jsonl")
+    paths = [write_image(tmp_path / f"img{index}.png") for index in range(2)]
+    write_results(jsonl_path, paths, tail='{"content": "img2.png", "image_pa')
+    manifest = RunManifest.create(jsonl_path)
+
+    recorded, count = manifest.repair_results()
+    manifest.close()
+
+    assert (recorded, count) == (set(paths), 2)
+    with open(jsonl_path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    assert lines[-1] == "" and [json.loads(line)["image_path"] for line in lines[:-1]] == paths
+
+
+def test_done_but_missing_from_results_is_pending(tmp_path):
+    jsonl_path = str(tmp_path / "result.jsonl")
+    paths = [write_image(tmp_path / f"img{index}.png", bytes([index]) * 10) for index in range(3)]
+    manifest = RunManifest.create(jsonl_path)
+    manifest.mark_queued(paths)
+    manifest = finish(manifest, paths)
+    write_results(jsonl_path, [paths[0], paths[2]])
+
+    recorded, _ = manifest.repair_results()
+
+    assert manifest.pending_paths(recorded) == [paths[1]]
+    manifest.close()
+
+
+def test_unfinished_and_failed_paths_are_pending_in_queue_order(tmp_path):
+    jsonl_path = str(tmp_path / "result.jsonl")
+    paths = [write_image(tmp_path / f"img{index}.png") for index in range(4)]
+    manifest = RunManifest.create(jsonl_path)
+    manifest.mark_queued(paths)
+    manifest.mark_failed(paths[1], "boom")
+    manifest = finish(manifest, [paths[2]])
+    write_results(jsonl_path, [paths[2]])
+
+    recorded, _ = manifest.repair_results()
+
+    assert manifest.pending_paths(recorded) == [paths[0], paths[1], paths[3]]
+    assert manifest.entries[paths[1]]["error"] == "boom"
+    manifest.close()
+
+
+def test_changed_file_is_pending(tmp_path):
+    jsonl_path = str(tmp_path / "result.jsonl")
+    same = write_image(tmp_path / "same.png", b"same")
+    touched = write_image(tmp_path / "touched.png", b"touched")
+    changed = write_image(tmp_path / "changed.png", b"before")
+    manifest = RunManifest.create(jsonl_path)
+    manifest.mark_queued([same, touched, changed])
+    for path, data in ((same, b"same"), (touched, b"touched"), (changed, b"before")):
+        manifest.mark_done(path, compute_bytes_hash(data))
+    manifest.close()
+    write_results(jsonl_path, [same, touched, changed])
+
+    # 수정 시각만 바뀐 파일은 해시가 같으면 그대로 완료, 내용이 바뀐 파일만 다시 처리
+    stat = os.stat(touched)
+    os.utime(touched, (stat.st_atime, stat.st_mtime + 100))
+    write_image(changed, b"after!")
+
+    manifest = RunManifest.load(manifest.manifest_path)
+    recorded, _ = manifest.repair_results()
+    assert manifest.pending_paths(recorded) == [changed]
+    manifest.close()
+
+
+def test_deleted_images_are_skipped(tmp_path):
+    jsonl_path = str(tmp_path / "result.jsonl")
+    path = write_image(tmp_path / "gone.png")
+    manifest = RunManifest.create(jsonl_path)
+    manifest.mark_queued([path])
+    manifest.close()
+    os.remove(path)
+
+    assert RunManifest.load(manifest.manifest_path).pending_paths(set()) == []
+
+
+def test_windows_paths_match_results(tmp_path, monkeypatch):
+    jsonl_path = str(tmp_path / "result.jsonl")
+    native = r"C:\photos\trip\img0.jpg"
+    manifest = RunManifest.create(jsonl_path)
+    manifest.mark_queued([native, r"C:\photos\trip\img1.jpg"])
+    manifest.mark_done(native)
+    manifest.close()
+    # 결과 JSONL에는 '/' 구분자로 기록됨
+    write_results(jsonl_path, ["C:/photos/trip/img0.jpg"])
+
+    manifest = RunManifest.load(manifest.manifest_path)
+    monkeypatch.setattr(os.path, "exists", lambda path: True)
+    monkeypatch.setattr(RunManifest, "_has_changed", lambda self, path, entry: False)
+    recorded, _ = manifest.repair_results()
+
+    assert manifest.entries[normalize_path(native)]["state"] == RunManifest.DONE
+    assert manifest.pending_paths(recorded) == ["C:/photos/trip/img1.jpg"]
+    manifest.close()
@@ -0,0 +1,52 @@
+# test/test_startup_time.py
+# main.py 시작 시 import 시간 예산 확인 (python -X importtime)
+# 예산은 STARTUP_IMPORT_BUDGET_MS 환경 변수로 조정 가능 (느린 CI 등)
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 400))
+
+# 시작할 때 불러오지 않고 처음 사용할 때 import하는 모듈
+DEFERRED_MODULES = ("anthropic", "pandas", "openpyxl", "PyQt5.uic", "requests", "multiprocessing")
+
+
+def import_times(module, tmp_path):
+    """-X importtime 출력 - {모듈 이름: 누적 시간(us)}"""
+    env = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path), QT_QPA_PLATFORM="offscreen")
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    # 첫 실행은 .pyc 생성 시간이 섞이므로 한 번 실행한 뒤 측정
+    subprocess.run(command, cwd=REPO_DIR, env=env, capture_output=True, check=True)
+    completed = subprocess.run(command, cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def main_import_times(tmp_path_factory):
+    return import_times("main", tmp_path_factory.mktemp("home"))
+
+
+def test_heavy_modules_are_deferred(main_import_times):
+    loaded = [name for name in main_import_times
+              if any(name == module or name.startswith(module + ".") for module in DEFERRED_MODULES)]
+    assert loaded == []
+
+
+def test_startup_import_budget(main_import_times):
+    elapsed_ms = main_import_times["main"] / 1000
+    assert elapsed_ms <= STARTUP_IMPORT_BUDGET_MS, (
+        f"main import {elapsed_ms:.0f} ms > 예산 {STARTUP_IMPORT_BUDGET_MS:.0f} ms - 가장 오래 걸린 모듈: "
+        + ", ".join(f"{name} {us / 1000:.0f} ms" for name, us in
+                    sorted(main_import_times.items(), key=lambda item: -item[1])[1:6]))
@@ -0,0 +1,126 @@
+import json
+import time
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from utils.xlsx_exporter import export_jsonl_to_xlsx, write_rows_to_xlsx, cell_value
+
+
+def record(index, english=None):
+    return {"content": f"img{index}.png", "image_path": f"/photos/img{index}.png",
+            "text": {"english_caption": english or f"Caption {index}.", "korean_caption": f"캡션 {index}."},
+            "keywords": ["고양이", "햇살"]}
+
+
+def write_jsonl(path, records, tail=""):
+    with open(path, "w", encoding="utf-8") as f:
+        for item in records:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        f.write(tail)
+    return str(path)
+
+
+def read_sheets(xlsx_path):
+    workbook = openpyxl.load_workbook(xlsx_path)
+    return {sheet.title: [[cell.value for cell in row] for row in sheet.iter_rows()] for sheet in workbook}
+
+
+def test_rows_roll_over_to_next_sheet_and_truncated_line_is_skipped(tmp_path):
+    # 잘린 마지막 줄(비정상 종료)은 건너뜀
+    jsonl_path = write_jsonl(tmp_path / "result.jsonl", [record(index) for index in range(7)],
+                             tail='{"content": "img7.png", "image_pa')
+    xlsx_path = str(tmp_path / "result.xlsx")
+    progress = []
+
+    written = export_jsonl_to_xlsx(jsonl_path, xlsx_path, max_rows_per_sheet=4, progress_callback=progress.append)
+
+    assert written == 7
+    assert progress[-1] == 7
+    sheets = read_sheets(xlsx_path)
+    # 머리글 포함 시트당 4행 -> 데이터 3, 3, 1행
+    assert list(sheets) == ["결과", "결과 2", "결과 3"]
+    for rows in sheets.values():
+        assert rows[0] == ["파일명", "이미지 경로", "영어 캡션", "한글 캡션", "키워드"]
+    data = [row for rows in sheets.values() for row in rows[1:]]
+    assert [row[0] for row in data] == [f"img{index}.png" for index in range(7)]
+    assert data[0][2:] == ["Caption 0.", "캡션 0.", "고양이, 햇살"]
+    assert not (tmp_path / "result.xlsx.tmp").exists()
+
+
+def test_formula_like_text_is_written_as_string(tmp_path):
+    jsonl_path = write_jsonl(tmp_path / "result.jsonl", [record(0, english='=HYPERLINK("http://example.com","x")')])
+    xlsx_path = str(tmp_path / "result.xlsx")
+
+    export_jsonl_to_xlsx(jsonl_path, xlsx_path)
+
+    cell = openpyxl.load_workbook(xlsx_path).active["C2"]
+    assert cell.data_type == "s"
+    assert cell.value == '=HYPERLINK("http://example.com","x")'
+
+
+def test_empty_result_writes_headers_only(tmp_path):
+    xlsx_path = str(tmp_path / "result.xlsx")
+
+    assert write_rows_to_xlsx([], xlsx_path, ["a", "b"]) == 0
+
+    assert read_sheets(xlsx_path) == {"결과": [["a", "b"]]}
+
+
+def test_cancel_keeps_existing_file(tmp_path):
+    xlsx_path = tmp_path / "result.xlsx"
+    xlsx_path.write_bytes(b"previous")
+
+    assert write_rows_to_xlsx([[1], [2]], str(xlsx_path), ["n"], should_stop=lambda: True) is None
+
+    assert xlsx_path.read_bytes() == b"previous"
+
+
+def test_cell_value():
+    assert cell_value(None) is None
+    assert cell_value(3) == 3
+    assert cell_value(["a", None, "b"]) == "a, b"
+    assert cell_value({"k": "값"}) == '{"k": "값"}'
+    assert cell_value("a\x00b\x1fc") == "abc"
+    assert len(cell_value("x" * 40000)) == 32767
+
+
+def test_export_worker_is_finished_before_release(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5.QtWidgets")
+    from PyQt5.QtWidgets import QApplication
+
+    import core.services.image_processor as image_processor_module
+    import utils.worker_thread_xlsx_export as export_module
+    from core.services.image_processor import ImageProcessor
+
+    class SlowExitExport(export_module.WorkerThreadXlsxExport):
+        """완료 신호를 보낸 뒤 조금 늦게 끝나는 워커"""
+
+        def run(self):
+            super().run()
+            time.sleep(0.05)
+
+    class SettingsStub:
+        def get_setting(self, key, default=None):
+            return default
+
+    app = QApplication.instance() or QApplication([])
+    jsonl_path = write_jsonl(tmp_path / "result.jsonl", [record(0)])
+    monkeypatch.setattr(export_module, "WorkerThreadXlsxExport", SlowExitExport)
+    monkeypatch.setattr(image_processor_module.QFileDialog, "getSaveFileName",
+                        lambda *args: (str(tmp_path / "result.xlsx"), ""))
+    monkeypatch.setattr(image_processor_module, "get_excel_checkbox_state", lambda: False)
+    processor = ImageProcessor(None, SettingsStub())
+
+    # 신호를 받은 시점에 실행 중인 QThread를 해제하면 앱이 종료되므로, 참조를 놓을 때는 스레드가 끝나 있어야 함
+    for _ in range(5):
+        processor.export_results_to_excel(jsonl_path)
+        worker = processor.export_worker
+        deadline = time.monotonic() + 10
+        while processor.export_worker is not None and time.monotonic() < deadline:
+            app.processEvents()
+        assert processor.export_worker is None
+        assert worker.isFinished()
+
+    assert read_sheets(str(tmp_path / "result.xlsx"))["결과"][1][0] == "img0.png"
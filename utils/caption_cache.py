@@ -0,0 +1,175 @@
+# utils/caption_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from cfg.cfg import get_app_dir
+
+
+def compute_bytes_hash(data: bytes) -> str:
+    """이미지 바이트의 SHA-256 해시"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시 (큰 파일도 일정한 메모리로 계산)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CaptionCache:
+    """이미지 해시 + 프롬프트 + 모델 ID로 캡션 결과를 저장하는 SQLite 캐시
+
+    ~/.imagekeywordextractor/caption_cache.sqlite3 에 저장되며,
+    오래된 항목(max_age_days)과 전체 크기(max_bytes) 기준으로 정리됩니다.
+    여러 요청 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    EVICT_EVERY = 100  # put 호출 몇 번마다 정리할지
+
+    def __init__(self, db_path: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024,
+                 max_age_days: float = 90):
+        self.db_path = db_path or os.path.join(get_app_dir(), "caption_cache.sqlite3")
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS captions (
+                cache_key   TEXT PRIMARY KEY,
+                image_hash  TEXT NOT NULL,
+                model       TEXT NOT NULL,
+                result      TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                created_at  REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_captions_last_access ON captions(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_captions_image_hash ON captions(image_hash)")
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(image_hash: str, prompt: str, model: str) -> str:
+        """이미지 해시, 프롬프트, 모델 ID를 합친 캐시 키"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{image_hash}\0{prompt_hash}\0{model}".encode('utf-8')).hexdigest()
+
+    def get(self, image_hash: str, prompt: str, model: str) -> Optional[dict]:
+        """캐시된 결과 반환 (없으면 None)"""
+        return self.get_first(image_hash, [prompt], model)
+
+    def get_first(self, image_hash: str, prompts: Iterable[str], model: str) -> Optional[dict]:
+        """prompts 순서대로 확인하여 처음 찾은 결과 (없으면 None) - 적중/미스는 한 번의 조회로 한 건만 기록"""
+        with self._lock:
+            for prompt in prompts:
+                key = self.make_key(image_hash, prompt, model)
+                row = self._conn.execute(
+                    "SELECT result, created_at FROM captions WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._is_expired(row[1]):
+                    break
+            else:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE captions SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def get_latest(self, image_hash: str) -> Optional[dict]:
+        """프롬프트/모델과 관계없이 이 이미지의 가장 최근 결과 (키워드 후보용, 적중 통계에 포함하지 않음)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM captions WHERE image_hash = ? ORDER BY created_at DESC LIMIT 1",
+                (image_hash,)
+            ).fetchone()
+        if row is None or self._is_expired(row[1]):
+            return None
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, image_hash: str, prompt: str, model: str, result: dict) -> None:
+        """결과 저장"""
+        key = self.make_key(image_hash, prompt, model)
+        payload = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO captions "
+                "(cache_key, image_hash, model, result, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, image_hash, model, payload, len(payload.encode('utf-8')), now, now)
+            )
+            self._conn.commit()
+            self._puts_since_evict += 1
+            should_evict = self._puts_since_evict >= self.EVICT_EVERY
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """기한이 지난 항목과 용량 초과분(오래 사용하지 않은 순)을 삭제"""
+        removed = 0
+        with self._lock:
+            self._puts_since_evict = 0
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute("DELETE FROM captions WHERE created_at < ?", (cutoff,)).rowcount
+
+            if self.max_bytes:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM captions").fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    victims = []
+                    for cache_key, size in self._conn.execute(
+                            "SELECT cache_key, size FROM captions ORDER BY last_access ASC"):
+                        victims.append((cache_key,))
+                        excess -= size
+                        if excess <= 0:
+                            break
+                    self._conn.executemany("DELETE FROM captions WHERE cache_key = ?", victims)
+                    removed += len(victims)
+            self._conn.commit()
+        if removed:
+            print(f"캡션 캐시 정리: {removed}개 항목 삭제")
+        return removed
+
+    def stats(self) -> dict:
+        """적중/미스 횟수와 저장된 항목 수, 크기"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM captions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'entries': entries,
+            'bytes': total,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _is_expired(self, created_at: float) -> bool:
+        return bool(self.max_age_days) and created_at < time.time() - self.max_age_days * 86400
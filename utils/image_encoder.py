@@ -0,0 +1,171 @@
+# utils/image_encoder.py
+# 업로드 전 이미지 축소/재압축 단계 (QImage는 GUI 스레드가 아니어도 사용 가능)
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PyQt5.QtGui import QColor, QImage, QImageReader, QPainter
+
+# API가 직접 받는 포맷 -> media_type
+API_MEDIA_TYPES = {
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+# 재압축에 사용할 수 있는 QImageWriter 포맷 -> media_type
+MEDIA_TYPES = {
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+# ISO-BMFF(ftyp) 브랜드 -> 포맷
+_FTYP_BRANDS = {
+    b'heic': 'heic', b'heix': 'heic', b'hevc': 'heic', b'hevx': 'heic',
+    b'heim': 'heic', b'heis': 'heic', b'mif1': 'heic', b'msf1': 'heic',
+    b'avif': 'avif', b'avis': 'avif',
+}
+
+
+def sniff_image_format(header):
+    """파일 앞부분의 매직 바이트로 실제 이미지 포맷 판별 (알 수 없으면 None)"""
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    if header[:2] == b'BM':
+        return 'bmp'
+    if header[:4] in (b'II*\x00', b'MM\x00*'):
+        return 'tiff'
+    if header[4:8] == b'ftyp':
+        return _FTYP_BRANDS.get(header[8:12])
+    return None
+
+
+def sniff_file_format(file_path):
+    """파일의 실제 이미지 포맷 판별 (읽을 수 없거나 알 수 없으면 None)"""
+    try:
+        with open(file_path, 'rb') as f:
+            return sniff_image_format(f.read(32))
+    except OSError:
+        return None
+
+
+def _scaled_size(size, max_edge):
+    """긴 변이 max_edge 이하가 되도록 비율을 유지한 크기"""
+    longest = max(size.width(), size.height())
+    if not max_edge or longest <= max_edge:
+        return size
+    scale = max_edge / float(longest)
+    return QSize(max(1, round(size.width() * scale)), max(1, round(size.height() * scale)))
+
+
+def _flatten_alpha(image):
+    """JPEG는 투명도를 지원하지 않으므로 흰 배경 위에 합성"""
+    if not image.hasAlphaChannel():
+        return image.convertToFormat(QImage.Format_RGB32)
+    flattened = QImage(image.size(), QImage.Format_RGB32)
+    flattened.fill(QColor(Qt.white))
+    painter = QPainter(flattened)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return flattened
+
+
+def _close_reader(reader, buffer):
+    """버퍼보다 리더(포맷 핸들러)를 먼저 정리 - 순서가 바뀌면 TIFF 핸들러가 닫힌 장치에 접근함"""
+    reader.setDevice(None)
+    buffer.close()
+
+
+def _encode(image, image_format, quality):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    ok = image.save(buffer, image_format.upper(), quality)
+    buffer.close()
+    return bytes(data) if ok else None
+
+
+def prepare_image_for_upload(image_bytes, max_edge=1568, quality=85, image_format='jpeg',
+                             target_bytes=1024 * 1024, min_quality=50):
+    """업로드용 이미지 준비 - 모델의 유효 해상도로 축소 후 목표 크기 이하로 재압축
+
+    실제 포맷은 확장자가 아니라 매직 바이트로 판별합니다.
+    API가 지원하는 포맷(JPEG/PNG/GIF/WebP)이고 max_edge, target_bytes 이내이면
+    재압축하지 않고 원본을 그대로 사용하며, BMP/TIFF/HEIC 등은 image_format으로 변환합니다.
+
+    Returns:
+        dict: data(bytes), media_type, original_bytes, sent_bytes, width, height, resized, source_format
+        디코딩할 수 없는 이미지는 None
+    """
+    image_format = image_format.lower() if image_format else 'jpeg'
+    if image_format not in MEDIA_TYPES:
+        image_format = 'jpeg'
+
+    sniffed_format = sniff_image_format(image_bytes[:32])
+
+    buffer = QBuffer()
+    buffer.setData(QByteArray(image_bytes))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)  # EXIF 회전 정보 반영
+
+    source_format = sniffed_format or bytes(reader.format()).decode('ascii', 'ignore').lower()
+    original_size = reader.size()
+    if not original_size.isValid():
+        _close_reader(reader, buffer)
+        return None
+
+    target_size = _scaled_size(original_size, max_edge)
+    needs_resize = target_size != original_size
+    within_budget = not target_bytes or len(image_bytes) <= target_bytes
+
+    # 그대로 보내도 되는 경우 재압축으로 화질을 떨어뜨리지 않음
+    if source_format in API_MEDIA_TYPES and not needs_resize and within_budget:
+        _close_reader(reader, buffer)
+        return {
+            'data': image_bytes,
+            'media_type': API_MEDIA_TYPES[source_format],
+            'original_bytes': len(image_bytes),
+            'sent_bytes': len(image_bytes),
+            'width': original_size.width(),
+            'height': original_size.height(),
+            'resized': False,
+            'source_format': source_format,
+        }
+
+    # JPEG 등은 디코딩 단계에서 바로 축소되므로 원본 해상도 전체를 풀지 않음
+    if needs_resize:
+        reader.setScaledSize(target_size)
+    image = reader.read()
+    _close_reader(reader, buffer)
+    if image.isNull():
+        return None
+
+    if image_format == 'jpeg':
+        image = _flatten_alpha(image)
+
+    # 목표 크기 이하가 될 때까지 품질을 낮춰 재압축
+    encoded = None
+    current_quality = quality
+    while True:
+        encoded = _encode(image, image_format, current_quality)
+        if encoded is None:
+            return None
+        if not target_bytes or len(encoded) <= target_bytes or current_quality <= min_quality:
+            break
+        current_quality = max(min_quality, current_quality - 10)
+
+    return {
+        'data': encoded,
+        'media_type': MEDIA_TYPES[image_format],
+        'original_bytes': len(image_bytes),
+        'sent_bytes': len(encoded),
+        'width': image.width(),
+        'height': image.height(),
+        'resized': needs_resize,
+        'source_format': source_format,
+    }
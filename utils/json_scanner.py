@@ -0,0 +1,209 @@
+# utils/json_scanner.py
+import json
+import re
+
+# 문자열 안에서 의미 있는 문자
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JsonObjectScanner:
+    """응답 텍스트에서 첫 번째 완전한 JSON 객체를 찾는 증분 스캐너
+
+    조각(chunk)을 받을 때마다 새로 들어온 문자만 검사하므로 스트리밍 응답에 바로 넣을 수 있습니다.
+    - 문자열 안의 괄호와 이스케이프 문자는 깊이 계산에서 제외
+    - 코드 펜스(```json ... ```)나 인라인 코드 앞뒤의 설명 문장은 건너뜀
+    - 후보가 JSON으로 파싱되지 않거나, 중간에 백틱이 나오거나, 끝까지 닫히지 않으면(finish)
+      후보 시작 다음의 여는 괄호부터 다시 찾음
+      ("형식 {예시:" 같은 설명 속 괄호나 짝이 맞지 않는 따옴표 뒤의 JSON도 찾음)
+
+    다시 찾을 때는 앞선 검사에서 문자열 밖에서 만난 여는 괄호의 짝(닫히는 위치 또는 닫히지 않음)을
+    그대로 사용하므로, 새로 검사하는 것은 앞선 검사에서 문자열 안에 있던 괄호뿐입니다 (전체 거의 O(n)).
+    """
+
+    OPEN = '{'
+    CLOSE = '}'
+    RESULT_TYPE = dict
+    FIRST_CHARS = '"}'  # 여는 괄호 다음(공백 제외)에 올 수 있는 문자 - 아니면 파싱하지 않고 건너뜀
+
+    def __init__(self, accept=None):
+        self.accept = accept  # 결과를 받아들일지 추가로 확인하는 함수 (선택)
+        self._chunks = []  # 지금까지 받은 전체 텍스트
+        self._length = 0  # 지금까지 받은 전체 길이
+        self._candidate_start = None  # 현재 후보의 시작 위치 (전체 텍스트 기준)
+        self._object_parts = []  # 현재 후보의 텍스트
+        self._open_positions = []  # 현재 후보 안에서 아직 닫히지 않은 여는 괄호 위치
+        self._known = {}  # 검사한 여는 괄호 위치 -> 짝이 되는 닫는 괄호 위치 (끝까지 닫히지 않으면 None)
+        self._in_string = False
+        self._escaped = False
+        self.result = None
+        self._special = re.compile('[' + re.escape(self.OPEN + self.CLOSE) + '"`]')
+
+    @property
+    def text(self):
+        """지금까지 받은 전체 텍스트"""
+        if len(self._chunks) > 1:
+            self._chunks = [''.join(self._chunks)]
+        return self._chunks[0] if self._chunks else ''
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def feed(self, chunk):
+        """텍스트 조각 추가 - 첫 JSON 값이 완성되면 파싱한 결과 반환, 아니면 None"""
+        if not chunk:
+            return self.result
+        self._chunks.append(chunk)
+        offset = self._length
+        self._length += len(chunk)
+        if self.result is None:
+            self._scan(chunk, offset, 0)
+        return self.result
+
+    def finish(self):
+        """입력 끝 - 끝까지 닫히지 않은 후보가 있으면 그 안의 다음 여는 괄호부터 다시 찾아 결과 반환"""
+        while self.result is None and self._candidate_start is not None:
+            self._scan(self.text, 0, self._abandon_candidate() + 1)
+        return self.result
+
+    def _scan(self, text, offset, index):
+        """text[index:] 검사 (offset: 전체 텍스트에서 text가 시작하는 위치)"""
+        # 의미 있는 문자(괄호/따옴표/백틱, 문자열 안에서는 따옴표/역슬래시)로만 건너뛰며 검사
+        if self._candidate_start is None:
+            index = self._find_start(text, offset, index)
+        part_start = index
+        if self._escaped and self._candidate_start is not None:
+            # 이전 조각이 역슬래시로 끝난 경우 첫 문자는 이스케이프된 문자
+            self._escaped = False
+            index += 1
+        length = len(text)
+        while 0 <= index < length:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, index)
+                if match is None:
+                    break
+                index = match.start()
+                if text[index] == '\\':
+                    if index + 1 >= length:
+                        self._escaped = True
+                    index += 2
+                    continue
+                self._in_string = False
+                index += 1
+                continue
+
+            match = self._special.search(text, index)
+            if match is None:
+                break
+            index = match.start()
+            char = text[index]
+            if char == '"':
+                self._in_string = True
+            elif char == self.OPEN:
+                self._open_positions.append(offset + index)
+            elif char == self.CLOSE:
+                self._known[self._open_positions.pop()] = offset + index
+                if not self._open_positions:
+                    self._object_parts.append(text[part_start:index + 1])
+                    candidate = ''.join(self._object_parts)
+                    candidate_start = self._candidate_start
+                    self._reset_candidate()
+                    parsed = self._parse_candidate(candidate)
+                    if parsed is not None:
+                        self.result = parsed
+                        return
+                    if self.OPEN in candidate[1:]:
+                        # 후보 안에 다른 여는 괄호가 있으면 후보 시작 다음부터 다시 찾음
+                        if candidate_start < offset:
+                            self._scan(self.text, 0, candidate_start + 1)
+                            return
+                        index = candidate_start - offset
+                    index = part_start = self._find_start(text, offset, index + 1)
+                    continue
+            else:
+                # JSON 밖의 백틱은 코드 펜스나 인라인 코드 - 후보는 설명 문장의 괄호였으므로 버리고 후보 시작 다음부터 다시 찾음
+                candidate_start = self._abandon_candidate()
+                if candidate_start < offset:
+                    self._scan(self.text, 0, candidate_start + 1)
+                    return
+                index = part_start = self._find_start(text, offset, candidate_start - offset + 1)
+                continue
+            index += 1
+
+        if self._candidate_start is not None:
+            self._object_parts.append(text[part_start:])
+
+    def _find_start(self, text, offset, index):
+        """다음 후보의 시작 위치 (없거나 이미 검사한 괄호에서 결과를 찾으면 -1)"""
+        while True:
+            index = text.find(self.OPEN, index)
+            if index < 0:
+                return -1
+            position = offset + index
+            if position not in self._known:
+                self._candidate_start = position
+                return index
+            end = self._known[position]
+            if end is not None:
+                # 앞선 검사에서 짝을 찾은 괄호 - 다시 검사하지 않고 그 구간만 파싱
+                parsed = self._parse_candidate(text[index:end - offset + 1])
+                if parsed is not None:
+                    self.result = parsed
+                    return -1
+            index += 1
+
+    def _abandon_candidate(self):
+        """현재 후보를 버리고 시작 위치 반환
+
+        후보 안에서 아직 열려 있는 괄호는 어디서 다시 검사해도 같은 위치(백틱이나 입력 끝)까지 닫히지 않으므로
+        닫히지 않은 것으로 기록합니다.
+        """
+        start = self._candidate_start
+        for position in self._open_positions:
+            self._known[position] = None
+        self._reset_candidate()
+        return start
+
+    def _reset_candidate(self):
+        self._candidate_start = None
+        self._object_parts = []
+        self._open_positions = []
+        self._in_string = False
+        self._escaped = False
+
+    def _parse_candidate(self, candidate):
+        if self.FIRST_CHARS and candidate[1:].lstrip()[:1] not in self.FIRST_CHARS:
+            return None
+        try:
+            parsed = json.loads(candidate)
+        except (ValueError, RecursionError):
+            # 파싱 실패 또는 비정상적으로 깊은 중첩
+            return None
+        if not isinstance(parsed, self.RESULT_TYPE):
+            return None
+        if self.accept and not self.accept(parsed):
+            return None
+        return parsed
+
+
+class JsonArrayScanner(JsonObjectScanner):
+    """첫 번째 완전한 JSON 배열을 찾는 스캐너 (묶음 응답용)"""
+
+    OPEN = '['
+    CLOSE = ']'
+    RESULT_TYPE = list
+    FIRST_CHARS = None
+
+
+def find_json_object(text, accept=None):
+    """텍스트에서 첫 번째 완전한 JSON 객체 (없으면 None)"""
+    scanner = JsonObjectScanner(accept)
+    scanner.feed(text)
+    return scanner.finish()
+
+
+def find_json_array(text, accept=None):
+    """텍스트에서 첫 번째 완전한 JSON 배열 (없으면 None)"""
+    scanner = JsonArrayScanner(accept)
+    scanner.feed(text)
+    return scanner.finish()
@@ -0,0 +1,78 @@
+# utils/jsonl_writer.py
+import json
+import os
+import threading
+import time
+
+
+class JsonlWriter:
+    """결과 JSONL 파일을 한 번만 열어 두고 버퍼링하여 기록하는 writer
+
+    flush_every개의 레코드가 쌓이거나 flush_interval초가 지나면 디스크로 내보내며,
+    fsync=True이면 내보낼 때마다 os.fsync로 기록을 보장합니다.
+    기록한 레코드 수(count)를 직접 관리하므로 완료 후 파일을 다시 읽을 필요가 없습니다.
+    """
+
+    def __init__(self, file_path, mode='w', flush_every=50, flush_interval=2.0, fsync=False, initial_count=0,
+                 on_flush=None):
+        self.file_path = file_path
+        self.on_flush = on_flush  # 디스크에 반영된 직후 호출 (예: 매니페스트 flush)
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.count = initial_count
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(file_path, mode, encoding='utf-8')
+
+    def write(self, record):
+        """레코드 한 줄 기록 (조건을 만족하면 flush)"""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every or self._is_flush_due():
+                self._flush_locked()
+
+    def flush_if_due(self):
+        """flush_interval이 지난 미기록 레코드가 있으면 flush (주기적으로 호출)"""
+        with self._lock:
+            if self._pending and self._is_flush_due():
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def _is_flush_due(self):
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def _flush_locked(self):
+        if self._file.closed:
+            return
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        if self.on_flush:
+            self.on_flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,131 @@
+# utils/keyword_index.py
+import heapq
+import math
+import os
+import re
+import threading
+from array import array
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from utils.keyword_manager import KeywordManager
+from utils.keyword_matcher import normalize_text, is_hangul, KOREAN_PARTICLES
+
+MIN_COVERAGE = 0.75  # 키워드 n-gram 가중치 중 이 비율 이상이 후보어에 있어야 선택
+MAX_DOCUMENT_RATIO = 0.2  # 어휘의 이 비율보다 많은 키워드에 나오는 n-gram은 변별력이 없어 무시
+
+# 파일/폴더 이름에서 후보어로 쓰지 않는 흔한 이름
+FILENAME_STOPWORDS = frozenset([
+    'img', 'image', 'images', 'dsc', 'dscn', 'dscf', 'pxl', 'photo', 'photos', 'pic', 'picture',
+    'screenshot', 'scan', 'copy', 'edit', 'final', 'new', 'untitled', 'download', 'downloads',
+    'desktop', 'documents', 'pictures', 'users', 'home', 'jpg', 'jpeg', 'png', 'webp',
+])
+_NAME_SPLIT = re.compile(r'[\W_]+|\d+')
+
+
+def token_ngrams(token: str):
+    """어절 하나의 문자 n-gram (앞뒤에 경계 표시를 붙이고, 한글은 2-gram, 그 외는 3-gram)"""
+    size = 2 if any(is_hangul(char) for char in token) else 3
+    padded = f" {token} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def text_ngrams(text: str, strip_particles: bool = False):
+    """텍스트 전체의 n-gram (strip_particles이면 '햇살이' -> '햇살'처럼 조사를 뗀 어절도 포함)"""
+    grams = set()
+    for token in normalize_text(text).split():
+        grams |= token_ngrams(token)
+        if strip_particles and is_hangul(token[-1]):
+            for length in (1, 2, 3):
+                if len(token) > length and token[-length:] in KOREAN_PARTICLES:
+                    grams |= token_ngrams(token[:-length])
+    return grams
+
+
+def filename_terms(image_path: str) -> List[str]:
+    """파일 이름과 상위 폴더 이름에서 얻은 후보어 (예: beach_sunset_001.jpg -> beach, sunset)"""
+    parent, name = os.path.split(os.path.splitext(image_path)[0])
+    terms = []
+    for part in (name, os.path.basename(parent)):
+        for word in _NAME_SPLIT.split(part):
+            word = word.lower()
+            if len(word) >= 2 and word not in FILENAME_STOPWORDS and word not in terms:
+                terms.append(word)
+    return terms
+
+
+class KeywordIndex:
+    """어휘 키워드의 문자 n-gram 역색인 - 후보어와 관련 있는 키워드 top-k 검색
+
+    키워드마다 n-gram의 IDF 가중치 합을 미리 계산해 두고, 후보어에 나온 n-gram의 게시 목록만 합산합니다.
+    후보어에 키워드의 n-gram 가중치가 MIN_COVERAGE 이상 있으면(철자 일부 차이, 조사 포함 허용) 후보가 됩니다.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = []
+        postings = defaultdict(lambda: array('I'))
+        seen = set()
+        for keyword in keywords:
+            normalized = normalize_text(keyword)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            keyword_id = len(self.keywords)
+            self.keywords.append(keyword)
+            for gram in text_ngrams(normalized):
+                postings[gram].append(keyword_id)
+        self._postings = dict(postings)
+
+        count = len(self.keywords)
+        self._idf = {gram: math.log(1 + count / len(ids)) for gram, ids in self._postings.items()}
+        self._weights = array('d', [0.0]) * count
+        for gram, ids in self._postings.items():
+            idf = self._idf[gram]
+            for keyword_id in ids:
+                self._weights[keyword_id] += idf
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def top_k(self, terms: Iterable[str], k: int = 30) -> List[str]:
+        """후보어(단어, 이전 캡션 등)와 가장 관련 있는 키워드 최대 k개 (관련도 순)"""
+        grams = set()
+        for term in terms:
+            if term:
+                grams |= text_ngrams(term, strip_particles=True)
+        if not grams or not self.keywords:
+            return []
+
+        max_documents = max(50, int(len(self.keywords) * MAX_DOCUMENT_RATIO))
+        matched = defaultdict(float)
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if ids is None or len(ids) > max_documents:
+                continue
+            idf = self._idf[gram]
+            for keyword_id in ids:
+                matched[keyword_id] += idf
+
+        # 합산 순서(해시 순서)에 따른 부동소수점 오차로 순위가 실행마다 바뀌지 않도록 반올림하여 비교
+        # (후보 문구가 캐시 키에 들어가므로 같은 입력이면 항상 같은 결과여야 함)
+        weights = self._weights
+        candidates = ((round(weight / weights[keyword_id], 9), round(weight, 9), -keyword_id)
+                      for keyword_id, weight in matched.items()
+                      if weight >= weights[keyword_id] * MIN_COVERAGE)
+        return [self.keywords[-negative_id] for _, _, negative_id in heapq.nlargest(k, candidates)]
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_keyword_index() -> Optional[KeywordIndex]:
+    """KeywordManager 어휘로 만든 공유 역색인 (처음 호출할 때 한 번 생성, 어휘가 없으면 None)"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = KeywordIndex(KeywordManager().vocab)
+            print(f"키워드 역색인 생성: {len(_shared_index)}개 키워드, {len(_shared_index._postings)}개 n-gram")
+        return _shared_index if len(_shared_index) else None
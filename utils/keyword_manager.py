@@ -1,14 +1,16 @@
 # utils/keyword_manager.py
-import pandas as pd
 import os
-from typing import List, Dict, Optional
-from cfg.cfg import resource_path
+from typing import List, Optional
+from cfg.cfg import resource_path, get_app_dir
+from utils.keyword_vocab import KeywordVocab, load_or_convert
+
+KEYWORD_CSV_NAME = "20250115_keyword.csv"
+KEYWORD_VOCAB_NAME = "keywords.vocab"  # CSV를 변환한 압축 키워드 파일 (~/.imagekeywordextractor)
 
 
 class KeywordManager:
     _instance = None
-    _keywords_cache: Optional[List[str]] = None
-    _keywords_by_category: Optional[Dict[str, List[str]]] = None
+    _vocab: Optional[KeywordVocab] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -16,65 +18,42 @@ class KeywordManager:
         return cls._instance
 
     def __init__(self):
-        if self._keywords_cache is None:
+        if self._vocab is None:
             self.load_keywords()
 
-    def load_keywords(self) -> None:
-        """키워드 데이터를 로드하고 캐시"""
-        try:
-            # 올바른 경로로 수정
-            csv_path = os.path.join(os.getcwd(), "res", "excel_csv", "20250115_keyword.csv")
-            print(f"Loading keywords from: {csv_path}")
-            print(f"Current working directory: {os.getcwd()}")
-            print(f"File exists check: {os.path.exists(csv_path)}")
-            
-            if not os.path.exists(csv_path):
-                # 상위 디렉토리 내용 확인
-                parent_dir = os.path.dirname(os.path.dirname(csv_path))
-                print(f"Parent directory: {parent_dir}")
-                if os.path.exists(parent_dir):
-                    print(f"Directory contents: {os.listdir(parent_dir)}")
-                raise FileNotFoundError(f"CSV file not found at {csv_path}")
-            
-            # 여러 인코딩 시도
-            encodings = ['cp949', 'euc-kr', 'utf-8']
-            for encoding in encodings:
-                try:
-                    print(f"Trying encoding: {encoding}")
-                    keywords_df = pd.read_csv(csv_path, encoding=encoding)
-                    self._keywords_cache = keywords_df.values.flatten().tolist()
-                    print(f"Keywords loaded successfully with {encoding}: {len(self._keywords_cache)} keywords")
-                    self._create_keyword_categories()
-                    return
-                except UnicodeDecodeError:
-                    print(f"Failed with encoding: {encoding}")
-                    continue
-                except Exception as e:
-                    print(f"Error with encoding {encoding}: {str(e)}")
-                    continue
-                
-            raise Exception("Could not load keywords with any encoding")
+    @staticmethod
+    def find_keyword_csv() -> Optional[str]:
+        """키워드 CSV 경로 (PyInstaller 리소스 폴더, 현재 작업 폴더 순으로 확인)"""
+        relative_path = os.path.join("res", "excel_csv", KEYWORD_CSV_NAME)
+        for csv_path in (resource_path(relative_path), os.path.join(os.getcwd(), relative_path)):
+            if os.path.exists(csv_path):
+                return csv_path
+        return None
 
-        except Exception as e:
-            print(f"Error loading keywords: {str(e)}")
-            self._keywords_cache = []
-            self._keywords_by_category = {}
+    def load_keywords(self) -> None:
+        """키워드 데이터를 로드하고 캐시
 
-    def _create_keyword_categories(self) -> None:
-        """키워드를 카테고리별로 분류"""
+        CSV는 처음 한 번만 인코딩을 확인하여 압축 키워드 파일로 변환하고,
+        이후에는 변환된 파일을 mmap으로 열기만 하므로 몇 ms 안에 끝납니다.
+        """
         try:
-            # 키워드 카테고리 분류
-            self._keywords_by_category = {
-                'all': self._keywords_cache,
-                'subject': [kw for kw in self._keywords_cache if self._is_subject_keyword(kw)],
-                'object': [kw for kw in self._keywords_cache if self._is_object_keyword(kw)],
-                'action': [kw for kw in self._keywords_cache if self._is_action_keyword(kw)],
-                'mood': [kw for kw in self._keywords_cache if self._is_mood_keyword(kw)]
+            csv_path = self.find_keyword_csv()
+            if not csv_path:
+                raise FileNotFoundError(f"키워드 CSV 파일을 찾을 수 없습니다: {KEYWORD_CSV_NAME}")
+            vocab_path = os.path.join(get_app_dir(), KEYWORD_VOCAB_NAME)
+            categorizers = {
+                'subject': self._is_subject_keyword,
+                'object': self._is_object_keyword,
+                'action': self._is_action_keyword,
+                'mood': self._is_mood_keyword,
             }
-            print(f"Keywords categorized: {[f'{k}: {len(v)}' for k, v in self._keywords_by_category.items()]}")
+            self._vocab = load_or_convert(csv_path, vocab_path, categorizers)
+            print(f"Keywords loaded: {len(self._vocab)} keywords "
+                  f"({', '.join(f'{name}: {len(self._vocab.category_indices(name))}' for name in self._vocab.categories)})")
+
         except Exception as e:
-            print(f"Error categorizing keywords: {str(e)}")
-            self._keywords_by_category = {'all': self._keywords_cache}
+            print(f"Error loading keywords: {str(e)}")
+            self._vocab = KeywordVocab.build([])
 
     def _is_subject_keyword(self, keyword: str) -> bool:
         """주제 관련 키워드 판별"""
@@ -95,18 +74,23 @@ class KeywordManager:
 
     def get_keywords(self, category: str = 'all', limit: int = 1000) -> List[str]:
         """특정 카테고리의 키워드 반환"""
-        if not self._keywords_cache:
+        if not self._vocab:
             self.load_keywords()
-
-        keywords = self._keywords_by_category.get(category, self._keywords_cache)
-        return keywords[:limit] if limit else keywords
+        return self._vocab.keywords(category, limit)
 
     def get_keywords_string(self, category: str = 'all', limit: int = 1000) -> str:
         """키워드를 문자열로 반환"""
         keywords = self.get_keywords(category, limit)
         return ', '.join(keywords)
 
+    @property
+    def vocab(self) -> KeywordVocab:
+        """공유 키워드 저장소 (문자열 복사 없이 인덱스로 접근)"""
+        if self._vocab is None:
+            self.load_keywords()
+        return self._vocab
+
     @property
     def is_loaded(self) -> bool:
         """키워드 로드 여부 확인"""
-        return self._keywords_cache is not None and len(self._keywords_cache) > 0
\ No newline at end of file
+        return self._vocab is not None and len(self._vocab) > 0
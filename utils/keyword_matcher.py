@@ -0,0 +1,156 @@
+# utils/keyword_matcher.py
+import re
+import threading
+import unicodedata
+from collections import deque
+from typing import Iterable, List, Optional
+
+from utils.keyword_manager import KeywordManager
+
+# 한글 키워드 뒤에 붙어도 같은 키워드로 보는 조사 (긴 것부터 확인할 필요 없이 집합으로 비교)
+KOREAN_PARTICLES = frozenset([
+    '이', '가', '은', '는', '을', '를', '의', '에', '에서', '에게', '께', '와', '과', '로', '으로',
+    '도', '만', '랑', '이랑', '하고', '처럼', '보다', '까지', '부터', '이다', '이며', '이고', '입니다',
+    '들', '들이', '들은', '들을', '들의', '들과', '들도', '들로', '들에',
+])
+# 영어 키워드의 복수형
+ENGLISH_SUFFIXES = frozenset(['s', 'es'])
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def is_hangul(char: str) -> bool:
+    return '가' <= char <= '힣'
+
+
+def normalize_text(text: str) -> str:
+    """비교용 정규화 - NFKC, 소문자, 문장부호/연속 공백을 공백 하나로"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return _NON_WORD.sub(' ', text).strip()
+
+
+class KeywordMatcher:
+    """어휘 전체에 대해 한 번 만든 Aho-Corasick 오토마톤으로 캡션에서 키워드 찾기
+
+    캡션 길이에 비례하는 한 번의 순회로 모든 키워드 후보를 찾고, 어절 경계를 확인합니다.
+    - 키워드는 어절의 시작에서 시작해야 함 ('dogma'에서 'dog'를 찾지 않음)
+    - 어절 끝에서 끝나거나, 한글 키워드는 조사('고양이가'), 영어 키워드는 복수형 어미가 이어져야 함
+    - 띄어쓰기가 있는 한글 키워드는 붙여 쓴 형태('파란 하늘' / '파란하늘')도 찾음
+    같은 위치에서는 가장 긴 키워드를 고르고, 겹치는 키워드는 앞의 것을 남깁니다.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = []  # 키워드 id -> 원래 키워드
+        self._goto = [{}]  # 노드 -> {문자: 다음 노드}
+        self._fail = [0]
+        self._outputs = [()]  # 노드 -> ((키워드 id, 정규화된 길이), ...) - 실패 링크를 따라간 출력 포함
+        seen = set()
+        for keyword in keywords:
+            normalized = normalize_text(keyword)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            keyword_id = len(self.keywords)
+            self.keywords.append(keyword)
+            self._add_pattern(normalized, keyword_id)
+            if ' ' in normalized and any(is_hangul(char) for char in normalized):
+                compact = normalized.replace(' ', '')
+                if compact not in seen:
+                    self._add_pattern(compact, keyword_id)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _add_pattern(self, pattern, keyword_id):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            node = next_node
+        self._outputs[node] += ((keyword_id, len(pattern)),)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                if self._outputs[self._fail[child]]:
+                    self._outputs[child] += self._outputs[self._fail[child]]
+
+    def find(self, text: str):
+        """정규화된 text에서 경계 조건을 만족하는 (시작, 끝, 키워드 id) 목록 (겹침 제거 전)"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not outputs[node]:
+                continue
+            end = position + 1
+            for keyword_id, length in outputs[node]:
+                start = end - length
+                if start and text[start - 1] != ' ':
+                    continue
+                if self._accepts_ending(text, end, char):
+                    matches.append((start, end, keyword_id))
+        return matches
+
+    @staticmethod
+    def _accepts_ending(text, end, last_char):
+        if end == len(text) or text[end] == ' ':
+            return True
+        token_end = text.find(' ', end)
+        rest = text[end:] if token_end < 0 else text[end:token_end]
+        if is_hangul(last_char):
+            return rest in KOREAN_PARTICLES
+        return rest in ENGLISH_SUFFIXES
+
+    def extract(self, *texts: Optional[str], limit: Optional[int] = None) -> List[str]:
+        """여러 텍스트에서 찾은 키워드 (처음 나온 순서, 중복 제거)"""
+        found = []
+        found_ids = set()
+        for text in texts:
+            normalized = normalize_text(text)
+            if not normalized:
+                continue
+            # 같은 시작 위치에서는 긴 키워드 우선, 이미 고른 키워드와 겹치면 제외
+            covered_until = 0
+            for start, end, keyword_id in sorted(self.find(normalized), key=lambda m: (m[0], m[0] - m[1])):
+                if start < covered_until:
+                    continue
+                covered_until = end
+                if keyword_id not in found_ids:
+                    found_ids.add(keyword_id)
+                    found.append(self.keywords[keyword_id])
+                    if limit and len(found) >= limit:
+                        return found
+        return found
+
+
+_shared_matcher = None
+_shared_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher() -> Optional[KeywordMatcher]:
+    """KeywordManager 어휘로 만든 공유 매처 (처음 호출할 때 한 번 생성, 어휘가 없으면 None)"""
+    global _shared_matcher
+    with _shared_matcher_lock:
+        if _shared_matcher is None:
+            vocab = KeywordManager().vocab
+            _shared_matcher = KeywordMatcher(vocab)
+            print(f"키워드 매처 생성: {len(_shared_matcher)}개 키워드, {len(_shared_matcher._goto)}개 노드")
+        return _shared_matcher if len(_shared_matcher) else None
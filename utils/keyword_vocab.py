@@ -0,0 +1,186 @@
+# utils/keyword_vocab.py
+import csv
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 파일 구성 (모든 구간이 4바이트 단위로 정렬되어 mmap 위에서 바로 uint32 배열로 읽힘)
+#   헤더 | 오프셋[count + 1] | 카테고리 표[category_count] | 카테고리 인덱스 | UTF-8 문자열 blob
+VOCAB_MAGIC = b'KWVOCAB1'
+_HEADER = struct.Struct('<8sB3xQQIII')  # magic, 바이트 순서, 원본 mtime_ns, 원본 크기, 키워드 수, blob 길이, 카테고리 수
+_CATEGORY = struct.Struct('<16sII')  # 이름, 인덱스 시작 위치, 인덱스 개수
+_BYTE_ORDER = 1 if sys.byteorder == 'little' else 2
+
+CSV_ENCODINGS = ('utf-8-sig', 'cp949', 'euc-kr')
+
+
+def source_stamp(path) -> Tuple[int, int]:
+    """원본 파일이 바뀌었는지 확인하기 위한 (mtime_ns, 크기)"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def decode_text(raw: bytes) -> Tuple[str, str]:
+    """인코딩을 추정하여 디코딩 - (텍스트, 사용한 인코딩)"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            return raw.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    raise UnicodeDecodeError('unknown', raw[:1], 0, 1, f"지원하는 인코딩이 없습니다: {', '.join(CSV_ENCODINGS)}")
+
+
+def read_keyword_csv(csv_path) -> List[str]:
+    """키워드 CSV의 모든 셀을 행 순서대로 읽기 (첫 줄은 헤더, 빈 셀과 중복 제외)"""
+    with open(csv_path, 'rb') as f:
+        text, encoding = decode_text(f.read())
+    print(f"키워드 CSV 인코딩: {encoding}")
+    keywords = []
+    seen = set()
+    rows = csv.reader(io.StringIO(text))
+    next(rows, None)
+    for row in rows:
+        for cell in row:
+            keyword = cell.strip()
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                keywords.append(keyword)
+    return keywords
+
+
+class KeywordVocab:
+    """키워드 목록을 하나의 UTF-8 blob + 오프셋 배열로 보관하는 압축 저장소
+
+    카테고리는 키워드 복사본이 아니라 공유 배열의 인덱스 목록이며,
+    문자열은 요청할 때만 디코딩하므로 mmap으로 열면 읽기 비용이 거의 없습니다.
+    """
+
+    def __init__(self, offsets, blob, categories: Dict[str, Iterable[int]], stamp=(0, 0), mapped=None):
+        self._offsets = offsets
+        self._blob = blob
+        self._categories = categories
+        self.stamp = tuple(stamp)
+        self._mapped = mapped
+
+    @classmethod
+    def build(cls, keywords: Iterable[str],
+              categorizers: Optional[Dict[str, Callable[[str], bool]]] = None, stamp=(0, 0)):
+        """키워드 목록에서 생성 (categorizers: 카테고리 이름 -> 키워드 판별 함수)"""
+        keywords = list(keywords)
+        encoded = [keyword.encode('utf-8') for keyword in keywords]
+        offsets = array('I', [0])
+        total = 0
+        for item in encoded:
+            total += len(item)
+            offsets.append(total)
+        categories = {}
+        for name, predicate in (categorizers or {}).items():
+            categories[name] = array('I', (index for index, keyword in enumerate(keywords) if predicate(keyword)))
+        return cls(offsets, b''.join(encoded), categories, stamp)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories)
+
+    def category_indices(self, category: str):
+        """카테고리에 속한 키워드 인덱스 ('all'이나 없는 카테고리는 전체 범위)"""
+        indices = self._categories.get(category)
+        return range(len(self)) if indices is None else indices
+
+    def keywords(self, category: str = 'all', limit: Optional[int] = None) -> List[str]:
+        """카테고리의 키워드를 최대 limit개 디코딩하여 반환"""
+        indices = self.category_indices(category)
+        if limit:
+            indices = indices[:limit]
+        return [self[index] for index in indices]
+
+    def save(self, path) -> None:
+        """파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        names = list(self._categories)
+        header = _HEADER.pack(VOCAB_MAGIC, _BYTE_ORDER, self.stamp[0], self.stamp[1],
+                              len(self), len(self._blob), len(names))
+        table = []
+        index_data = array('I')
+        for name in names:
+            table.append(_CATEGORY.pack(name.encode('ascii')[:16], len(index_data), len(self._categories[name])))
+            index_data.extend(self._categories[name])
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(array('I', self._offsets).tobytes())
+            f.write(b''.join(table))
+            f.write(index_data.tobytes())
+            f.write(bytes(self._blob))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, stamp=None, use_mmap=True):
+        """저장된 파일 열기 - 형식이 다르거나 원본 stamp와 맞지 않으면 None"""
+        try:
+            with open(path, 'rb') as f:
+                if use_mmap:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = f.read()
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, byte_order, mtime_ns, size, count, blob_len, category_count = _HEADER.unpack_from(data)
+            if magic != VOCAB_MAGIC or byte_order != _BYTE_ORDER:
+                raise ValueError("형식이 다른 키워드 파일")
+            if stamp is not None and (mtime_ns, size) != tuple(stamp):
+                raise ValueError("원본 CSV가 변경됨")
+            table_position = _HEADER.size + (count + 1) * 4
+            table = []
+            for number in range(category_count):
+                raw_name, start, length = _CATEGORY.unpack_from(data, table_position + number * _CATEGORY.size)
+                table.append((raw_name.rstrip(b'\0').decode('ascii'), start, length))
+            index_position = table_position + category_count * _CATEGORY.size
+            index_count = sum(length for _, _, length in table)
+            blob_position = index_position + index_count * 4
+            if blob_position + blob_len != len(data):
+                raise ValueError("잘린 키워드 파일")
+        except (struct.error, ValueError, UnicodeDecodeError) as e:
+            # 부분 뷰를 만들기 전에 검사하므로 mmap을 바로 닫을 수 있음 (Windows에서 파일 교체 가능)
+            print(f"키워드 파일을 사용할 수 없습니다 ({path}): {str(e)}")
+            if use_mmap:
+                data.close()
+            return None
+
+        view = memoryview(data)
+        offsets = view[_HEADER.size:table_position].cast('I')
+        index_data = view[index_position:blob_position].cast('I')
+        blob = view[blob_position:]
+        categories = {name: index_data[start:start + length] for name, start, length in table}
+        return cls(offsets, blob, categories, (mtime_ns, size), data if use_mmap else None)
+
+
+def load_or_convert(csv_path, vocab_path, categorizers=None, use_mmap=True) -> KeywordVocab:
+    """변환된 키워드 파일을 열고, 없거나 원본 CSV가 바뀌었으면 한 번 변환하여 저장"""
+    stamp = source_stamp(csv_path)
+    vocab = KeywordVocab.load(vocab_path, stamp=stamp, use_mmap=use_mmap)
+    if vocab is not None:
+        return vocab
+
+    print(f"키워드 CSV 변환 중: {csv_path} -> {vocab_path}")
+    vocab = KeywordVocab.build(read_keyword_csv(csv_path), categorizers, stamp)
+    try:
+        vocab.save(vocab_path)
+    except OSError as e:
+        # 저장하지 못해도 이번 실행에서는 메모리의 결과를 사용
+        print(f"키워드 파일 저장 실패: {str(e)}")
+    return vocab
@@ -0,0 +1,150 @@
+# utils/perceptual_hash.py
+# 유사(거의 같은) 이미지 묶기 - dHash + BK-tree
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage, QImageReader, qGray
+
+HASH_SIZE = 8  # 8x8 = 64비트 해시
+PROCESS_POOL_MIN_IMAGES = 32  # 이보다 적으면 프로세스를 띄우지 않고 바로 계산
+
+
+def compute_dhash(image_path, hash_size=HASH_SIZE):
+    """이미지의 dHash (가로로 이웃한 픽셀의 밝기 차이 부호) - 읽을 수 없으면 None
+
+    작게 축소한 흑백 이미지로 계산하므로 크기 변경, 재압축, 약한 보정에는 거의 변하지 않습니다.
+    """
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and max(size.width(), size.height()) > 256:
+        # JPEG은 축소 디코딩으로 빠르게 읽음
+        reader.setScaledSize(size.scaled(256, 256, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+
+    small = image.convertToFormat(QImage.Format_Grayscale8).scaled(
+        QSize(hash_size + 1, hash_size), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    value = 0
+    for y in range(hash_size):
+        for x in range(hash_size):
+            value <<= 1
+            if qGray(small.pixel(x, y)) < qGray(small.pixel(x + 1, y)):
+                value |= 1
+    return value
+
+
+def _hash_entry(image_path):
+    try:
+        return image_path, compute_dhash(image_path)
+    except Exception as e:
+        print(f"지각 해시 계산 실패 ({image_path}): {str(e)}")
+        return image_path, None
+
+
+def compute_hashes(image_paths, max_workers=None, progress_callback=None):
+    """여러 이미지의 dHash를 프로세스 풀에서 계산 - {경로: 해시 또는 None}
+
+    프로세스를 만들 수 없는 환경이면 현재 스레드에서 순서대로 계산합니다.
+    """
+    image_paths = list(image_paths)
+    hashes = {}
+    if len(image_paths) >= PROCESS_POOL_MIN_IMAGES:
+        workers = max_workers or max(1, min(os.cpu_count() or 1, 8))
+        chunk_size = max(1, min(64, len(image_paths) // (workers * 4)))
+        try:
+            # Qt가 스레드를 쓰고 있으므로 fork 대신 spawn으로 시작 (Windows/PyInstaller와 동일)
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                for image_path, value in pool.map(_hash_entry, image_paths, chunksize=chunk_size):
+                    hashes[image_path] = value
+                    if progress_callback:
+                        progress_callback(len(hashes), len(image_paths))
+            return hashes
+        except (BrokenProcessPool, OSError) as e:
+            print(f"프로세스 풀을 사용할 수 없어 순차 계산합니다: {str(e)}")
+
+    for image_path in image_paths:
+        if image_path in hashes:
+            continue
+        hashes[image_path] = _hash_entry(image_path)[1]
+        if progress_callback:
+            progress_callback(len(hashes), len(image_paths))
+    return hashes
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """해밍 거리 기준 BK-tree - 반경 안의 해시를 전체 비교 없이 찾음"""
+
+    def __init__(self):
+        self.root = None  # (해시, 항목, {거리: 자식 노드})
+        self.size = 0
+
+    def add(self, value, item):
+        node = (value, item, {})
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming_distance(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value, max_distance):
+        """max_distance 이내의 (거리, 해시, 항목) 목록 (가까운 순)"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = hamming_distance(value, node_value)
+            if distance <= max_distance:
+                found.append((distance, node_value, item))
+            # 삼각 부등식으로 볼 필요가 없는 가지는 건너뜀
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda entry: entry[0])
+        return found
+
+
+def group_near_duplicates(hashes, threshold):
+    """해밍 거리 threshold 이내의 이미지를 묶기
+
+    입력 순서대로 보면서 가장 가까운 대표 이미지에 붙이고, 가까운 대표가 없으면 새 대표가 됩니다.
+    (대표끼리만 비교하므로 비슷한 이미지가 사슬처럼 이어져 그룹이 끝없이 커지지 않음)
+    해시가 없는(읽을 수 없는) 이미지는 각각 단독 그룹이 됩니다.
+
+    Returns:
+        list: [(대표 경로, 대표 해시, [같은 그룹의 나머지 경로]), ...] - 입력 순서
+    """
+    tree = BKTree()
+    groups = []
+    group_of = {}  # 대표 경로 -> groups 인덱스
+    for image_path, value in hashes.items():
+        if value is None:
+            groups.append((image_path, None, []))
+            continue
+        matches = tree.search(value, threshold)
+        if matches:
+            representative = matches[0][2]
+            groups[group_of[representative]][2].append(image_path)
+            continue
+        group_of[image_path] = len(groups)
+        groups.append((image_path, value, []))
+        tree.add(value, image_path)
+    return groups
@@ -0,0 +1,195 @@
+# utils/rate_limiter.py
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Mapping, Optional
+
+
+class AdaptiveRateLimiter:
+    """모든 캡션 요청이 공유하는 속도 제어기 (토큰 버킷 + AIMD)
+
+    - 토큰 버킷: 초당 요청 수(rate)를 제한
+    - AIMD: 429/529 응답 시 동시 요청 수와 속도를 절반으로 줄이고,
+      정상 응답이 이어지면 조금씩 다시 늘림
+    - 응답 헤더(anthropic-ratelimit-*, retry-after)를 읽어 계정 한도에 맞춤
+    """
+
+    def __init__(self, max_concurrency: int, initial_rate: Optional[float] = None,
+                 min_rate: float = 0.1, max_rate: float = 50.0,
+                 decrease_factor: float = 0.5, max_backoff: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic, wall_clock: Callable[[], float] = time.time):
+        self._cond = threading.Condition()
+        self._clock = clock  # 경과 시간 측정용 (테스트에서 가짜 시계로 교체)
+        self._wall_clock = wall_clock  # 헤더의 재설정 시각과 비교할 현재 시각
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.concurrency_limit = self.max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max_rate, max(min_rate, initial_rate or float(self.max_concurrency)))
+        self.decrease_factor = decrease_factor
+        self.max_backoff = max_backoff
+
+        self.in_flight = 0
+        self._tokens = 1.0
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+        self._success_streak = 0
+        self._throttle_streak = 0
+        self._header_rate_ceiling = max_rate
+        self.throttle_count = 0
+
+    # ------------------------------------------------------------------
+    # 요청 슬롯
+    # ------------------------------------------------------------------
+    def acquire(self, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """요청 슬롯을 얻을 때까지 대기. should_stop()이 True가 되면 False 반환"""
+        with self._cond:
+            while True:
+                if should_stop and should_stop():
+                    return False
+
+                now = self._clock()
+                self._refill(now)
+
+                wait_time = None
+                if now < self._blocked_until:
+                    wait_time = self._blocked_until - now
+                elif self.in_flight >= self.concurrency_limit:
+                    wait_time = 0.5
+                elif self._tokens < 1.0:
+                    wait_time = (1.0 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1.0
+                    self.in_flight += 1
+                    return True
+
+                # 취소 여부를 확인할 수 있도록 최대 0.5초 단위로 대기
+                self._cond.wait(min(wait_time, 0.5))
+
+    def release(self) -> None:
+        """요청 슬롯 반환"""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 응답 반영
+    # ------------------------------------------------------------------
+    def on_success(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """정상 응답 - 헤더의 잔여 한도를 반영하고 속도를 조금씩 올림 (additive increase)"""
+        with self._cond:
+            self._throttle_streak = 0
+            self._apply_headers(headers)
+
+            self._success_streak += 1
+            if self._success_streak >= self.concurrency_limit:
+                self._success_streak = 0
+                if self.concurrency_limit < self.max_concurrency:
+                    self.concurrency_limit += 1
+                self.rate = min(self._header_rate_ceiling, self.max_rate, self.rate + 1.0)
+            self._cond.notify_all()
+
+    def on_throttle(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """429/529 응답 - 동시 요청 수와 속도를 줄이고 retry-after 동안 새 요청을 막음
+
+        Returns:
+            다음 요청까지 대기할 시간(초)
+        """
+        with self._cond:
+            self.throttle_count += 1
+            self._throttle_streak += 1
+            self._success_streak = 0
+            self.concurrency_limit = max(1, int(self.concurrency_limit * self.decrease_factor))
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = 0.0
+
+            retry_after = self._parse_retry_after(headers)
+            if retry_after is None:
+                # retry-after 힌트가 없으면 연속 실패 횟수에 따라 지수 백오프
+                retry_after = min(self.max_backoff, 2.0 * (2 ** (self._throttle_streak - 1)))
+            self._blocked_until = max(self._blocked_until, self._clock() + retry_after)
+            self._apply_headers(headers)
+            self._cond.notify_all()
+            return retry_after
+
+    # ------------------------------------------------------------------
+    # 상태 조회
+    # ------------------------------------------------------------------
+    @property
+    def current_rate(self) -> float:
+        """현재 허용 속도 (초당 요청 수)"""
+        with self._cond:
+            return self.rate
+
+    def snapshot(self) -> dict:
+        """진행 상황 표시용 현재 상태"""
+        with self._cond:
+            return {
+                'rate': self.rate,
+                'concurrency_limit': self.concurrency_limit,
+                'in_flight': self.in_flight,
+                'throttle_count': self.throttle_count,
+                'blocked_for': max(0.0, self._blocked_until - self._clock()),
+            }
+
+    # ------------------------------------------------------------------
+    # 내부 처리
+    # ------------------------------------------------------------------
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        # 버스트 크기는 동시 요청 한도로 제한
+        self._tokens = min(float(self.concurrency_limit), self._tokens + elapsed * self.rate)
+
+    def _apply_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """anthropic-ratelimit-requests-* 헤더로 남은 한도를 재설정 시각까지 고르게 분배"""
+        if not headers:
+            return
+        remaining = self._header_number(headers, 'anthropic-ratelimit-requests-remaining')
+        reset_at = self._parse_reset(headers.get('anthropic-ratelimit-requests-reset'))
+        if remaining is None or reset_at is None:
+            return
+
+        seconds_left = max(1.0, reset_at - self._wall_clock())
+        ceiling = max(self.min_rate, remaining / seconds_left)
+        limit = self._header_number(headers, 'anthropic-ratelimit-requests-limit')
+        if limit is not None and remaining >= limit * 0.5:
+            # 한도가 넉넉한 경우에는 상한을 두지 않음
+            ceiling = self.max_rate
+        self._header_rate_ceiling = min(self.max_rate, ceiling)
+        self.rate = min(self.rate, self._header_rate_ceiling)
+
+    @staticmethod
+    def _header_number(headers: Mapping[str, str], key: str) -> Optional[float]:
+        value = headers.get(key)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        if not headers:
+            return None
+        value = headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _parse_reset(value: Optional[str]) -> Optional[float]:
+        """RFC 3339 형식의 재설정 시각을 epoch 초로 변환"""
+        if not value:
+            return None
+        try:
+            reset = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if reset.tzinfo is None:
+                reset = reset.replace(tzinfo=timezone.utc)
+            return reset.timestamp()
+        except ValueError:
+            return None
@@ -0,0 +1,182 @@
+# utils/run_manifest.py
+import json
+import os
+import time
+
+from utils.caption_cache import compute_file_hash
+from utils.jsonl_writer import JsonlWriter
+
+
+def normalize_path(path):
+    """결과 JSONL의 image_path와 같은 형식(구분자 '/')으로 경로 정규화"""
+    return path.replace('\\', '/') if path else path
+
+
+class RunManifest:
+    """작업 재개를 위한 실행 매니페스트
+
+    결과 JSONL 옆에 <결과 파일>.manifest 로 이미지별 상태(queued/done/failed)를
+    추가 기록(append-only)합니다. 마지막 기록이 해당 이미지의 현재 상태이며,
+    비정상 종료로 잘린 마지막 줄은 무시합니다.
+    경로는 결과 JSONL과 같이 '/' 구분자로 정규화하여 기록/비교합니다 (Windows 경로 포함).
+    """
+
+    QUEUED = 'queued'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, manifest_path, jsonl_path, entries=None, fsync=False):
+        self.manifest_path = manifest_path
+        self.jsonl_path = jsonl_path
+        self.entries = entries if entries is not None else {}  # path -> 마지막 상태 기록
+        self._writer = JsonlWriter(manifest_path, mode='a', flush_every=10 ** 9,
+                                   flush_interval=float('inf'), fsync=fsync)
+
+    @staticmethod
+    def manifest_path_for(jsonl_path):
+        """결과 JSONL 파일에 대응하는 매니페스트 경로"""
+        return jsonl_path + '.manifest'
+
+    @classmethod
+    def create(cls, jsonl_path, fsync=False):
+        """새 작업의 매니페스트 생성"""
+        manifest_path = cls.manifest_path_for(jsonl_path)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            header = {'event': 'run', 'jsonl_path': jsonl_path, 'created_at': time.time()}
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        return cls(manifest_path, jsonl_path, fsync=fsync)
+
+    @classmethod
+    def load(cls, manifest_path, fsync=False):
+        """기존 매니페스트를 읽어 이미지별 마지막 상태 복원"""
+        jsonl_path = None
+        entries = {}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 도중 종료되어 잘린 줄
+                if record.get('event') == 'run':
+                    jsonl_path = record.get('jsonl_path')
+                    continue
+                path = normalize_path(record.get('path'))
+                if not path:
+                    continue
+                record['path'] = path
+                previous = entries.get(path, {})
+                entries[path] = {**previous, **record}
+
+        if not jsonl_path:
+            # 헤더가 없으면 매니페스트 이름에서 결과 파일 경로 유추
+            jsonl_path = manifest_path[:-len('.manifest')] if manifest_path.endswith('.manifest') else manifest_path
+        return cls(manifest_path, jsonl_path, entries=entries, fsync=fsync)
+
+    # ------------------------------------------------------------------
+    # 상태 기록
+    # ------------------------------------------------------------------
+    def mark_queued(self, image_paths):
+        """처리할 이미지 등록 (크기/수정 시각을 함께 기록하고 바로 디스크에 반영)"""
+        for path in image_paths:
+            record = {'path': normalize_path(path), 'state': self.QUEUED}
+            try:
+                stat = os.stat(path)
+                record['size'] = stat.st_size
+                record['mtime'] = stat.st_mtime
+            except OSError:
+                pass
+            self._append(record)
+        self.flush()
+
+    def mark_done(self, image_path, content_hash=None, **extra):
+        record = {'path': normalize_path(image_path), 'state': self.DONE}
+        if content_hash:
+            record['hash'] = content_hash
+        record.update(extra)
+        self._append(record)
+
+    def mark_failed(self, image_path, error=None):
+        self._append({'path': normalize_path(image_path), 'state': self.FAILED, 'error': str(error) if error else None})
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @property
+    def done_count(self):
+        return sum(1 for entry in self.entries.values() if entry.get('state') == self.DONE)
+
+    def repair_results(self):
+        """결과 JSONL을 점검 - 기록 도중 잘린 마지막 줄을 잘라내고 기록된 이미지 경로를 반환
+
+        Returns:
+            (기록된 image_path 집합, 정상 레코드 수)
+        """
+        recorded = set()
+        count = 0
+        if not os.path.exists(self.jsonl_path):
+            return recorded, count
+
+        valid_end = 0
+        with open(self.jsonl_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 마지막 줄이 잘림
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                valid_end = f.tell()
+                count += 1
+                if isinstance(record, dict) and record.get('image_path'):
+                    recorded.add(normalize_path(record['image_path']))
+
+        if valid_end < os.path.getsize(self.jsonl_path):
+            print(f"결과 파일의 잘린 마지막 부분 제거: {self.jsonl_path}")
+            with open(self.jsonl_path, 'r+b') as f:
+                f.truncate(valid_end)
+        return recorded, count
+
+    def pending_paths(self, recorded_paths=None):
+        """아직 끝나지 않은 이미지 경로 (등록 순서 유지)
+
+        완료로 기록됐지만 결과 파일에 없는 이미지(recorded_paths 기준)와
+        파일이 바뀐 이미지(크기/수정 시각이 다르고 내용 해시도 다름)도 다시 포함합니다.
+        """
+        if recorded_paths is not None:
+            recorded_paths = {normalize_path(path) for path in recorded_paths}
+        pending = []
+        for path, entry in self.entries.items():
+            if not os.path.exists(path):
+                continue
+            if entry.get('state') != self.DONE:
+                pending.append(path)
+            elif recorded_paths is not None and path not in recorded_paths:
+                pending.append(path)
+            elif self._has_changed(path, entry):
+                pending.append(path)
+        return pending
+
+    def _has_changed(self, path, entry):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size == entry.get('size') and stat.st_mtime == entry.get('mtime'):
+            return False
+        if not entry.get('hash'):
+            return True
+        try:
+            return compute_file_hash(path) != entry['hash']
+        except OSError:
+            return False
+
+    def _append(self, record):
+        previous = self.entries.get(record['path'], {})
+        self.entries[record['path']] = {**previous, **record}
+        self._writer.write(record)
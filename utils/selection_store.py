@@ -0,0 +1,81 @@
+# utils/selection_store.py
+from typing import Dict, Iterable, List, Optional
+
+
+class SelectionStore:
+    """파일 경로 기준 선택(체크) 상태 저장소
+
+    체크된 경로만 보관하므로 선택 여부 확인/변경은 O(1),
+    선택된 파일 조회는 전체 행 수가 아니라 선택된 개수에 비례합니다.
+    행 순서는 모델이 관리하며 조회할 때 경로 → 행 번호 맵을 넘겨 정렬합니다.
+    """
+
+    def __init__(self):
+        self._selected = set()
+
+    def __len__(self) -> int:
+        return len(self._selected)
+
+    def __bool__(self) -> bool:
+        return bool(self._selected)
+
+    def __contains__(self, path) -> bool:
+        return path in self._selected
+
+    def __iter__(self):
+        return iter(self._selected)
+
+    def is_selected(self, path: str) -> bool:
+        return path in self._selected
+
+    def set_selected(self, path: str, selected: bool) -> bool:
+        """선택 상태 변경 - 실제로 바뀌었으면 True"""
+        if selected:
+            if path in self._selected:
+                return False
+            self._selected.add(path)
+            return True
+        if path not in self._selected:
+            return False
+        self._selected.discard(path)
+        return True
+
+    def toggle(self, path: str) -> bool:
+        """선택 상태를 뒤집고 바뀐 상태 반환"""
+        selected = path not in self._selected
+        self.set_selected(path, selected)
+        return selected
+
+    def select_many(self, paths: Iterable[str]) -> int:
+        """여러 경로 선택 - 새로 선택된 개수 반환"""
+        before = len(self._selected)
+        self._selected.update(paths)
+        return len(self._selected) - before
+
+    def deselect_many(self, paths: Iterable[str]) -> int:
+        """여러 경로 선택 해제(삭제된 행 정리에도 사용) - 해제된 개수 반환"""
+        before = len(self._selected)
+        if not self._selected:
+            return 0
+        self._selected.difference_update(paths)
+        return before - len(self._selected)
+
+    def set_many(self, paths: Iterable[str], selected: bool) -> int:
+        """범위 선택/해제 등 여러 경로를 같은 상태로 변경 - 바뀐 개수 반환"""
+        return self.select_many(paths) if selected else self.deselect_many(paths)
+
+    def select_all(self, paths: Iterable[str]) -> None:
+        """주어진 경로 전체를 선택 상태로 교체"""
+        self._selected = set(paths)
+
+    def clear(self) -> int:
+        """모두 선택 해제 - 해제된 개수 반환"""
+        count = len(self._selected)
+        self._selected = set()
+        return count
+
+    def selected(self, order: Optional[Dict[str, int]] = None) -> List[str]:
+        """선택된 경로 목록 (order가 있으면 그 값(행 번호) 순으로 정렬)"""
+        if order is None:
+            return list(self._selected)
+        return sorted(self._selected, key=lambda path: order.get(path, len(order)))
@@ -0,0 +1,173 @@
+# utils/thumbnail_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from PyQt5.QtGui import QImage, QPixmap
+
+from cfg.cfg import get_app_dir, default_thumbnail_memory_mb, default_thumbnail_disk_mb
+
+
+class ThumbnailCache:
+    """메모리 LRU(QPixmap)와 디스크(~/.imagekeywordextractor/thumbs) 2단계 썸네일 캐시
+
+    키는 파일 경로 + 수정 시각 + 파일 크기 + 썸네일 크기로 만들므로
+    파일이 바뀌면 자동으로 새 썸네일을 만듭니다.
+    - 메모리 캐시(get_pixmap/put_pixmap)는 QPixmap을 다루므로 GUI 스레드에서만 사용
+    - 디스크 캐시(load_image/store_image)는 워커 스레드에서 사용하며 전체 바이트 기준으로 정리
+    """
+
+    EVICT_EVERY = 200  # store_image 호출 몇 번마다 디스크 용량을 확인할지
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_memory_bytes: int = default_thumbnail_memory_mb * 1024 * 1024,
+                 max_disk_bytes: int = default_thumbnail_disk_mb * 1024 * 1024):
+        self.cache_dir = cache_dir or os.path.join(get_app_dir(), "thumbs")
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._pixmaps = OrderedDict()  # 키 → QPixmap (가장 최근에 쓴 항목이 뒤)
+        self._memory_bytes = 0
+        self._disk_bytes = None  # 첫 저장 시 한 번 계산
+        self._stores_since_evict = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_path: str, size: int) -> Optional[str]:
+        """경로, 수정 시각, 파일 크기, 썸네일 크기로 만든 캐시 키 (파일이 없으면 None)"""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(image_path)}\0{stat.st_mtime_ns}\0{stat.st_size}\0{size}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    # ---- 메모리 캐시 (GUI 스레드) ----
+
+    def get_pixmap(self, key: str) -> Optional[QPixmap]:
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            return None
+        self._pixmaps.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def put_pixmap(self, key: str, pixmap: QPixmap) -> None:
+        if key in self._pixmaps:
+            self._memory_bytes -= self._pixmap_bytes(self._pixmaps.pop(key))
+        self._pixmaps[key] = pixmap
+        self._memory_bytes += self._pixmap_bytes(pixmap)
+        while self._memory_bytes > self.max_memory_bytes and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._memory_bytes -= self._pixmap_bytes(evicted)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    # ---- 디스크 캐시 (워커 스레드) ----
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def load_image(self, key: str) -> Optional[QImage]:
+        """디스크에 저장된 썸네일 (없으면 None)"""
+        path = self._disk_path(key)
+        image = QImage(path)
+        if image.isNull():
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # 수정 시각을 마지막 사용 시각으로 사용 (오래 쓰지 않은 순으로 정리)
+            os.utime(path, None)
+        except OSError:
+            pass
+        with self._lock:
+            self.disk_hits += 1
+        return image
+
+    def store_image(self, key: str, image: QImage) -> None:
+        """썸네일을 디스크에 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 깨진 파일이 남지 않음)"""
+        path = self._disk_path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            if not image.save(temp_path, "PNG"):
+                return
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"썸네일 캐시 저장 실패: {str(e)}")
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            self._stores_since_evict += 1
+            should_evict = (self._disk_bytes is None or self._stores_since_evict >= self.EVICT_EVERY
+                            or self._disk_bytes > self.max_disk_bytes)
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """디스크 캐시가 max_disk_bytes를 넘으면 오래 사용하지 않은 썸네일부터 삭제"""
+        with self._lock:
+            self._stores_since_evict = 0
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    for entry in it:
+                        if not entry.is_file() or entry.name.endswith('.tmp'):
+                            continue
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+            except OSError as e:
+                print(f"썸네일 캐시 확인 실패: {str(e)}")
+                return 0
+
+            removed = 0
+            if total > self.max_disk_bytes:
+                # 한 번 정리할 때 한도의 90%까지 줄여 매번 정리하지 않도록 함
+                target = self.max_disk_bytes * 0.9
+                for _, size, path in sorted(entries):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    removed += 1
+                    if total <= target:
+                        break
+            self._disk_bytes = total
+        if removed:
+            print(f"썸네일 캐시 정리: {removed}개 파일 삭제")
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'memory_entries': len(self._pixmaps),
+            'memory_bytes': self._memory_bytes,
+            'disk_bytes': self._disk_bytes,
+        }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """FileOperations, MainUI, FileListWidget이 함께 쓰는 썸네일 캐시"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ThumbnailCache()
+        return _shared_cache
@@ -0,0 +1,282 @@
+# utils/worker_thread_batch.py
+import os
+import time
+import traceback
+
+from PyQt5.QtCore import QThread
+from anthropic import APIStatusError
+
+from cfg.cfg import default_batch_max_requests, default_batch_max_mb, default_batch_poll_interval, \
+    default_batch_max_retrieve_failures
+from utils.caption_cache import compute_bytes_hash
+from utils.worker_thread_chat_completion import WorkerThreadChatCompletion, CAPTION_PROMPT
+
+
+class WorkerThreadBatch(WorkerThreadChatCompletion):
+    """Message Batches API로 캡션을 요청하는 워커 (대량 작업용)
+
+    실시간 워커와 같은 프롬프트로 요청을 묶어 배치로 제출하고, 처리가 끝날 때까지
+    주기적으로 상태를 확인한 뒤 결과를 같은 JSONL/result_signal 형식으로 기록합니다.
+    결과는 늦게 도착하지만 처리량이 높고 비용이 낮습니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_max_requests = max(1, int(self.get_setting('batch_max_requests', default_batch_max_requests)))
+        self.batch_max_bytes = int(float(self.get_setting('batch_max_mb', default_batch_max_mb)) * 1024 * 1024)
+        self.poll_interval = float(self.get_setting('batch_poll_interval', default_batch_poll_interval))
+        self.max_retrieve_failures = max(1, int(self.get_setting('batch_max_retrieve_failures',
+                                                                   default_batch_max_retrieve_failures)))
+        self.batches = {}  # batch_id -> {custom_id: (image_path, upload 정보)}
+        self.retrieve_failures = {}  # batch_id -> 연속 상태 확인 실패 횟수
+        self.cancel_requested = False
+
+    def run(self):
+        """스레드 실행 - 이미지를 배치로 제출하고 끝날 때까지 결과를 수집"""
+        if not self.image_queue or self.image_queue.empty():
+            self.emit_status_signal("오류: 처리할 이미지가 없습니다.")
+            self.emit_status_signal("처리 완료")
+            self.close_caption_cache()
+            return
+
+        try:
+            # JSONL 파일 초기화
+            if not self.initialize_jsonl_file():
+                self.emit_status_signal("오류: 결과 파일을 준비할 수 없습니다.")
+                return
+
+            image_paths = []
+            while not self.image_queue.empty():
+                image_paths.append(self.image_queue.get())
+
+            # 처리할 이미지를 매니페스트에 등록 (이어서 처리하는 경우 이미 등록됨)
+            if self.manifest and not self.is_resume:
+                self.manifest.mark_queued(image_paths)
+
+            if not self.api_key or not self.client:
+                self.emit_status_signal("오류: API 키가 설정되지 않았습니다.")
+                return
+
+            self.total_images = len(image_paths)
+            self.processed_count = 0
+            self.emit_status_signal(f"배치 처리 시작 (총 {self.total_images}개)...")
+
+            self.prepare_keywords()
+
+            # 유사 이미지 그룹은 대표만 배치에 넣음 (결과는 기록할 때 나머지에 복사)
+            image_paths = self.group_duplicate_images(image_paths)
+            self.submit_batches(image_paths)
+            self.collect_batches()
+
+            # 남은 결과를 모두 기록하고 파일 닫기
+            self.close_jsonl_writer()
+            self.emit_usage_summary()
+            self.close_manifest()
+
+            if self.stopped:
+                msg = f"작업이 취소되었습니다. 결과 파일: {self.jsonl_file_path}"
+            else:
+                msg = f"모든 이미지 처리가 완료되었습니다. 결과 파일: {self.jsonl_file_path}"
+            self.emit_status_signal(msg)
+            self.completed_signal.emit(msg)
+
+        except Exception as e:
+            error_msg = f"배치 처리 오류: {str(e)}"
+            self.emit_status_signal(error_msg)
+            traceback.print_exc()
+        finally:
+            self.close_jsonl_writer()
+            self.close_manifest()
+            self.close_caption_cache()
+
+    # ------------------------------------------------------------------
+    # 제출
+    # ------------------------------------------------------------------
+    def submit_batches(self, image_paths):
+        """요청 수/크기 한도에 맞춰 나눠 제출 (한 번에 배치 하나 분량만 메모리에 보관)"""
+        requests = []
+        pending = {}
+        pending_bytes = 0
+
+        for index, image_path in enumerate(image_paths):
+            if self.stopped:
+                break
+            file_name = os.path.basename(image_path)
+            self.current_file.emit(file_name)
+            try:
+                with open(image_path, "rb") as image_file:
+                    image_bytes = image_file.read()
+                image_hash = compute_bytes_hash(image_bytes)
+                self.image_hashes[image_path] = image_hash
+
+                # 캐시된 캡션은 배치에 넣지 않고 바로 기록
+                keyword_hint = self.build_keyword_hint(image_path)
+                cached_text = self.load_cached_caption(image_hash, self.cache_prompt(CAPTION_PROMPT, keyword_hint))
+                if cached_text:
+                    self.emit_status_signal(f"{file_name} - 캐시된 캡션 사용")
+                    self.finish_image(image_path, self.format_caption_result(image_path, cached_text))
+                    continue
+
+                upload = self.prepare_upload(image_bytes, file_name)
+            except Exception as e:
+                self.emit_status_signal(f"이미지 처리 오류: {file_name} - {str(e)}")
+                self.finish_image(image_path, error=e)
+                continue
+
+            # base64는 원본보다 약 4/3 크며, 프롬프트 등 나머지 부분은 여유분으로 계산
+            request_bytes = len(upload['data']) * 4 // 3 + 4096
+            if requests and (len(requests) >= self.batch_max_requests
+                             or pending_bytes + request_bytes > self.batch_max_bytes):
+                self.submit_batch(requests, pending)
+                requests, pending, pending_bytes = [], {}, 0
+
+            # custom_id는 영문/숫자/-/_ 64자 이내여야 하므로 경로 대신 순번 사용
+            custom_id = f"img-{index:06d}"
+            keyword_hint = self.enrich_keyword_hint(image_path, image_hash, keyword_hint)
+            requests.append({"custom_id": custom_id, "params": self.build_caption_params(upload, keyword_hint)})
+            pending[custom_id] = (image_path, {
+                'original_bytes': upload['original_bytes'],
+                'sent_bytes': upload['sent_bytes'],
+                'media_type': upload['media_type'],
+            })
+            pending_bytes += request_bytes
+
+        if requests and not self.stopped:
+            self.submit_batch(requests, pending)
+        elif pending:
+            for image_path, _ in pending.values():
+                self.finish_image(image_path, error="작업 취소로 제출하지 않음")
+
+    def submit_batch(self, requests, pending):
+        """배치 하나 제출"""
+        self.emit_status_signal(f"배치 제출 중... ({len(requests)}개 요청)")
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+        except Exception as e:
+            self.emit_status_signal(f"배치 제출 실패: {str(e)}")
+            for image_path, _ in pending.values():
+                self.finish_image(image_path, error=e)
+            return
+        self.batches[batch.id] = pending
+        print(f"배치 제출 완료: {batch.id} ({len(requests)}개 요청)")
+        self.emit_status_signal(f"배치 제출 완료: {batch.id} ({len(requests)}개 요청)")
+
+    # ------------------------------------------------------------------
+    # 결과 수집
+    # ------------------------------------------------------------------
+    def collect_batches(self):
+        """모든 배치가 끝날 때까지 상태를 확인하고, 끝난 배치의 결과를 기록"""
+        while self.batches:
+            if self.stopped and not self.cancel_requested:
+                self.cancel_batches()
+
+            for batch_id in list(self.batches):
+                try:
+                    batch = self.client.messages.batches.retrieve(batch_id)
+                except Exception as e:
+                    failures = self.retrieve_failures.get(batch_id, 0) + 1
+                    self.retrieve_failures[batch_id] = failures
+                    self.emit_status_signal(
+                        f"배치 상태 확인 실패: {batch_id} - {str(e)} ({failures}/{self.max_retrieve_failures})")
+                    # 인증 오류/삭제된 배치 등은 다시 시도해도 같으므로 바로, 그 외는 연속 실패 한도에서 포기
+                    if self.is_permanent_error(e) or failures >= self.max_retrieve_failures:
+                        self.abandon_batch(batch_id, e)
+                    continue
+                self.retrieve_failures.pop(batch_id, None)
+
+                counts = batch.request_counts
+                self.emit_status_signal(
+                    f"배치 {batch_id}: {batch.processing_status} "
+                    f"(진행 중 {counts.processing}, 성공 {counts.succeeded}, 실패 {counts.errored})")
+                if batch.processing_status == "ended":
+                    self.read_batch_results(batch_id)
+
+            if self.batches:
+                self.wait_for_poll()
+
+    @staticmethod
+    def is_permanent_error(error):
+        """다시 시도해도 결과가 같은 응답인지 확인 (401/403/404 등, 408/409/429 제외)"""
+        if not isinstance(error, APIStatusError):
+            return False
+        return 400 <= error.status_code < 500 and error.status_code not in (408, 409, 429)
+
+    def abandon_batch(self, batch_id, error):
+        """상태를 확인할 수 없는 배치 - 더 기다리지 않고 포함된 이미지를 실패 처리"""
+        pending = self.batches.pop(batch_id, {})
+        self.retrieve_failures.pop(batch_id, None)
+        self.emit_status_signal(f"배치 {batch_id}의 상태를 확인할 수 없어 {len(pending)}개 이미지를 실패 처리합니다.")
+        for image_path, _ in pending.values():
+            self.finish_image(image_path, error=f"배치 상태 확인 실패: {error}")
+
+    def read_batch_results(self, batch_id):
+        """끝난 배치의 결과를 스트리밍으로 읽어 기록"""
+        pending = self.batches.pop(batch_id)
+        try:
+            for entry in self.client.messages.batches.results(batch_id):
+                target = pending.pop(entry.custom_id, None)
+                if target is None:
+                    continue
+                image_path, upload = target
+                self.handle_batch_entry(image_path, upload, entry.result)
+
+                # 요청이 뜸할 때도 flush_interval마다 기록
+                if self.jsonl_writer:
+                    self.jsonl_writer.flush_if_due()
+        except Exception as e:
+            self.emit_status_signal(f"배치 결과 읽기 실패: {batch_id} - {str(e)}")
+            traceback.print_exc()
+
+        # 결과에 없는 요청은 실패로 처리
+        for image_path, _ in pending.values():
+            self.finish_image(image_path, error="배치 결과 없음")
+
+    def handle_batch_entry(self, image_path, upload, entry_result):
+        """배치 결과 한 건을 실시간 요청과 같은 형식의 결과로 변환"""
+        file_name = os.path.basename(image_path)
+        if entry_result.type != "succeeded":
+            error = getattr(entry_result, 'error', None) or entry_result.type
+            self.emit_status_signal(f"{file_name} - 배치 요청 실패: {error}")
+            self.finish_image(image_path, error=f"{entry_result.type}: {error}")
+            return
+
+        self.record_usage(getattr(entry_result.message, 'usage', None), file_name)
+        response_json = self.parse_caption_message(entry_result.message, file_name)
+        text_content = self.normalize_caption(response_json, file_name) if response_json else None
+        if text_content is None:
+            self.finish_image(image_path, error="응답이 없거나 처리할 수 없는 형식")
+            return
+
+        # 파일 이름으로 고른 키워드 후보는 실행 중 바뀌지 않으므로 제출할 때와 같은 캐시 키가 됨
+        cache_prompt = self.cache_prompt(CAPTION_PROMPT, self.build_keyword_hint(image_path))
+        self.store_cached_caption(self.image_hashes.get(image_path), text_content, cache_prompt)
+        self.finish_image(image_path, self.format_caption_result(image_path, text_content, upload))
+
+    def finish_image(self, image_path, result=None, error=None):
+        """결과 기록 또는 실패 처리 후 진행 상황 업데이트"""
+        if result is not None:
+            self.processed_count += self.record_result(image_path, result)
+        else:
+            self.emit_status_signal(f"처리 실패: {os.path.basename(image_path)} ({error})")
+            self.mark_manifest_failed(image_path, error)
+        self.progress.emit(self.processed_count, self.total_images)
+
+    def cancel_batches(self):
+        """진행 중인 배치 취소 요청 - 이미 끝난 요청의 결과는 계속 수집"""
+        self.cancel_requested = True
+        for batch_id in list(self.batches):
+            try:
+                self.client.messages.batches.cancel(batch_id)
+                self.emit_status_signal(f"배치 취소 요청: {batch_id} (완료된 결과는 계속 받습니다)")
+            except Exception as e:
+                self.emit_status_signal(f"배치 취소 실패: {batch_id} - {str(e)}")
+
+    def wait_for_poll(self):
+        """다음 상태 확인까지 대기 (취소 요청에 바로 반응하도록 나눠서 대기)"""
+        deadline = time.monotonic() + self.poll_interval
+        while time.monotonic() < deadline:
+            if self.stopped and not self.cancel_requested:
+                return
+            if self.jsonl_writer:
+                self.jsonl_writer.flush_if_due()
+            QThread.msleep(200)
@@ -4,14 +4,121 @@ import time
 import json
 import traceback
 import re
+import threading
 import base64
 from pathlib import Path
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from PyQt5.QtCore import QThread, pyqtSignal, QSettings
 from PyQt5.QtWidgets import QFileDialog
-from anthropic import Anthropic
+from anthropic import Anthropic, APIStatusError, APITimeoutError
 from queue import Queue, Empty
 from PyQt5.QtWidgets import QApplication
+from cfg.cfg import default_max_concurrent_requests, default_caption_cache_enabled, default_caption_cache_max_mb, \
+    default_caption_cache_max_age_days, default_upload_max_edge, default_upload_quality, default_upload_format, \
+    default_upload_target_kb, \
+    default_jsonl_flush_every, default_jsonl_flush_interval, default_jsonl_fsync, default_images_per_request, \
+    default_stream_responses, default_structured_output, default_dedup_enabled, default_dedup_threshold, \
+    default_keyword_extraction, default_prompt_keywords_enabled, default_prompt_keywords_top_k
+from utils.rate_limiter import AdaptiveRateLimiter
+from utils.caption_cache import CaptionCache, compute_bytes_hash
+from utils.jsonl_writer import JsonlWriter
+from utils.run_manifest import RunManifest
+from utils.json_scanner import JsonObjectScanner, find_json_object, find_json_array
+from utils.image_encoder import prepare_image_for_upload, sniff_image_format, API_MEDIA_TYPES
+from utils.perceptual_hash import compute_hashes, group_near_duplicates
+from utils.keyword_matcher import get_keyword_matcher
+from utils.keyword_index import get_keyword_index, filename_terms
+
+# 캡션 요청에 사용하는 모델과 고정 프롬프트 (캐시 키에도 사용됨)
+CAPTION_MODEL = "claude-3-7-sonnet-20250219"
+CAPTION_PROMPT = """이미지를 분석하여 다음 형식으로 응답해주세요:
+{
+  "text": {
+    "english_caption": "영어로 된 이미지 상세 설명 (3문장). 사람이 있다면 성별, 나이대, 외모 특징, 의상, 표정 등을 포함하여 묘사해주세요.",
+    "korean_caption": "한글로 된 이미지 상세 설명 (3문장). 사람이 있다면 성별, 나이대, 외모 특징, 의상, 표정 등을 포함하여 묘사해주세요."
+  }
+}
+
+주의사항:
+1. 사람이 있는 경우 반드시 성별을 명시해주세요 (예: 남성, 여성, 남자, 여자)
+2. 나이대도 가능한 경우 포함해주세요 (예: 20대 초반, 30대 중반, 40대 후반 등)
+3. 외모 특징, 의상, 표정 등도 상세히 묘사해주세요
+4. 사람이 없는 경우에는 이미지의 주요 요소와 분위기를 상세히 묘사해주세요
+5. 응답은 반드시 위의 JSON 형식을 지켜주세요"""
+
+# 스트리밍 중인 응답에서 마지막 캡션 값(닫히지 않은 문자열 포함)을 찾는 패턴
+PARTIAL_CAPTION_PATTERN = re.compile(r'"(english_caption|korean_caption)"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+# 이미지와 함께 보내는 짧은 요청 문구 (고정 지침은 system에 두어 이미지마다 달라지는 내용과 분리)
+CAPTION_REQUEST_TEXT = "지침에 따라 이미지를 분석하여 JSON으로 응답해주세요."
+
+# 이미지별 어휘 키워드 후보 (system이 아닌 이미지 옆 텍스트에 넣어 system 접두부를 모든 요청에서 같게 유지)
+CAPTION_KEYWORD_HINT = "참고 어휘: {keywords}\n이미지에 실제로 보이는 내용과 맞는 경우에만 위 어휘의 표현을 캡션에 사용해주세요."
+
+# 캡션을 정해진 스키마로 받기 위한 도구 정의 (tool_choice로 반드시 이 도구를 호출하게 함)
+CAPTION_FIELD_SCHEMA = {
+    "english_caption": {
+        "type": "string",
+        "description": "영어로 된 이미지 상세 설명 (3문장)"
+    },
+    "korean_caption": {
+        "type": "string",
+        "description": "한글로 된 이미지 상세 설명 (3문장)"
+    }
+}
+
+CAPTION_TOOL = {
+    "name": "record_caption",
+    "description": "분석한 이미지의 영어/한글 캡션을 기록합니다.",
+    "input_schema": {
+        "type": "object",
+        "properties": CAPTION_FIELD_SCHEMA,
+        "required": ["english_caption", "korean_caption"]
+    }
+}
+
+CAPTION_MULTI_TOOL = {
+    "name": "record_captions",
+    "description": "분석한 이미지들의 영어/한글 캡션을 이미지 id별로 기록합니다.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "captions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": dict({"id": {"type": "string", "description": "이미지 앞에 주어진 id (예: img1)"}},
+                                       **CAPTION_FIELD_SCHEMA),
+                    "required": ["id", "english_caption", "korean_caption"]
+                }
+            }
+        },
+        "required": ["captions"]
+    }
+}
+
+# 여러 이미지를 한 요청에 담을 때의 프롬프트 - 각 이미지 앞에 "이미지 id: imgN" 텍스트가 붙음
+CAPTION_MULTI_PROMPT = """여러 장의 이미지를 각각 분석하여 다음 형식의 JSON 배열로 응답해주세요.
+각 이미지 바로 앞에 "이미지 id: img1" 형식으로 id가 주어지며, 배열에는 이미지마다 같은 id의 항목을 하나씩 넣어주세요:
+[
+  {
+    "id": "img1",
+    "text": {
+      "english_caption": "영어로 된 이미지 상세 설명 (3문장). 사람이 있다면 성별, 나이대, 외모 특징, 의상, 표정 등을 포함하여 묘사해주세요.",
+      "korean_caption": "한글로 된 이미지 상세 설명 (3문장). 사람이 있다면 성별, 나이대, 외모 특징, 의상, 표정 등을 포함하여 묘사해주세요."
+    }
+  }
+]
+
+주의사항:
+1. 사람이 있는 경우 반드시 성별을 명시해주세요 (예: 남성, 여성, 남자, 여자)
+2. 나이대도 가능한 경우 포함해주세요 (예: 20대 초반, 30대 중반, 40대 후반 등)
+3. 외모 특징, 의상, 표정 등도 상세히 묘사해주세요
+4. 사람이 없는 경우에는 이미지의 주요 요소와 분위기를 상세히 묘사해주세요
+5. 각 이미지는 서로 독립적으로 설명하고, 다른 이미지의 내용을 섞지 마세요
+6. 응답은 반드시 위의 JSON 배열 형식을 지키고, 모든 이미지의 항목을 빠짐없이 포함해주세요"""
 
 class WorkerThreadChatCompletion(QThread):
     # WorkerThread와 동일한 시그널 정의
@@ -27,8 +134,11 @@ class WorkerThreadChatCompletion(QThread):
     status_signal = pyqtSignal(str)
     increment_progress_signal = pyqtSignal()
     completed_signal = pyqtSignal(str)
+    rate_signal = pyqtSignal(float, int)  # 현재 요청 속도(req/s), 동시 요청 한도
+    partial_caption_signal = pyqtSignal(str, str)  # 파일 이름, 스트리밍 중인 캡션 일부
 
-    def __init__(self, queue=None, settings_handler=None, image_processor=None, image_paths=None, api_key=None):
+    def __init__(self, queue=None, settings_handler=None, image_processor=None, image_paths=None, api_key=None,
+                 max_concurrency=None, resume_manifest=None):
         super().__init__()
         # WorkerThread와 동일한 초기화 로직
         self.queue = queue if queue is not None else Queue()
@@ -40,6 +150,10 @@ class WorkerThreadChatCompletion(QThread):
         self.client = None
         self.api_key = api_key
         self.jsonl_file_path = None
+        self.jsonl_writer = None
+        self.manifest = resume_manifest  # 이어서 처리하는 경우 기존 매니페스트
+        self.is_resume = resume_manifest is not None
+        self.image_hashes = {}  # image_path -> 내용 해시 (매니페스트 기록용)
         self.responses = []
         self.is_running = True
 
@@ -50,6 +164,75 @@ class WorkerThreadChatCompletion(QThread):
             if save_dir and os.path.exists(save_dir):
                 self.last_save_directory = save_dir
 
+        # 동시에 진행할 캡션 요청 수 (1이면 기존과 같은 순차 처리)
+        if max_concurrency is None:
+            max_concurrency = self.get_setting('max_concurrent_requests', default_max_concurrent_requests)
+        try:
+            self.max_concurrency = max(1, int(max_concurrency or default_max_concurrent_requests))
+        except (TypeError, ValueError):
+            self.max_concurrency = default_max_concurrent_requests
+
+        # 한 요청에 담을 이미지 수 (1이면 이미지마다 개별 요청)
+        try:
+            self.images_per_request = max(1, int(self.get_setting('images_per_request', default_images_per_request)))
+        except (TypeError, ValueError):
+            self.images_per_request = default_images_per_request
+
+        # 캡션을 도구 호출(스키마 지정)로 받을지 여부 - 끄면 텍스트 응답에서 JSON을 찾음
+        self.structured_output = bool(self.get_setting('structured_output', default_structured_output))
+
+        # 응답을 스트리밍으로 받아 JSON이 완성되는 즉시 끊을지 여부
+        self.stream_responses = bool(self.get_setting('stream_responses', default_stream_responses))
+        self.partial_emitted_at = {}  # 파일 이름 -> 마지막으로 캡션 일부를 보낸 시각
+
+        # 유사 이미지 묶기 - 그룹마다 대표 이미지만 요청하고 결과를 나머지에 복사
+        self.dedup_enabled = bool(self.get_setting('dedup_enabled', default_dedup_enabled))
+        try:
+            self.dedup_threshold = max(0, int(self.get_setting('dedup_threshold', default_dedup_threshold)))
+        except (TypeError, ValueError):
+            self.dedup_threshold = default_dedup_threshold
+        self.duplicate_members = {}  # 대표 image_path -> 같은 그룹의 나머지 image_path 목록
+        self.duplicate_group_ids = {}  # 대표 image_path -> 그룹 ID
+
+        # 어휘 키워드 추출 - 캡션에서 로컬로 찾아 keywords 필드로 기록 (run에서 매처 준비)
+        self.keyword_extraction = bool(self.get_setting('keyword_extraction', default_keyword_extraction))
+        self.keyword_matcher = None
+        
+        # 프롬프트 키워드 후보 - 어휘 전체 대신 이미지와 관련 있는 키워드 top-k만 요청에 포함
+        self.prompt_keywords_enabled = bool(self.get_setting('prompt_keywords_enabled',
+                                                             default_prompt_keywords_enabled))
+        try:
+            self.prompt_keywords_top_k = max(1, int(self.get_setting('prompt_keywords_top_k',
+                                                                     default_prompt_keywords_top_k)))
+        except (TypeError, ValueError):
+            self.prompt_keywords_top_k = default_prompt_keywords_top_k
+        self.keyword_index = None
+
+        # 작업 전체의 토큰 사용량 (프롬프트 캐시 읽기/쓰기 포함)
+        self.usage_lock = threading.Lock()
+        self.usage_totals = {
+            'requests': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_creation_input_tokens': 0,
+            'cache_read_input_tokens': 0,
+        }
+
+        # 모든 요청이 공유하는 속도 제어기
+        self.rate_limiter = AdaptiveRateLimiter(self.max_concurrency)
+
+        # 동일 이미지 재요청을 막기 위한 캡션 캐시
+        self.caption_cache = None
+        if self.get_setting('caption_cache_enabled', default_caption_cache_enabled):
+            try:
+                self.caption_cache = CaptionCache(
+                    max_bytes=int(self.get_setting('caption_cache_max_mb', default_caption_cache_max_mb)) * 1024 * 1024,
+                    max_age_days=float(self.get_setting('caption_cache_max_age_days', default_caption_cache_max_age_days))
+                )
+            except Exception as e:
+                print(f"캡션 캐시 초기화 오류: {e}")
+                self.caption_cache = None
+
         # image_paths가 있으면 큐에 추가
         if image_paths:
             for image_path in image_paths:
@@ -58,6 +241,12 @@ class WorkerThreadChatCompletion(QThread):
         # API 키 로드
         self.load_api_settings()
 
+    def get_setting(self, key, default=None):
+        """settings_handler가 있으면 설정값, 없으면 기본값 반환"""
+        if self.settings_handler:
+            return self.settings_handler.get_setting(key, default)
+        return default
+
     def load_api_settings(self):
         """API 키와 Anthropic 클라이언트 초기화"""
         try:
@@ -69,16 +258,345 @@ class WorkerThreadChatCompletion(QThread):
                 self.error_signal.emit("설정 오류", "API 키가 설정되지 않았습니다.")
                 return False
             
-            # Anthropic 클라이언트 초기화
-            self.client = Anthropic(api_key=self.api_key)
+            # Anthropic 클라이언트 초기화 (재시도는 SDK 대신 속도 제어기가 담당)
+            client_options = {'api_key': self.api_key, 'max_retries': 0}
+            base_url = self.get_setting('api_base_url')
+            if base_url:
+                # 테스트용 대체 서버 등 다른 엔드포인트 사용
+                client_options['base_url'] = base_url
+            self.client = Anthropic(**client_options)
             print("Anthropic 클라이언트 초기화 완료")
             return True
         except Exception as e:
             self.error_signal.emit("API 설정 오류", str(e))
             return False
 
-    def request_extract_keyword(self, image_path):
-        """Claude API를 사용한 이미지 분석 요청"""
+    def create_message(self, label=None, **params):
+        """속도 제어기를 거쳐 messages.create 호출 - 응답 헤더와 429/529를 제어기에 반영"""
+        def send():
+            raw_response = self.client.messages.with_raw_response.create(**params)
+            self.rate_limiter.on_success(raw_response.headers)
+            response = raw_response.parse()
+            self.record_usage(getattr(response, 'usage', None), label)
+            return response
+        return self.call_with_rate_limit(send)
+
+    def stream_message(self, label=None, **params):
+        """스트리밍으로 요청하고 첫 JSON 객체(또는 도구 호출 입력)가 닫히는 즉시 스트림을 끊음
+
+        Returns:
+            (지금까지 받은 텍스트, 파싱된 JSON 객체 또는 None) - 도구 호출 입력은 {"text": 입력}으로 반환
+        """
+        def send():
+            stream = self.client.messages.create(stream=True, **params)
+            self.rate_limiter.on_success(stream.response.headers)
+            scanner = JsonObjectScanner()  # 텍스트 응답
+            tool_scanner = None  # 도구 호출 입력 (구조화된 응답)
+            usage = {}
+            try:
+                for event in stream:
+                    if event.type == 'message_start':
+                        usage.update(self.usage_counts(event.message.usage))
+                    elif event.type == 'content_block_start' and event.content_block.type == 'tool_use':
+                        tool_scanner = JsonObjectScanner()
+                    elif event.type == 'content_block_delta':
+                        if event.delta.type == 'input_json_delta' and tool_scanner is not None:
+                            current = tool_scanner
+                            current.feed(event.delta.partial_json)
+                        elif event.delta.type == 'text_delta':
+                            current = scanner
+                            current.feed(event.delta.text)
+                        else:
+                            continue
+                        self.emit_partial_caption(label, current)
+                        if current.done:
+                            # JSON이 완성되면 뒤따르는 설명 문장은 기다리지 않음
+                            break
+                    elif event.type == 'message_delta' and event.usage:
+                        usage['output_tokens'] = event.usage.output_tokens or 0
+            finally:
+                stream.close()
+            self.record_usage(SimpleNamespace(**usage) if usage else None, label)
+            if tool_scanner is not None and tool_scanner.done:
+                return tool_scanner.text, {"text": tool_scanner.result}
+            # 스트림이 끝날 때까지 닫히지 않은 '{'가 있으면 그 뒤에서 다시 찾음
+            return scanner.text, scanner.finish()
+        return self.call_with_rate_limit(send)
+
+    def call_with_rate_limit(self, send):
+        """요청 슬롯을 얻은 뒤 send() 실행 - 429/529는 속도 제어기에 반영"""
+        if not self.rate_limiter.acquire(lambda: self.stopped):
+            raise RuntimeError("작업이 취소되어 요청을 보내지 않았습니다.")
+        try:
+            return send()
+        except APIStatusError as e:
+            if self.is_throttle_error(e):
+                wait_time = self.rate_limiter.on_throttle(e.response.headers)
+                self.status_signal.emit(f"요청 한도 도달 ({e.status_code}) - {wait_time:.1f}초 동안 새 요청을 보류합니다.")
+            raise
+        finally:
+            self.rate_limiter.release()
+            self.emit_rate_signal()
+
+    def usage_counts(self, usage):
+        """usage 객체에서 합계에 더할 토큰 수만 추출"""
+        return {key: getattr(usage, key, None) or 0 for key in self.usage_totals if key != 'requests'}
+
+    def record_usage(self, usage, label=None):
+        """응답의 토큰 사용량(프롬프트 캐시 읽기/쓰기 포함)을 로그에 남기고 작업 합계에 더함"""
+        if usage is None:
+            return
+        counts = self.usage_counts(usage)
+        with self.usage_lock:
+            for key, value in counts.items():
+                self.usage_totals[key] += value
+            self.usage_totals['requests'] += 1
+        prefix = f"{label} - " if label else ""
+        self.status_signal.emit(
+            f"{prefix}토큰: 입력 {counts['input_tokens']}, 캐시 읽기 {counts['cache_read_input_tokens']}, "
+            f"캐시 쓰기 {counts['cache_creation_input_tokens']}, 출력 {counts['output_tokens']}")
+
+    def emit_usage_summary(self):
+        """작업 전체의 토큰 사용량 요약"""
+        totals = dict(self.usage_totals)
+        if not totals['requests']:
+            return
+        self.emit_status_signal(
+            f"토큰 사용량 ({totals['requests']}건): 입력 {totals['input_tokens']}, "
+            f"캐시 읽기 {totals['cache_read_input_tokens']}, 캐시 쓰기 {totals['cache_creation_input_tokens']}, "
+            f"출력 {totals['output_tokens']}")
+        if not totals['cache_read_input_tokens'] and not totals['cache_creation_input_tokens']:
+            # 최소 캐시 길이(Sonnet 1024 토큰, Haiku 2048 토큰)보다 짧은 접두부는 캐시되지 않음 - 현재 지침이 이 경우
+            self.emit_status_signal("프롬프트 캐시가 사용되지 않았습니다 (고정 지침이 모델의 최소 캐시 길이보다 짧음).")
+
+    def emit_partial_caption(self, label, scanner):
+        """스트리밍 중인 캡션 일부를 진행 상황 다이얼로그로 전송 (이미지마다 최대 0.25초에 한 번)"""
+        now = time.monotonic()
+        final = scanner.done
+        if not final and now - self.partial_emitted_at.get(label, 0.0) < 0.25:
+            return
+        self.partial_emitted_at[label] = now
+        # 받은 텍스트 전체는 보낼 때만 합침 (조각마다 합치면 응답 길이의 제곱 시간)
+        matches = PARTIAL_CAPTION_PATTERN.findall(scanner.text)
+        if matches:
+            self.partial_caption_signal.emit(label or "", matches[-1][1])
+        if final:
+            self.partial_emitted_at.pop(label, None)
+
+    @staticmethod
+    def is_throttle_error(error):
+        """요청 한도 초과(429) 또는 서버 과부하(529) 응답인지 확인"""
+        return isinstance(error, APIStatusError) and error.status_code in (429, 529)
+
+    @staticmethod
+    def is_timeout_error(error):
+        """SDK 요청 타임아웃(APITimeoutError) 또는 408 응답인지 확인 - SDK 재시도를 끈 상태라 직접 백오프"""
+        if isinstance(error, APITimeoutError):
+            return True
+        return isinstance(error, APIStatusError) and error.status_code == 408
+
+    def emit_rate_signal(self):
+        """현재 요청 속도를 진행 상황 다이얼로그로 전송"""
+        try:
+            state = self.rate_limiter.snapshot()
+            self.rate_signal.emit(state['rate'], state['concurrency_limit'])
+        except Exception as e:
+            print(f"속도 정보 전송 오류: {e}")
+
+    def prepare_upload(self, image_bytes, file_name):
+        """설정된 최대 변 길이/품질로 업로드할 이미지를 준비 (실패 시 원본 그대로 사용)"""
+        size_mb = len(image_bytes) / (1024 * 1024)
+        self.status_signal.emit(f"{file_name} - 파일 크기: {size_mb:.2f} MB")
+        
+        upload = None
+        try:
+            upload = prepare_image_for_upload(
+                image_bytes,
+                max_edge=int(self.get_setting('upload_max_edge', default_upload_max_edge)),
+                quality=int(self.get_setting('upload_quality', default_upload_quality)),
+                image_format=self.get_setting('upload_format', default_upload_format),
+                target_bytes=int(self.get_setting('upload_target_kb', default_upload_target_kb)) * 1024
+            )
+        except Exception as e:
+            print(f"이미지 축소/재압축 오류: {e}")
+        
+        if upload is None:
+            # 변환할 수 없는 경우 API가 받는 포맷이면 원본을 올바른 media_type으로 전송
+            source_format = sniff_image_format(image_bytes[:32])
+            if source_format not in API_MEDIA_TYPES:
+                # 어차피 거절될 요청이므로 재시도 없이 실패 처리
+                raise ValueError(f"지원하지 않는 이미지 형식입니다: {source_format or '알 수 없음'} "
+                                 f"(이 형식을 읽을 수 있는 Qt 이미지 플러그인이 필요합니다)")
+            self.status_signal.emit(f"{file_name} - 이미지를 변환할 수 없어 원본을 전송합니다.")
+            return {
+                'data': image_bytes,
+                'media_type': API_MEDIA_TYPES[source_format],
+                'original_bytes': len(image_bytes),
+                'sent_bytes': len(image_bytes),
+            }
+        
+        if upload['source_format'] not in API_MEDIA_TYPES:
+            self.status_signal.emit(f"{file_name} - {upload['source_format']} 형식을 {upload['media_type']}로 변환하여 전송합니다.")
+        
+        if upload['sent_bytes'] != upload['original_bytes']:
+            self.status_signal.emit(
+                f"{file_name} - 업로드 크기 {upload['original_bytes'] / 1024:.0f} KB → "
+                f"{upload['sent_bytes'] / 1024:.0f} KB ({upload['width']}x{upload['height']})")
+        return upload
+
+    @staticmethod
+    def build_system_prompt(prompt):
+        """고정 지침을 system에 두고 프롬프트 캐시 지점으로 표시
+
+        현재 지침(도구 정의 포함)은 Sonnet의 최소 캐시 길이(1024 토큰)보다 짧아 캐시되지 않으며
+        비용/첫 응답 시간에는 영향이 없습니다. 표시 자체는 비용이 들지 않으므로 남겨 두어,
+        지침이 최소 길이를 넘으면 별도 변경 없이 캐시됩니다.
+        """
+        return [
+            {
+                "type": "text",
+                "text": prompt,
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+
+    def build_caption_params(self, upload, keyword_hint=None):
+        """캡션 요청 파라미터 (실시간 요청과 배치 요청이 같은 프롬프트를 사용)"""
+        params = {
+            "model": CAPTION_MODEL,
+            "max_tokens": 4096,
+            "system": self.build_system_prompt(CAPTION_PROMPT),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": upload['media_type'],
+                                "data": base64.b64encode(upload['data']).decode('utf-8')
+                            }
+                        },
+                        {
+                            "type": "text",
+                            "text": f"{CAPTION_REQUEST_TEXT}\n{keyword_hint}" if keyword_hint else CAPTION_REQUEST_TEXT
+                        }
+                    ]
+                }
+            ]
+        }
+        if self.structured_output:
+            params.update(self.build_tool_params(CAPTION_TOOL))
+        return params
+
+    @staticmethod
+    def build_tool_params(tool):
+        """스키마가 정해진 도구를 반드시 호출하도록 하는 파라미터"""
+        return {
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": tool["name"]}
+        }
+
+    def parse_caption_message(self, message, file_name):
+        """응답 메시지에서 캡션 JSON 추출 - 도구 호출 입력은 그대로 사용하고, 텍스트 응답만 JSON을 찾음"""
+        for block in message.content:
+            if block.type == "tool_use" and isinstance(block.input, dict):
+                self.status_signal.emit(f"{file_name} - 구조화된 응답 수신")
+                return {"text": block.input}
+        response_text = ''.join(block.text for block in message.content if block.type == "text")
+        return self.extract_json_from_text(response_text, file_name)
+
+    def normalize_caption(self, response_json, file_name):
+        """응답 JSON 검증 후 캡션을 3문장으로 정리 (필수 필드가 없으면 None)"""
+        # 응답 검증
+        text = response_json.get("text") if isinstance(response_json, dict) else None
+        if not isinstance(text, dict) or \
+           not text.get("english_caption") or \
+           not text.get("korean_caption"):
+            self.status_signal.emit(f"{file_name} - 필수 필드가 누락됨")
+            print(f"Missing required fields in response: {response_json}")
+            return None
+        
+        print(f"{file_name} - 응답 검증 완료")
+        
+        # 캡션 내용 가져오기
+        text_content = {
+            "english_caption": response_json["text"]["english_caption"].strip(),
+            "korean_caption": response_json["text"]["korean_caption"].strip()
+        }
+        
+        # 문장 수 검증 함수
+        def count_sentences(text):
+            # 영어 문장 구분: .!? 뒤에 공백이나 문장 끝
+            if any(ord(c) < 128 for c in text):  # 영어 텍스트
+                sentences = [s.strip() for s in re.split(r'[.!?](?=\s|$)', text) if s.strip()]
+            # 한글 문장 구분: .!?。！？ 뒤에 공백이나 문장 끝
+            else:  # 한글 텍스트
+                sentences = [s.strip() for s in re.split(r'[.!?。！？](?=\s|$)', text) if s.strip()]
+            return sentences
+        
+        print(f"{file_name} - 문장 수 검증 시작")
+        # 캡션 문장 수 검증 및 처리
+        eng_sentences = count_sentences(text_content["english_caption"])
+        kor_sentences = count_sentences(text_content["korean_caption"])
+        
+        if len(eng_sentences) > 3:
+            text_content["english_caption"] = '. '.join(eng_sentences[:3]) + '.'
+            print(f"English caption truncated to 3 sentences")
+            self.status_signal.emit(f"{file_name} - 영어 캡션 3문장으로 조정")
+        
+        if len(kor_sentences) > 3:
+            text_content["korean_caption"] = '. '.join(kor_sentences[:3]) + '.'
+            print(f"Korean caption truncated to 3 sentences")
+            self.status_signal.emit(f"{file_name} - 한글 캡션 3문장으로 조정")
+        
+        # 문장 수가 3개 미만인 경우 로그 출력
+        if len(eng_sentences) < 3 or len(kor_sentences) < 3:
+            print(f"Warning: Caption has fewer than 3 sentences. English: {len(eng_sentences)}, Korean: {len(kor_sentences)}")
+            self.status_signal.emit(f"{file_name} - 경고: 캡션이 3문장 미만입니다")
+        
+        print(f"{file_name} - 문장 수 검증 완료")
+        return text_content
+
+    def format_caption_result(self, image_path, text_content, upload=None):
+        """JSONL에 기록할 결과 객체"""
+        result = {
+            "content": os.path.basename(image_path),
+            "image_path": image_path.replace("\\", "/"),
+            "text": text_content
+        }
+        if upload:
+            result["upload"] = {
+                "original_bytes": upload['original_bytes'],
+                "sent_bytes": upload['sent_bytes'],
+                "media_type": upload['media_type']
+            }
+        return result
+
+    def load_cached_caption(self, image_hash, *prompts):
+        """캐시된 캡션 (캐시를 사용하지 않거나 없으면 None)
+
+        prompts는 실제로 보낸 프롬프트이며(기본값 CAPTION_PROMPT), 여러 개면 순서대로 확인하되 한 번의 조회로 셉니다.
+        """
+        if not self.caption_cache:
+            return None
+        return self.caption_cache.get_first(image_hash, prompts or (CAPTION_PROMPT,), CAPTION_MODEL)
+
+    @staticmethod
+    def cache_prompt(prompt, keyword_hint=None):
+        """캐시 키에 쓰는 프롬프트 - 키워드 후보 문구가 있으면 포함 (어휘나 후보 수 설정이 바뀌면 다른 키)"""
+        return f"{prompt}\n{keyword_hint}" if keyword_hint else prompt
+
+    def store_cached_caption(self, image_hash, text_content, prompt=CAPTION_PROMPT):
+        if self.caption_cache:
+            try:
+                self.caption_cache.put(image_hash, prompt, CAPTION_MODEL, text_content)
+            except Exception as cache_error:
+                print(f"캡션 캐시 저장 오류: {cache_error}")
+
+    def request_extract_keyword(self, image_path, check_cache=True):
+        """Claude API를 사용한 이미지 분석 요청 (check_cache: 묶음 요청에서 이미 캐시를 확인했으면 False)"""
         max_retries = 3
         retry_delay = 2
         
@@ -86,142 +604,64 @@ class WorkerThreadChatCompletion(QThread):
         self.status_signal.emit(f"처리 시작: {file_name}")
         print(f"\n=== Processing Image: {file_name} ===")
         
+        # 이미지 파일을 한 번만 읽어 캐시 키(내용 해시)를 계산
+        with open(image_path, "rb") as image_file:
+            image_bytes = image_file.read()
+        image_hash = compute_bytes_hash(image_bytes)
+        self.image_hashes[image_path] = image_hash
+        
+        # 캐시 확인 - 같은 이미지/프롬프트(키워드 후보 포함)/모델로 받은 결과가 있으면 API 호출 생략
+        keyword_hint = self.build_keyword_hint(image_path)
+        cache_prompt = self.cache_prompt(CAPTION_PROMPT, keyword_hint)
+        cached_text = self.load_cached_caption(image_hash, cache_prompt) if check_cache else None
+        if cached_text:
+            self.status_signal.emit(f"{file_name} - 캐시된 캡션 사용")
+            return self.format_caption_result(image_path, cached_text)
+        
+        # 업로드용 이미지 준비 (모델 해상도로 축소 후 재압축)
+        upload = self.prepare_upload(image_bytes, file_name)
+        keyword_hint = self.enrich_keyword_hint(image_path, image_hash, keyword_hint)
+        
         for attempt in range(max_retries):
             try:
-                # 이미지 파일 크기 확인
-                file_size = os.path.getsize(image_path)
-                print(f"File size: {file_size} bytes")
-                size_mb = file_size / (1024*1024)
-                self.status_signal.emit(f"{file_name} - 파일 크기: {size_mb:.2f} MB")
-                
-                # 이미지 파일이 너무 크면 경고 로그 추가
-                if file_size > 20 * 1024 * 1024:  # 20MB 이상
-                    print(f"경고: 이미지 파일이 매우 큽니다 ({size_mb:.2f} MB). 처리 시간이 오래 걸릴 수 있습니다.")
-                    self.status_signal.emit(f"경고: {file_name}의 크기가 매우 큽니다. 처리 시간이 오래 걸릴 수 있습니다.")
-                
-                # 이미지 파일 준비 및 base64 인코딩
                 self.status_signal.emit(f"{file_name} - 이미지 인코딩 중...")
-                with open(image_path, "rb") as image_file:
-                    # 이미지 데이터를 base64로 인코딩
-                    image_data = base64.b64encode(image_file.read()).decode('utf-8')
                 
                 # Claude API 요청
                 self.status_signal.emit(f"{file_name} - 이미지 분석 요청 중...")
                 try:
                     # 이미지 분석 요청
-                    response = self.client.messages.create(
-                        model="claude-3-7-sonnet-20250219",
-                        max_tokens=4096,
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": """이미지를 분석하여 다음 형식으로 응답해주세요:
-{
-  "text": {
-    "english_caption": "영어로 된 이미지 상세 설명 (3문장). 사람이 있다면 성별, 나이대, 외모 특징, 의상, 표정 등을 포함하여 묘사해주세요.",
-    "korean_caption": "한글로 된 이미지 상세 설명 (3문장). 사람이 있다면 성별, 나이대, 외모 특징, 의상, 표정 등을 포함하여 묘사해주세요."
-  }
-}
-
-주의사항:
-1. 사람이 있는 경우 반드시 성별을 명시해주세요 (예: 남성, 여성, 남자, 여자)
-2. 나이대도 가능한 경우 포함해주세요 (예: 20대 초반, 30대 중반, 40대 후반 등)
-3. 외모 특징, 의상, 표정 등도 상세히 묘사해주세요
-4. 사람이 없는 경우에는 이미지의 주요 요소와 분위기를 상세히 묘사해주세요
-5. 응답은 반드시 위의 JSON 형식을 지켜주세요"""
-                                    },
-                                    {
-                                        "type": "image",
-                                        "source": {
-                                            "type": "base64",
-                                            "media_type": "image/jpeg",
-                                            "data": image_data
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    )
-                    
-                    print(f"Response received: {response}")
-                    self.status_signal.emit(f"{file_name} - 응답 수신 완료")
-                    
-                    # 응답에서 JSON 추출
-                    response_text = response.content[0].text
-                    response_json = self.extract_json_from_text(response_text, file_name)
+                    if self.stream_responses:
+                        response_text, response_json = self.stream_message(
+                            label=file_name, **self.build_caption_params(upload, keyword_hint))
+                        self.status_signal.emit(f"{file_name} - 응답 수신 완료")
+                        if response_json is None and not self.structured_output:
+                            response_json = self.extract_json_from_text(response_text, file_name)
+                    else:
+                        response = self.create_message(label=file_name, **self.build_caption_params(upload, keyword_hint))
+                        
+                        print(f"Response received: {response}")
+                        self.status_signal.emit(f"{file_name} - 응답 수신 완료")
+                        
+                        # 응답에서 JSON 추출 (구조화된 응답이면 도구 호출 입력을 그대로 사용)
+                        response_json = self.parse_caption_message(response, file_name)
                     
                     if response_json:
-                        try:
-                            self.status_signal.emit(f"{file_name} - 응답 데이터 처리 중...")
-                            print(f"API 응답 데이터: {response_json}")
-                            
-                            # 응답 검증
-                            if not response_json.get("text") or \
-                               not response_json["text"].get("english_caption") or \
-                               not response_json["text"].get("korean_caption"):
-                                self.status_signal.emit(f"{file_name} - 필수 필드가 누락됨")
-                                print(f"Missing required fields in response: {response_json}")
-                                continue
-                            
-                            print(f"{file_name} - 응답 검증 완료")
-                            
-                            # 캡션 내용 가져오기
-                            text_content = {
-                                "english_caption": response_json["text"]["english_caption"].strip(),
-                                "korean_caption": response_json["text"]["korean_caption"].strip()
-                            }
-                            
-                            # 문장 수 검증 함수
-                            def count_sentences(text):
-                                # 영어 문장 구분: .!? 뒤에 공백이나 문장 끝
-                                if any(ord(c) < 128 for c in text):  # 영어 텍스트
-                                    sentences = [s.strip() for s in re.split(r'[.!?](?=\s|$)', text) if s.strip()]
-                                # 한글 문장 구분: .!?。！？ 뒤에 공백이나 문장 끝
-                                else:  # 한글 텍스트
-                                    sentences = [s.strip() for s in re.split(r'[.!?。！？](?=\s|$)', text) if s.strip()]
-                                return sentences
-                            
-                            print(f"{file_name} - 문장 수 검증 시작")
-                            # 캡션 문장 수 검증 및 처리
-                            eng_sentences = count_sentences(text_content["english_caption"])
-                            kor_sentences = count_sentences(text_content["korean_caption"])
-                            
-                            if len(eng_sentences) > 3:
-                                text_content["english_caption"] = '. '.join(eng_sentences[:3]) + '.'
-                                print(f"English caption truncated to 3 sentences")
-                                self.status_signal.emit(f"{file_name} - 영어 캡션 3문장으로 조정")
-                            
-                            if len(kor_sentences) > 3:
-                                text_content["korean_caption"] = '. '.join(kor_sentences[:3]) + '.'
-                                print(f"Korean caption truncated to 3 sentences")
-                                self.status_signal.emit(f"{file_name} - 한글 캡션 3문장으로 조정")
-                            
-                            # 문장 수가 3개 미만인 경우 로그 출력
-                            if len(eng_sentences) < 3 or len(kor_sentences) < 3:
-                                print(f"Warning: Caption has fewer than 3 sentences. English: {len(eng_sentences)}, Korean: {len(kor_sentences)}")
-                                self.status_signal.emit(f"{file_name} - 경고: 캡션이 3문장 미만입니다")
-                            
-                            print(f"{file_name} - 문장 수 검증 완료")
-                            
-                            # 최종 결과 객체 생성
-                            formatted_result = {
-                                "content": os.path.basename(image_path),
-                                "image_path": image_path.replace("\\", "/"),
-                                "text": text_content
-                            }
-                            
-                            print(f"처리된 결과: {json.dumps(formatted_result, ensure_ascii=False, indent=2)}")
-                            self.status_signal.emit(f"{file_name} - 처리 완료")
-                            return formatted_result
-                            
-                        except json.JSONDecodeError as e:
-                            print(f"JSON 파싱 오류: {e}")
-                            print(f"원본 응답: {response_json}")
-                            self.status_signal.emit(f"{file_name} - JSON 파싱 오류: {e}")
+                        self.status_signal.emit(f"{file_name} - 응답 데이터 처리 중...")
+                        print(f"API 응답 데이터: {response_json}")
+                        
+                        text_content = self.normalize_caption(response_json, file_name)
+                        if text_content is None:
                             continue
+                        
+                        # 최종 결과 객체 생성
+                        formatted_result = self.format_caption_result(image_path, text_content, upload)
+                        print(f"처리된 결과: {json.dumps(formatted_result, ensure_ascii=False, indent=2)}")
+                        
+                        # 캐시에 저장
+                        self.store_cached_caption(image_hash, text_content, cache_prompt)
+                        
+                        self.status_signal.emit(f"{file_name} - 처리 완료")
+                        return formatted_result
                     
                     self.status_signal.emit(f"{file_name} - 응답이 없거나 처리할 수 없는 형식입니다")
                     return None
@@ -236,12 +676,21 @@ class WorkerThreadChatCompletion(QThread):
                 print(f"Error in request: {error_detail}")
                 self.status_signal.emit(f"{file_name} - 오류 발생: {error_detail}")
                 
-                # 과부하 에러(529) 또는 타임아웃 에러인 경우
-                if ("529" in error_detail or "overloaded" in error_detail.lower() or 
-                    "timeout" in error_detail.lower()) and attempt < max_retries - 1:
+                # 작업이 취소된 경우 재시도하지 않음
+                if self.stopped:
+                    raise
+                
+                # 429/529 응답인 경우 - 대기는 속도 제어기가 다음 acquire에서 처리
+                if self.is_throttle_error(e) and attempt < max_retries - 1:
+                    retry_msg = f"{file_name} - 요청 한도/서버 과부하 감지. 속도를 낮춰 재시도 중... (Attempt {attempt + 1}/{max_retries})"
+                    print(retry_msg)
+                    self.status_signal.emit(retry_msg)
+                    continue
+                # 타임아웃 에러인 경우
+                elif self.is_timeout_error(e) and attempt < max_retries - 1:
                     # 지수 백오프(exponential backoff) 적용
                     wait_time = retry_delay * (2 ** attempt)  # 2, 4, 8초로 증가
-                    retry_msg = f"{file_name} - 서버 과부하 감지. {wait_time}초 후 재시도 중... (Attempt {attempt + 1}/{max_retries})"
+                    retry_msg = f"{file_name} - 타임아웃 감지. {wait_time}초 후 재시도 중... (Attempt {attempt + 1}/{max_retries})"
                     print(retry_msg)
                     self.status_signal.emit(retry_msg)
                     time.sleep(wait_time)
@@ -256,171 +705,113 @@ class WorkerThreadChatCompletion(QThread):
                 self.status_signal.emit(f"{file_name} - 최대 재시도 횟수 초과. 처리 실패")
                 raise
 
-            finally:
-                try:
-                    if image_file:
-                        image_file.close()
-                        print("Image file closed")
-                except Exception as close_error:
-                    print(f"Error closing file: {close_error}")
-                    self.status_signal.emit(f"{file_name} - 파일 닫기 오류: {close_error}")
-
-    def request_extract_keyword_multiple(self, image_paths):
-        """여러 이미지를 한 번에 분석하는 요청"""
+    def request_extract_keyword_multiple(self, image_paths, looked_up=None):
+        """여러 이미지를 한 요청에 담아 분석 - 이미지별 id로 구분된 JSON 배열 응답을 이미지별 결과로 분리
+
+        looked_up: 캐시를 확인한 image_path를 추가할 집합 (개별 요청으로 다시 처리할 때 중복 조회하지 않도록)
+
+        Returns:
+            dict: image_path -> 결과 (응답에서 찾지 못한 이미지는 포함하지 않음)
+        """
         max_retries = 3
         retry_delay = 2
         
         if not image_paths:
             self.status_signal.emit("오류: 처리할 이미지가 없습니다.")
-            return None
-            
-        file_names = [os.path.basename(path) for path in image_paths]
+            return {}
+        
+        results = {}
+        packed = []  # (이미지 id, image_path, 업로드 정보)
+        keyword_hints = {}  # 이미지 id -> 어휘 키워드 후보 문구
+        cache_hints = {}  # image_path -> 캐시 키에 포함한 키워드 후보 문구
+        for image_path in image_paths:
+            file_name = os.path.basename(image_path)
+            try:
+                with open(image_path, "rb") as image_file:
+                    image_bytes = image_file.read()
+                image_hash = compute_bytes_hash(image_bytes)
+                self.image_hashes[image_path] = image_hash
+                
+                # 캐시된 이미지는 요청에서 제외 (개별 요청 결과, 없으면 이전 묶음 요청 결과)
+                keyword_hint = self.build_keyword_hint(image_path)
+                cache_hints[image_path] = keyword_hint
+                cached_text = self.load_cached_caption(image_hash, self.cache_prompt(CAPTION_PROMPT, keyword_hint),
+                                                       self.cache_prompt(CAPTION_MULTI_PROMPT, keyword_hint))
+                if looked_up is not None:
+                    looked_up.add(image_path)
+                if cached_text:
+                    self.status_signal.emit(f"{file_name} - 캐시된 캡션 사용")
+                    results[image_path] = self.format_caption_result(image_path, cached_text)
+                    continue
+                
+                self.status_signal.emit(f"{file_name} - 이미지 인코딩 중...")
+                upload = self.prepare_upload(image_bytes, file_name)
+                keyword_hint = self.enrich_keyword_hint(image_path, image_hash, keyword_hint)
+            except Exception as e:
+                # 개별 요청으로 다시 시도하면서 오류가 보고됨
+                print(f"묶음 요청 준비 오류 ({file_name}): {e}")
+                continue
+            image_id = f"img{len(packed) + 1}"
+            packed.append((image_id, image_path, upload))
+            if keyword_hint:
+                keyword_hints[image_id] = keyword_hint
+        
+        # 한 장뿐이면 묶을 필요 없음 (호출한 쪽에서 개별 요청으로 처리)
+        if len(packed) < 2:
+            return results
+        
+        file_names = [os.path.basename(image_path) for _, image_path, _ in packed]
         self.status_signal.emit(f"처리 시작: {', '.join(file_names)}")
         print(f"\n=== Processing Multiple Images: {', '.join(file_names)} ===")
         
+        content = []
+        for image_id, _, upload in packed:
+            id_text = f"이미지 id: {image_id}"
+            if image_id in keyword_hints:
+                id_text += f"\n{keyword_hints[image_id]}"
+            content.append({"type": "text", "text": id_text})
+            content.append({
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": upload['media_type'],
+                    "data": base64.b64encode(upload['data']).decode('utf-8')
+                }
+            })
+        content.append({"type": "text", "text": CAPTION_REQUEST_TEXT})
+        
         for attempt in range(max_retries):
             try:
-                # 이미지 데이터 준비
-                image_contents = []
-                for image_path in image_paths:
-                    file_name = os.path.basename(image_path)
-                    self.status_signal.emit(f"{file_name} - 이미지 인코딩 중...")
-                    
-                    with open(image_path, "rb") as image_file:
-                        # 이미지 데이터를 base64로 인코딩
-                        image_data = base64.b64encode(image_file.read()).decode('utf-8')
-                        
-                        # MIME 타입 결정
-                        mime_type = "image/jpeg"  # 기본값
-                        if image_path.lower().endswith('.png'):
-                            mime_type = "image/png"
-                        elif image_path.lower().endswith('.gif'):
-                            mime_type = "image/gif"
-                        elif image_path.lower().endswith('.webp'):
-                            mime_type = "image/webp"
-                        
-                        # data URL 형식으로 변환
-                        image_url = f"data:{mime_type};base64,{image_data}"
-                        image_contents.append({
-                            "type": "input_image",
-                            "image_url": image_url
-                        })
-                
-                # Responses API 요청
-                self.status_signal.emit(f"이미지 분석 요청 중... (총 {len(image_paths)}개)")
-                try:
-                    response = self.client.messages.create(
-                        model="claude-3-7-sonnet-20250219",
-                        max_tokens=4096,
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": "이미지들을 분석하여 다음 JSON 형식으로 응답해주세요: {\"text\": {\"english_caption\": \"영어로 된 이미지 상세 설명(3문장)\", \"korean_caption\": \"한글로 된 이미지 상세 설명(3문장)\"}}"
-                                    }
-                                ] + image_contents
-                            }
-                        ]
-                    )
-                    
-                    print(f"Response received: {response}")
-                    self.status_signal.emit("응답 수신 완료")
-                    
-                    # 응답에서 JSON 추출
-                    response_text = response.content[0].text
-                    response_json = self.extract_json_from_text(response_text, "multiple_images")
-                    
-                    if response_json:
-                        try:
-                            self.status_signal.emit("응답 데이터 처리 중...")
-                            print(f"API 응답 데이터: {response_json}")
-                            
-                            # 응답 검증
-                            if not response_json.get("text") or \
-                               not response_json["text"].get("english_caption") or \
-                               not response_json["text"].get("korean_caption"):
-                                self.status_signal.emit("필수 필드가 누락됨")
-                                print(f"Missing required fields in response: {response_json}")
-                                continue
-                            
-                            print("응답 검증 완료")
-                            
-                            # 캡션 내용 가져오기
-                            text_content = {
-                                "english_caption": response_json["text"]["english_caption"].strip(),
-                                "korean_caption": response_json["text"]["korean_caption"].strip()
-                            }
-                            
-                            # 문장 수 검증 함수
-                            def count_sentences(text):
-                                # 영어 문장 구분: .!? 뒤에 공백이나 문장 끝
-                                if any(ord(c) < 128 for c in text):  # 영어 텍스트
-                                    sentences = [s.strip() for s in re.split(r'[.!?](?=\s|$)', text) if s.strip()]
-                                # 한글 문장 구분: .!?。！？ 뒤에 공백이나 문장 끝
-                                else:  # 한글 텍스트
-                                    sentences = [s.strip() for s in re.split(r'[.!?。！？](?=\s|$)', text) if s.strip()]
-                                return sentences
-                            
-                            print("문장 수 검증 시작")
-                            # 캡션 문장 수 검증 및 처리
-                            eng_sentences = count_sentences(text_content["english_caption"])
-                            kor_sentences = count_sentences(text_content["korean_caption"])
-                            
-                            if len(eng_sentences) > 3:
-                                text_content["english_caption"] = '. '.join(eng_sentences[:3]) + '.'
-                                print("English caption truncated to 3 sentences")
-                                self.status_signal.emit("영어 캡션 3문장으로 조정")
-                            
-                            if len(kor_sentences) > 3:
-                                text_content["korean_caption"] = '. '.join(kor_sentences[:3]) + '.'
-                                print("Korean caption truncated to 3 sentences")
-                                self.status_signal.emit("한글 캡션 3문장으로 조정")
-                            
-                            # 문장 수가 3개 미만인 경우 로그 출력
-                            if len(eng_sentences) < 3 or len(kor_sentences) < 3:
-                                print(f"Warning: Caption has fewer than 3 sentences. English: {len(eng_sentences)}, Korean: {len(kor_sentences)}")
-                                self.status_signal.emit("경고: 캡션이 3문장 미만입니다")
-                            
-                            print("문장 수 검증 완료")
-                            
-                            # 각 이미지별 결과 생성
-                            results = []
-                            for image_path in image_paths:
-                                formatted_result = {
-                                    "content": os.path.basename(image_path),
-                                    "image_path": image_path.replace("\\", "/"),
-                                    "text": text_content.copy()  # 각 이미지별로 동일한 텍스트 복사
-                                }
-                                results.append(formatted_result)
-                            
-                            print(f"처리된 결과: {json.dumps(results, ensure_ascii=False, indent=2)}")
-                            self.status_signal.emit("처리 완료")
-                            return results
-                            
-                        except json.JSONDecodeError as e:
-                            print(f"JSON 파싱 오류: {e}")
-                            print(f"원본 응답: {response_json}")
-                            self.status_signal.emit(f"JSON 파싱 오류: {e}")
-                            continue
-                    
-                    self.status_signal.emit("응답이 없거나 처리할 수 없는 형식입니다")
-                    return None
-                    
-                except Exception as api_error:
-                    print(f"API 요청 오류: {api_error}")
-                    self.status_signal.emit(f"API 요청 실패: {str(api_error)}")
-                    raise
-
+                self.status_signal.emit(f"이미지 분석 요청 중... (총 {len(packed)}개)")
+                params = {
+                    "model": CAPTION_MODEL,
+                    "max_tokens": max(4096, 700 * len(packed)),  # 이미지당 캡션 2개 분량
+                    "system": self.build_system_prompt(CAPTION_MULTI_PROMPT),
+                    "messages": [{"role": "user", "content": content}]
+                }
+                if self.structured_output:
+                    params.update(self.build_tool_params(CAPTION_MULTI_TOOL))
+                response = self.create_message(label=f"묶음 요청 {len(packed)}개", **params)
+                print(f"Response received: {response}")
+                self.status_signal.emit("응답 수신 완료")
+                break
             except Exception as e:
                 error_detail = str(e)
                 print(f"Error in request: {error_detail}")
                 self.status_signal.emit(f"오류 발생: {error_detail}")
                 
-                # 과부하 에러(529) 또는 타임아웃 에러인 경우
-                if ("529" in error_detail or "overloaded" in error_detail.lower() or 
-                    "timeout" in error_detail.lower()) and attempt < max_retries - 1:
+                # 작업이 취소된 경우 재시도하지 않음
+                if self.stopped:
+                    raise
+                
+                # 429/529 응답인 경우 - 대기는 속도 제어기가 다음 acquire에서 처리
+                if self.is_throttle_error(e) and attempt < max_retries - 1:
+                    retry_msg = f"요청 한도/서버 과부하 감지. 속도를 낮춰 재시도 중... (Attempt {attempt + 1}/{max_retries})"
+                    print(retry_msg)
+                    self.status_signal.emit(retry_msg)
+                    continue
+                # 타임아웃 에러인 경우
+                elif self.is_timeout_error(e) and attempt < max_retries - 1:
                     # 지수 백오프(exponential backoff) 적용
                     wait_time = retry_delay * (2 ** attempt)  # 2, 4, 8초로 증가
                     retry_msg = f"타임아웃 오류 감지. {wait_time}초 후 재시도 중... (Attempt {attempt + 1}/{max_retries})"
@@ -437,6 +828,73 @@ class WorkerThreadChatCompletion(QThread):
                 
                 self.status_signal.emit("최대 재시도 횟수 초과. 처리 실패")
                 raise
+        
+        # 응답 배열을 id 기준으로 이미지별 결과로 분리
+        entries = self.parse_multi_caption_message(response)
+        entries_by_id = {}
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get("id") is not None:
+                entries_by_id[str(entry["id"]).strip()] = entry
+        
+        for image_id, image_path, upload in packed:
+            file_name = os.path.basename(image_path)
+            entry = entries_by_id.get(image_id)
+            text_content = self.normalize_caption(entry, file_name) if entry else None
+            if text_content is None:
+                self.status_signal.emit(f"{file_name} - 묶음 응답에 결과가 없어 개별 요청으로 처리합니다.")
+                continue
+            # 묶음 프롬프트로 받은 결과이므로 개별 요청 캐시 키와 구분하여 저장
+            self.store_cached_caption(self.image_hashes.get(image_path), text_content,
+                                      self.cache_prompt(CAPTION_MULTI_PROMPT, cache_hints.get(image_path)))
+            results[image_path] = self.format_caption_result(image_path, text_content, upload)
+        
+        self.status_signal.emit(f"묶음 요청 처리 완료 ({len(results)}/{len(image_paths)}개)")
+        return results
+
+    def parse_multi_caption_message(self, message):
+        """묶음 응답에서 이미지별 항목 목록 추출 ({"id", "text": {...}} 형식으로 맞춤)"""
+        for block in message.content:
+            if block.type == "tool_use" and isinstance(block.input, dict):
+                captions = block.input.get("captions")
+                if not isinstance(captions, list):
+                    return []
+                return [
+                    {"id": caption.get("id"), "text": {
+                        "english_caption": caption.get("english_caption"),
+                        "korean_caption": caption.get("korean_caption")
+                    }}
+                    for caption in captions if isinstance(caption, dict)
+                ]
+        response_text = ''.join(block.text for block in message.content if block.type == "text")
+        return self.extract_json_array_from_text(response_text, "multiple_images")
+
+    def request_extract_keyword_group(self, image_paths):
+        """이미지 묶음 처리 - 묶음 요청 후 응답에 없는 이미지는 개별 요청으로 처리
+
+        Returns:
+            dict: image_path -> 결과 또는 발생한 예외
+        """
+        outcomes = {}
+        looked_up = set()  # 묶음 요청에서 이미 캐시를 확인한 이미지 (미스를 두 번 세지 않도록)
+        if len(image_paths) > 1:
+            try:
+                outcomes.update(self.request_extract_keyword_multiple(image_paths, looked_up))
+            except Exception as e:
+                if self.stopped:
+                    raise
+                print(f"묶음 요청 실패, 개별 요청으로 처리: {e}")
+        
+        for image_path in image_paths:
+            if image_path in outcomes:
+                continue
+            if self.stopped:
+                outcomes[image_path] = RuntimeError("작업이 취소되어 요청을 보내지 않았습니다.")
+                continue
+            try:
+                outcomes[image_path] = self.request_extract_keyword(image_path, check_cache=image_path not in looked_up)
+            except Exception as e:
+                outcomes[image_path] = e
+        return outcomes
 
     def stop(self):
         """스레드 중지"""
@@ -447,6 +905,9 @@ class WorkerThreadChatCompletion(QThread):
 
     def initialize_jsonl_file(self):
         """JSONL 파일 초기화 - 사용자가 파일 위치 선택 가능"""
+        if self.is_resume:
+            return self.reopen_jsonl_file()
+        
         try:
             # 타임스탬프를 이용한 기본 파일명 생성
             timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -479,9 +940,9 @@ class WorkerThreadChatCompletion(QThread):
                     self.last_save_directory = save_directory
                     print(f"저장 위치 업데이트: {save_directory}")
             
-            # 빈 JSONL 파일 생성
-            with open(self.jsonl_file_path, 'w', encoding='utf-8') as f:
-                pass  # 빈 파일 생성
+            # JSONL writer 생성 (작업이 끝날 때까지 파일을 열어 둠)
+            self.open_jsonl_writer('w')
+            self.create_manifest()
             
             # 상태 메시지 표시
             print(f"JSONL 파일 초기화 완료: {self.jsonl_file_path}")
@@ -498,19 +959,92 @@ class WorkerThreadChatCompletion(QThread):
                 timestamp = time.strftime("%Y%m%d_%H%M%S")
                 default_filename = f"captions_{timestamp}.jsonl"
                 self.jsonl_file_path = os.path.join(os.path.expanduser('~'), default_filename)
-                with open(self.jsonl_file_path, 'w', encoding='utf-8') as f:
-                    pass
+                self.open_jsonl_writer('w')
+                self.create_manifest()
                 print(f"오류 발생으로 기본 위치에 파일 생성: {self.jsonl_file_path}")
                 return True
             except:
                 return False
 
+    def reopen_jsonl_file(self):
+        """이어서 처리 - 매니페스트에 기록된 기존 JSONL 파일에 이어서 기록"""
+        try:
+            self.jsonl_file_path = self.manifest.jsonl_path
+            _, record_count = self.manifest.repair_results()
+            self.open_jsonl_writer('a', initial_count=record_count)
+            print(f"기존 JSONL 파일에 이어서 기록: {self.jsonl_file_path}")
+            self.status_signal.emit(f"이전 작업을 이어서 처리합니다. 결과 파일: {self.jsonl_file_path}")
+            return True
+        except Exception as e:
+            print(f"JSONL 파일 열기 오류: {e}")
+            traceback.print_exc()
+            self.error_signal.emit("파일 오류", f"이어서 기록할 JSONL 파일을 열 수 없습니다: {e}")
+            return False
+
+    def create_manifest(self):
+        """새 작업의 매니페스트 생성 (실패해도 처리는 계속)"""
+        try:
+            self.manifest = RunManifest.create(
+                self.jsonl_file_path, fsync=bool(self.get_setting('jsonl_fsync', default_jsonl_fsync)))
+            print(f"작업 매니페스트 생성: {self.manifest.manifest_path}")
+        except Exception as e:
+            print(f"작업 매니페스트 생성 오류: {e}")
+            self.manifest = None
+
+    def flush_manifest(self):
+        """결과가 디스크에 반영된 뒤 매니페스트의 완료 기록도 반영"""
+        if self.manifest:
+            try:
+                self.manifest.flush()
+            except Exception as e:
+                print(f"작업 매니페스트 기록 오류: {e}")
+
+    def open_jsonl_writer(self, mode='w', initial_count=0):
+        """jsonl_file_path에 대한 버퍼링 writer 생성"""
+        self.close_jsonl_writer()
+        self.jsonl_writer = JsonlWriter(
+            self.jsonl_file_path,
+            mode=mode,
+            flush_every=int(self.get_setting('jsonl_flush_every', default_jsonl_flush_every)),
+            flush_interval=float(self.get_setting('jsonl_flush_interval', default_jsonl_flush_interval)),
+            fsync=bool(self.get_setting('jsonl_fsync', default_jsonl_fsync)),
+            initial_count=initial_count,
+            on_flush=self.flush_manifest
+        )
+
+    def close_jsonl_writer(self):
+        """남은 버퍼를 기록하고 파일 닫기"""
+        if self.jsonl_writer:
+            try:
+                self.jsonl_writer.close()
+            except Exception as e:
+                print(f"JSONL 파일 닫기 오류: {e}")
+
+    def close_manifest(self):
+        if self.manifest:
+            try:
+                self.manifest.close()
+            except Exception as e:
+                print(f"작업 매니페스트 닫기 오류: {e}")
+
+    def close_caption_cache(self):
+        """캡션 캐시 연결 닫기 (모든 요청이 끝난 뒤 호출)"""
+        if self.caption_cache:
+            try:
+                self.caption_cache.close()
+            except Exception as e:
+                print(f"캡션 캐시 닫기 오류: {e}")
+            self.caption_cache = None
+
+    @property
+    def jsonl_record_count(self):
+        """JSONL 파일에 기록한 결과 수"""
+        return self.jsonl_writer.count if self.jsonl_writer else 0
+
     def append_to_jsonl(self, result):
-        """결과를 JSONL 파일에 추가"""
+        """결과를 JSONL 파일에 추가 (버퍼링 후 주기적으로 flush)"""
         try:
-            with open(self.jsonl_file_path, 'a', encoding='utf-8') as f:
-                json_line = json.dumps(result, ensure_ascii=False)
-                f.write(json_line + '\n')
+            self.jsonl_writer.write(result)
             print(f"결과가 JSONL 파일에 추가됨: {os.path.basename(result.get('image_path', 'unknown'))}")
             return True
         except Exception as e:
@@ -518,8 +1052,29 @@ class WorkerThreadChatCompletion(QThread):
             self.error_signal.emit("파일 오류", f"JSONL 파일 기록 실패: {e}")
             return False
 
+    def extract_json_array_from_text(self, text, file_name):
+        """텍스트에서 묶음 응답의 JSON 배열 추출 (찾지 못하면 빈 목록)"""
+        if not text:
+            return []
+        
+        print(f"응답 텍스트: {text[:200]}..." if len(text) > 200 else text)
+        
+        # 항목이 객체인 첫 번째 배열, 없으면 {"images": [...]} 처럼 감싼 객체
+        parsed = find_json_array(text, accept=lambda items: all(isinstance(item, dict) for item in items))
+        if parsed is None:
+            wrapper = find_json_object(text, accept=lambda obj: any(isinstance(v, list) for v in obj.values()))
+            if wrapper is not None:
+                parsed = next(value for value in wrapper.values() if isinstance(value, list))
+        
+        if parsed is not None:
+            self.status_signal.emit(f"{file_name} - JSON 배열 발견 ({len(parsed)}개 항목)")
+            return parsed
+        
+        self.status_signal.emit(f"{file_name} - 응답에서 JSON 배열을 찾을 수 없습니다")
+        return []
+
     def extract_json_from_text(self, text, file_name):
-        """텍스트에서 JSON 데이터 추출"""
+        """텍스트에서 JSON 데이터 추출 (코드 펜스 안팎 모두 한 번의 선형 탐색으로 처리)"""
         if not text:
             return None
             
@@ -528,38 +1083,14 @@ class WorkerThreadChatCompletion(QThread):
         self.status_signal.emit(f"{file_name} - 응답 데이터 수신 완료")
         
         try:
-            # 1. 마크다운 코드 블록 내 JSON 추출 시도
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-            if json_match:
-                json_str = json_match.group(1).strip()
-                try:
-                    json_obj = json.loads(json_str)
-                    self.status_signal.emit(f"{file_name} - JSON 형식 응답 발견 (코드 블록)")
-                    return json_obj
-                except:
-                    pass  # 파싱 실패하면 다음 방법 시도
-            
-            # 2. 중괄호로 둘러싸인 JSON 객체 추출 시도
-            json_pattern = r'(\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\})'
-            json_match = re.search(json_pattern, text)
-            if json_match:
-                json_str = json_match.group(1).strip()
-                try:
-                    json_obj = json.loads(json_str)
-                    self.status_signal.emit(f"{file_name} - JSON 객체 발견")
-                    return json_obj
-                except:
-                    pass  # 파싱 실패하면 다음 방법 시도
-            
-            # 3. 전체 텍스트가 JSON인지 확인
-            try:
-                json_obj = json.loads(text)
-                self.status_signal.emit(f"{file_name} - 유효한 JSON 응답 수신")
+            json_obj = find_json_object(text)
+            if json_obj is not None:
+                self.status_signal.emit(f"{file_name} - JSON 객체 발견")
                 return json_obj
-            except:
-                # 파싱에 실패하면 원본 텍스트 반환
-                self.status_signal.emit(f"{file_name} - JSON 파싱 실패, 텍스트 응답으로 처리")
-                return text
+            
+            # 파싱에 실패하면 원본 텍스트 반환
+            self.status_signal.emit(f"{file_name} - JSON 파싱 실패, 텍스트 응답으로 처리")
+            return text
                 
         except Exception as e:
             print(f"JSON 추출 오류: {e}")
@@ -567,15 +1098,22 @@ class WorkerThreadChatCompletion(QThread):
             return text  # 오류 발생시 원본 텍스트 반환
 
     def run(self):
-        """스레드 실행"""
+        """스레드 실행 - 최대 max_concurrency개의 캡션 요청을 동시에 진행"""
         if not self.image_queue or self.image_queue.empty():
             self.emit_status_signal("오류: 처리할 이미지가 없습니다.")
             self.emit_status_signal("처리 완료")
+            self.close_caption_cache()
             return
             
         try:
             # JSONL 파일 초기화
-            self.initialize_jsonl_file()
+            if not self.initialize_jsonl_file():
+                self.emit_status_signal("오류: 결과 파일을 준비할 수 없습니다.")
+                return
+            
+            # 처리할 이미지를 매니페스트에 등록 (이어서 처리하는 경우 이미 등록됨)
+            if self.manifest and not self.is_resume:
+                self.manifest.mark_queued(list(self.image_queue.queue))
             
             # Anthropic API 설정 로드
             self.emit_status_signal("Anthropic API 설정 로드 중...")
@@ -585,63 +1123,90 @@ class WorkerThreadChatCompletion(QThread):
                 self.emit_status_signal("오류: API 키가 설정되지 않았습니다.")
                 return
                 
-            # 이미지 처리 시작
-            total_images = self.image_queue.qsize()
+            self.prepare_keywords()
+            
+            # 이미지 처리 시작 (유사 이미지 그룹은 대표만 요청하지만 진행률은 전체 이미지 기준)
+            image_paths = []
+            while not self.image_queue.empty():
+                image_paths.append(self.image_queue.get())
+            total_images = len(image_paths)
+            for image_path in self.group_duplicate_images(image_paths):
+                self.image_queue.put(image_path)
             processed_count = 0
+            pause_notified = False
+            in_flight = {}  # future -> 요청에 담긴 image_path 목록
             
-            self.emit_status_signal(f"이미지 처리 시작 (총 {total_images}개)...")
+            self.emit_status_signal(f"이미지 처리 시작 (총 {total_images}개, 동시 요청 {self.max_concurrency}개)...")
+            if self.images_per_request > 1:
+                self.emit_status_signal(f"요청당 최대 {self.images_per_request}개의 이미지를 묶어서 전송합니다.")
             
-            while not self.image_queue.empty():
-                # 취소 요청 확인
-                if self.stopped:
-                    # 결과 파일 경로 알림
-                    msg = f"작업이 취소되었습니다. 결과 파일: {self.jsonl_file_path}"
-                    self.emit_status_signal(msg)
-                    self.completed_signal.emit(msg)
-                    break
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                while in_flight or not self.image_queue.empty():
+                    # 일시정지 상태 알림 (진행 중인 요청은 계속 수거)
+                    if self.is_paused and not self.stopped and not pause_notified:
+                        self.emit_status_signal("처리가 일시정지되었습니다. 재개하려면 '재개' 버튼을 클릭하세요.")
+                        pause_notified = True
+                    elif not self.is_paused and pause_notified:
+                        self.emit_status_signal("처리가 재개되었습니다.")
+                        pause_notified = False
                     
-                # 일시정지 요청 확인
-                if self.is_paused:
-                    self.emit_status_signal("처리가 일시정지되었습니다. 재개하려면 '재개' 버튼을 클릭하세요.")
-                    while self.is_paused and not self.stopped:
-                        QThread.msleep(500)
+                    # 빈 슬롯만큼 새 요청 제출 (취소/일시정지 중에는 제출하지 않음)
+                    while (not self.stopped and not self.is_paused
+                           and len(in_flight) < self.max_concurrency):
+                        image_paths = []
+                        while len(image_paths) < self.images_per_request:
+                            try:
+                                image_paths.append(self.image_queue.get(block=False))
+                            except Empty:
+                                break
+                        if not image_paths:
+                            break
+                        file_names = ', '.join(os.path.basename(path) for path in image_paths)
+                        self.current_file.emit(file_names)
+                        self.emit_status_signal(f"처리 중: {file_names}")
+                        future = executor.submit(self.request_extract_keyword_group, image_paths)
+                        in_flight[future] = image_paths
                     
-                    if not self.is_paused:
-                        self.emit_status_signal("처리가 재개되었습니다.")
+                    if not in_flight:
+                        if self.stopped:
+                            break
+                        # 일시정지 중이고 진행 중인 요청도 없는 경우 대기
+                        QThread.msleep(200)
+                        continue
                     
-                    if self.stopped:
-                        msg = f"작업이 취소되었습니다. 결과 파일: {self.jsonl_file_path}"
-                        self.emit_status_signal(msg)
-                        self.completed_signal.emit(msg)
-                        break
-                
-                # 이미지 추출
-                image_path = self.image_queue.get()
-                file_name = os.path.basename(image_path)
-                
-                self.current_file.emit(file_name)
-                self.emit_status_signal(f"처리 중: {file_name}")
-                
-                try:
-                    # 이미지 처리
-                    result = self.request_extract_keyword(image_path)
+                    done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
                     
-                    if result and 'content' in result:
-                        # 결과 저장
-                        self.append_to_jsonl(result)
-                        processed_count += 1
-                        self.emit_status_signal(f"처리 완료: {file_name}")
-                        self.result_signal.emit(image_path, result)
-                    else:
-                        self.emit_status_signal(f"처리 실패: {file_name} (결과 없음)")
-                except Exception as e:
-                    self.emit_status_signal(f"이미지 처리 오류: {file_name} - {str(e)}")
-                
-                # 진행 상황 업데이트
-                self.progress.emit(processed_count, total_images)
+                    # 요청이 뜸할 때도 flush_interval마다 기록
+                    if self.jsonl_writer:
+                        self.jsonl_writer.flush_if_due()
+                    
+                    # 완료된 순서대로 결과 기록
+                    for future in done:
+                        image_paths = in_flight.pop(future)
+                        processed_count += self.handle_completed_request(image_paths, future)
+                        
+                        # 진행 상황 업데이트
+                        self.progress.emit(processed_count, total_images)
+            
+            # 남은 결과를 모두 기록하고 파일 닫기
+            self.close_jsonl_writer()
+            self.close_manifest()
+            
+            # 토큰 사용량 및 캐시 사용 현황
+            self.emit_usage_summary()
+            if self.caption_cache:
+                stats = self.caption_cache.stats()
+                self.emit_status_signal(
+                    f"캡션 캐시: 적중 {stats['hits']}건 / 미스 {stats['misses']}건 "
+                    f"(저장된 항목 {stats['entries']}개, {stats['bytes'] / (1024 * 1024):.1f} MB)")
             
-            # 취소되지 않았을 경우 완료 메시지 표시
-            if not self.stopped:
+            if self.stopped:
+                # 결과 파일 경로 알림
+                msg = f"작업이 취소되었습니다. 결과 파일: {self.jsonl_file_path}"
+                self.emit_status_signal(msg)
+                self.completed_signal.emit(msg)
+            else:
+                # 취소되지 않았을 경우 완료 메시지 표시
                 msg = f"모든 이미지 처리가 완료되었습니다. 결과 파일: {self.jsonl_file_path}"
                 self.emit_status_signal(msg)
                 self.completed_signal.emit(msg)
@@ -650,6 +1215,190 @@ class WorkerThreadChatCompletion(QThread):
             error_msg = f"처리 오류: {str(e)}"
             self.emit_status_signal(error_msg)
             traceback.print_exc()
+        finally:
+            self.close_jsonl_writer()
+            self.close_manifest()
+            self.close_caption_cache()
+
+    def handle_completed_request(self, image_paths, future):
+        """완료된 요청의 이미지별 결과를 JSONL에 기록하고 시그널 전송 (워커 스레드에서만 호출)
+
+        Returns:
+            int: 성공적으로 기록한 이미지 수
+        """
+        try:
+            # 이미지별 처리 결과 (결과 또는 예외)
+            outcomes = future.result()
+        except Exception as e:
+            outcomes = {image_path: e for image_path in image_paths}
+        
+        recorded = 0
+        for image_path in image_paths:
+            outcome = outcomes.get(image_path)
+            if isinstance(outcome, Exception):
+                self.emit_status_signal(f"이미지 처리 오류: {os.path.basename(image_path)} - {str(outcome)}")
+                self.mark_manifest_failed(image_path, outcome)
+            else:
+                recorded += self.record_result(image_path, outcome)
+        return recorded
+
+    def record_result(self, image_path, result):
+        """결과 하나를 JSONL/매니페스트에 기록하고 result_signal 전송
+
+        유사 이미지 그룹의 대표이면 같은 결과를 그룹의 나머지 이미지에도 기록합니다.
+
+        Returns:
+            int: 기록한 이미지 수 (실패 시 0)
+        """
+        file_name = os.path.basename(image_path)
+        try:
+            if result and 'content' in result:
+                members = self.duplicate_members.pop(image_path, [])
+                group_id = self.duplicate_group_ids.pop(image_path, None)
+                if group_id:
+                    result["duplicate_group"] = group_id
+                self.add_keywords(result)
+                # 결과 저장 (매니페스트의 완료 기록은 결과가 디스크에 반영될 때 함께 반영됨)
+                if self.append_to_jsonl(result):
+                    self.mark_manifest_done(image_path)
+                self.emit_status_signal(f"처리 완료: {file_name}")
+                self.result_signal.emit(image_path, result)
+                for member_path in members:
+                    self.record_duplicate_result(member_path, image_path, result)
+                if members:
+                    self.emit_status_signal(f"{file_name} - 유사 이미지 {len(members)}개에 같은 캡션 적용")
+                return 1 + len(members)
+            
+            self.emit_status_signal(f"처리 실패: {file_name} (결과 없음)")
+            self.mark_manifest_failed(image_path, "결과 없음")
+        except Exception as e:
+            self.emit_status_signal(f"이미지 처리 오류: {file_name} - {str(e)}")
+            self.mark_manifest_failed(image_path, e)
+        return 0
+
+    def prepare_keywords(self):
+        """키워드 추출용 매처와 프롬프트 키워드용 역색인 준비 (어휘 전체로 한 번만 만들어 작업 간에 공유)"""
+        if self.prompt_keywords_enabled and not self.keyword_index:
+            try:
+                started = time.monotonic()
+                self.keyword_index = get_keyword_index()
+                if self.keyword_index:
+                    self.emit_status_signal(
+                        f"프롬프트 키워드 색인 준비 완료 ({len(self.keyword_index)}개, "
+                        f"{time.monotonic() - started:.2f}초, 이미지당 최대 {self.prompt_keywords_top_k}개)")
+            except Exception as e:
+                self.emit_status_signal(f"프롬프트 키워드 색인 준비 실패 - 키워드 없이 요청합니다: {str(e)}")
+        
+        if not self.keyword_extraction or self.keyword_matcher:
+            return
+        try:
+            started = time.monotonic()
+            self.keyword_matcher = get_keyword_matcher()
+            if self.keyword_matcher:
+                self.emit_status_signal(
+                    f"키워드 어휘 준비 완료 ({len(self.keyword_matcher)}개, {time.monotonic() - started:.2f}초)")
+            else:
+                self.emit_status_signal("키워드 어휘가 없어 키워드 추출을 건너뜁니다.")
+        except Exception as e:
+            self.emit_status_signal(f"키워드 어휘 준비 실패 - 키워드 추출을 건너뜁니다: {str(e)}")
+
+    def build_keyword_hint(self, image_path, previous_caption=None):
+        """이미지별 어휘 키워드 후보 문구 (후보가 없거나 사용하지 않으면 None)
+
+        파일/폴더 이름(과 이 이미지의 이전 캡션)을 후보어로 삼아 역색인에서 관련 있는 키워드만 골라 넣습니다.
+        """
+        if not self.keyword_index:
+            return None
+        try:
+            terms = filename_terms(image_path)
+            if isinstance(previous_caption, dict):
+                terms.extend(str(value) for value in previous_caption.values() if value)
+            keywords = self.keyword_index.top_k(terms, self.prompt_keywords_top_k)
+        except Exception as e:
+            print(f"키워드 후보 검색 오류 ({image_path}): {str(e)}")
+            return None
+        if not keywords:
+            return None
+        return CAPTION_KEYWORD_HINT.format(keywords=', '.join(keywords))
+
+    def enrich_keyword_hint(self, image_path, image_hash, keyword_hint):
+        """캐시에 없는 이미지의 요청용 키워드 후보 문구
+
+        이 이미지의 이전 캡션(다른 프롬프트/모델이나 이전 어휘로 받은 결과)이 있으면 후보어에 더해 다시 고릅니다.
+        결과는 파일 이름으로 고른 문구(keyword_hint)가 포함된 캐시 키에 저장되므로 다시 실행해도 같은 키로 찾습니다.
+        """
+        if not self.keyword_index or not self.caption_cache:
+            return keyword_hint
+        try:
+            previous = self.caption_cache.get_latest(image_hash)
+        except Exception as e:
+            print(f"이전 캡션 조회 오류 ({image_path}): {str(e)}")
+            return keyword_hint
+        if not isinstance(previous, dict):
+            return keyword_hint
+        return self.build_keyword_hint(image_path, previous) or keyword_hint
+
+    def add_keywords(self, result):
+        """캡션에서 찾은 어휘 키워드를 결과의 keywords 필드에 기록"""
+        if not self.keyword_matcher:
+            return
+        text_content = result.get("text")
+        if isinstance(text_content, dict):
+            result["keywords"] = self.keyword_matcher.extract(
+                text_content.get("english_caption"), text_content.get("korean_caption"))
+
+    def record_duplicate_result(self, image_path, representative_path, representative_result):
+        """대표 이미지의 결과를 같은 그룹의 다른 이미지 결과로 기록"""
+        result = dict(representative_result)
+        result.pop("upload", None)  # 이 이미지는 업로드하지 않았음
+        result["content"] = os.path.basename(image_path)
+        result["image_path"] = image_path.replace("\\", "/")
+        result["duplicate_of"] = representative_path.replace("\\", "/")
+        if self.append_to_jsonl(result):
+            self.mark_manifest_done(image_path)
+        self.result_signal.emit(image_path, result)
+
+    def group_duplicate_images(self, image_paths):
+        """유사 이미지를 묶어 캡션을 요청할 대표 이미지 목록 반환 (사용하지 않으면 그대로 반환)"""
+        self.duplicate_members = {}
+        self.duplicate_group_ids = {}
+        if not self.dedup_enabled or len(image_paths) < 2:
+            return image_paths
+
+        self.emit_status_signal(f"유사 이미지 확인 중 ({len(image_paths)}개)...")
+        started = time.monotonic()
+        try:
+            hashes = compute_hashes(image_paths)
+        except Exception as e:
+            self.emit_status_signal(f"유사 이미지 확인 실패 - 모든 이미지를 요청합니다: {str(e)}")
+            return image_paths
+
+        representatives = []
+        for representative, value, members in group_near_duplicates(hashes, self.dedup_threshold):
+            representatives.append(representative)
+            if members:
+                self.duplicate_members[representative] = members
+                self.duplicate_group_ids[representative] = f"{value:016x}"
+
+        skipped = len(image_paths) - len(representatives)
+        self.emit_status_signal(
+            f"유사 이미지 확인 완료 ({time.monotonic() - started:.1f}초): {len(self.duplicate_members)}개 그룹, "
+            f"요청 {len(representatives)}개 (생략 {skipped}개)")
+        return representatives
+
+    def mark_manifest_done(self, image_path):
+        if self.manifest:
+            self.manifest.mark_done(image_path, self.image_hashes.pop(image_path, None))
+
+    def mark_manifest_failed(self, image_path, error):
+        # 대표 이미지가 실패하면 같은 그룹의 이미지도 실패로 기록 (이어서 처리할 때 다시 요청)
+        members = self.duplicate_members.pop(image_path, [])
+        self.duplicate_group_ids.pop(image_path, None)
+        if self.manifest:
+            self.image_hashes.pop(image_path, None)
+            self.manifest.mark_failed(image_path, error)
+            for member_path in members:
+                self.manifest.mark_failed(member_path, f"대표 이미지 실패: {error}")
 
     def emit_status_signal(self, message):
         """상태 메시지를 전송하는 편의 메서드"""
@@ -0,0 +1,112 @@
+# utils/worker_thread_folder_scan.py
+import os
+import time
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from cfg.cfg import img_ext, default_folder_scan_batch_size, default_folder_scan_batch_interval
+from utils.image_encoder import sniff_file_format
+
+# 매직 바이트로 판별했을 때 이미지로 받아들일 포맷
+SCAN_IMAGE_FORMATS = {'jpeg', 'png', 'gif', 'webp', 'bmp', 'tiff', 'heic'}
+
+
+class WorkerThreadFolderScan(QThread):
+    """폴더를 하위 폴더까지 os.scandir로 탐색하여 이미지 파일을 찾는 워커
+
+    확장자(cfg.img_ext)로 먼저 거른 뒤 매직 바이트로 실제 이미지인지 확인하며,
+    찾은 경로는 batch_size개 또는 batch_interval초마다 묶어서 paths_found로 보냅니다.
+    숨김 폴더와 심볼릭 링크 폴더는 건너뜁니다.
+    """
+
+    paths_found = pyqtSignal(list)  # 찾은 이미지 경로 묶음
+    progress_signal = pyqtSignal(int, int)  # (확인한 파일 수, 찾은 이미지 수)
+    finished_signal = pyqtSignal(int, bool)  # (찾은 이미지 수, 취소 여부)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, root_dirs, verify_magic=True, batch_size=default_folder_scan_batch_size,
+                 batch_interval=default_folder_scan_batch_interval, parent=None):
+        super().__init__(parent)
+        self.root_dirs = [root_dirs] if isinstance(root_dirs, str) else list(root_dirs)
+        self.verify_magic = verify_magic
+        self.batch_size = max(1, int(batch_size))
+        self.batch_interval = batch_interval
+        self.extensions = {f'.{ext}' for ext in img_ext}
+        self.cancel_requested = False
+        self.scanned_count = 0
+        self.found_count = 0
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+        try:
+            for file_path in self.iter_image_paths():
+                batch.append(file_path)
+                self.found_count += 1
+                now = time.monotonic()
+                if len(batch) >= self.batch_size or now - last_emit >= self.batch_interval:
+                    self.emit_batch(batch)
+                    batch = []
+                    last_emit = now
+        except Exception as e:
+            print(f"폴더 탐색 중 오류 발생: {str(e)}")
+            traceback.print_exc()
+            self.error_signal.emit(str(e))
+        finally:
+            if batch:
+                self.emit_batch(batch)
+            self.progress_signal.emit(self.scanned_count, self.found_count)
+            self.finished_signal.emit(self.found_count, self.cancel_requested)
+
+    def emit_batch(self, batch):
+        self.paths_found.emit(batch)
+        self.progress_signal.emit(self.scanned_count, self.found_count)
+
+    def iter_image_paths(self):
+        """하위 폴더까지 이미지 경로를 찾는 대로 반환 (폴더 안에서는 이름 순)"""
+        stack = list(reversed(self.root_dirs))
+        visited = set()
+        while stack and not self.cancel_requested:
+            directory = stack.pop()
+            real_dir = os.path.realpath(directory)
+            if real_dir in visited:
+                continue
+            visited.add(real_dir)
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name.lower())
+            except OSError as e:
+                print(f"폴더를 읽을 수 없습니다 ({directory}): {str(e)}")
+                continue
+
+            sub_dirs = []
+            for entry in entries:
+                if self.cancel_requested:
+                    return
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            sub_dirs.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                self.scanned_count += 1
+                if self.is_image_file(entry.path, entry.name):
+                    yield entry.path.replace('\\', '/')
+            # 하위 폴더는 이름 순서대로 방문
+            stack.extend(reversed(sub_dirs))
+
+    def is_image_file(self, file_path, file_name):
+        _, extension = os.path.splitext(file_name)
+        if extension.lower() not in self.extensions:
+            return False
+        if not self.verify_magic:
+            return True
+        # 확장자만 이미지인 파일(손상되었거나 이름만 바뀐 파일) 제외
+        return sniff_file_format(file_path) in SCAN_IMAGE_FORMATS
@@ -0,0 +1,42 @@
+# utils/worker_thread_xlsx_export.py
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from utils.xlsx_exporter import export_jsonl_to_xlsx
+
+
+class WorkerThreadXlsxExport(QThread):
+    """결과 JSONL을 백그라운드에서 엑셀로 내보내는 워커
+
+    JSONL을 한 줄씩 읽어 write-only 통합 문서에 바로 쓰므로 결과 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+
+    progress_signal = pyqtSignal(int)  # 지금까지 쓴 행 수
+    finished_signal = pyqtSignal(str, int, bool)  # (엑셀 파일 경로, 쓴 행 수, 취소 여부)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, jsonl_path, xlsx_path, columns=None, parent=None):
+        super().__init__(parent)
+        self.jsonl_path = jsonl_path
+        self.xlsx_path = xlsx_path
+        self.columns = columns
+        self.cancel_requested = False
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def run(self):
+        try:
+            print(f"엑셀 내보내기 시작: {self.jsonl_path} -> {self.xlsx_path}")
+            written = export_jsonl_to_xlsx(
+                self.jsonl_path, self.xlsx_path, self.columns,
+                progress_callback=self.progress_signal.emit,
+                should_stop=lambda: self.cancel_requested)
+            cancelled = written is None
+            print(f"엑셀 내보내기 {'취소됨' if cancelled else '완료'}: {written or 0}행")
+            self.finished_signal.emit(self.xlsx_path, written or 0, cancelled)
+        except Exception as e:
+            print(f"엑셀 내보내기 중 오류 발생: {str(e)}")
+            traceback.print_exc()
+            self.error_signal.emit(str(e))
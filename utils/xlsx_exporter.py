@@ -0,0 +1,133 @@
+# utils/xlsx_exporter.py
+# 결과 JSONL을 한 줄씩 읽어 엑셀(xlsx)로 내보내기 - openpyxl write-only 모드로 메모리 사용량 일정
+import json
+import os
+import re
+
+EXCEL_MAX_ROWS = 1048576  # 시트당 최대 행 수 (머리글 포함)
+EXCEL_MAX_CELL_CHARS = 32767  # 셀당 최대 글자 수
+PROGRESS_EVERY = 1000  # 몇 행마다 progress_callback을 호출할지
+
+# (머리글, JSONL 레코드의 필드 경로 - 점으로 구분) 순서대로 열이 만들어짐
+DEFAULT_COLUMNS = [
+    ("파일명", "content"),
+    ("이미지 경로", "image_path"),
+    ("영어 캡션", "text.english_caption"),
+    ("한글 캡션", "text.korean_caption"),
+    ("키워드", "keywords"),
+]
+
+# openpyxl이 셀에 쓸 수 없는 제어 문자
+_ILLEGAL_CHARACTERS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def iter_jsonl_records(jsonl_path):
+    """JSONL을 한 줄씩 읽어 레코드 반환 (깨진 줄과 비정상 종료로 잘린 마지막 줄은 건너뜀)"""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"JSONL {line_number}번째 줄을 읽을 수 없어 건너뜁니다: {jsonl_path}")
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def get_field(record, path):
+    """'text.english_caption'처럼 점으로 구분된 경로의 값 (없으면 None)"""
+    value = record
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def cell_value(value):
+    """엑셀 셀에 쓸 값 - 목록은 쉼표로 잇고, 쓸 수 없는 문자와 글자 수 제한을 처리"""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(str(item) for item in value if item is not None)
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, (int, float, bool)):
+        return value
+    value = _ILLEGAL_CHARACTERS.sub('', str(value))
+    return value[:EXCEL_MAX_CELL_CHARS]
+
+
+def formula_safe_row(sheet, values):
+    """'='로 시작하는 문자열은 openpyxl이 수식으로 쓰므로 문자열 셀로 지정 (캡션이 수식으로 실행되지 않게)"""
+    from openpyxl.cell import WriteOnlyCell
+
+    row = []
+    for value in values:
+        if isinstance(value, str) and value.startswith('='):
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.data_type = 's'
+            value = cell
+        row.append(value)
+    return row
+
+
+def write_rows_to_xlsx(rows, xlsx_path, headers, sheet_title="결과", max_rows_per_sheet=EXCEL_MAX_ROWS,
+                       progress_callback=None, should_stop=None):
+    """행(값 목록)을 write-only 통합 문서에 쓰고 시트가 가득 차면 다음 시트로 넘어감
+
+    임시 파일에 쓴 뒤 교체하므로 중간에 실패하거나 취소되면 기존 파일이 그대로 남습니다.
+
+    Returns:
+        int: 쓴 데이터 행 수 (취소되면 None)
+    """
+    from openpyxl import Workbook  # 내보낼 때만 필요하므로 여기서 import
+
+    workbook = Workbook(write_only=True)
+    rows_per_sheet = max_rows_per_sheet - 1  # 머리글 한 줄 제외
+    sheet = None
+    sheet_rows = 0
+    written = 0
+    for row in rows:
+        if should_stop and should_stop():
+            return None
+        if sheet is None or sheet_rows >= rows_per_sheet:
+            sheet_number = len(workbook.worksheets) + 1
+            sheet = workbook.create_sheet(sheet_title if sheet_number == 1 else f"{sheet_title} {sheet_number}")
+            sheet.append(formula_safe_row(sheet, [cell_value(header) for header in headers]))
+            sheet_rows = 0
+        sheet.append(formula_safe_row(sheet, [cell_value(value) for value in row]))
+        sheet_rows += 1
+        written += 1
+        if progress_callback and written % PROGRESS_EVERY == 0:
+            progress_callback(written)
+
+    if sheet is None:
+        # 결과가 없어도 머리글만 있는 파일을 만듦
+        sheet = workbook.create_sheet(sheet_title)
+        sheet.append(formula_safe_row(sheet, [cell_value(header) for header in headers]))
+
+    temp_path = xlsx_path + '.tmp'
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, xlsx_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    if progress_callback:
+        progress_callback(written)
+    return written
+
+
+def export_jsonl_to_xlsx(jsonl_path, xlsx_path, columns=None, **kwargs):
+    """결과 JSONL을 엑셀로 내보내기 (columns: [(머리글, 필드 경로), ...], 기본값 DEFAULT_COLUMNS)
+
+    Returns:
+        int: 내보낸 레코드 수 (취소되면 None)
+    """
+    columns = columns or DEFAULT_COLUMNS
+    rows = ([get_field(record, path) for _, path in columns] for record in iter_jsonl_records(jsonl_path))
+    return write_rows_to_xlsx(rows, xlsx_path, [header for header, _ in columns], **kwargs)